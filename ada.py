@@ -1,4 +1,6 @@
 # --- Core Imports ---
+import time
+_BOOT_T0 = time.perf_counter()
 import asyncio
 import base64
 import io
@@ -7,57 +9,197 @@ import sys
 import signal
 import traceback
 import json
-import websockets
 import argparse
 import threading
+import atexit
+import importlib
 from html import escape
 import subprocess
+import tempfile
 import webbrowser
 import math
-# removed: random (no greeting)
-
-# --- PySide6 GUI Imports ---
-from PySide6.QtWidgets import (QApplication, QMainWindow, QTextEdit, QLabel,
-                               QVBoxLayout, QWidget, QLineEdit, QHBoxLayout,
-                               QSizePolicy, QPushButton, QSplitter)
-from PySide6.QtCore import QObject, Signal, Slot, Qt, QTimer, QPoint
-from PySide6.QtGui import (QImage, QPixmap, QFont, QFontDatabase, QTextCursor,
-                           QPainter, QPen, QVector3D, QMatrix4x4, QColor, QBrush, QPolygon)
-from PySide6.QtOpenGLWidgets import QOpenGLWidget
+import hashlib
+import re
+import collections
+import contextlib
+import abc
+import datetime
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Signals: Qt for the desktop GUI (ada_gui.py), a plain callback shim when headless ---
+HEADLESS = "--headless" in sys.argv or os.getenv("ADA_HEADLESS", "").strip().lower() in ["1", "true", "yes", "y"]
+if HEADLESS:
+    from ada_events import QObject, Signal, Slot
+else:
+    from PySide6.QtCore import QObject, Signal, Slot
+
+
+# --- Startup profiling (--profile-startup) ---
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+
+class StartupProfile:
+    """Collects import/init timings from process start to first paint."""
+    def __init__(self, t0):
+        self.t0 = t0
+        self.entries = []  # (phase, name, start_ms, duration_ms)
+        self._lock = threading.Lock()
+
+    def record(self, phase, name, started):
+        now = time.perf_counter()
+        with self._lock:
+            self.entries.append((phase, name, (started - self.t0) * 1000, (now - started) * 1000))
+
+    def mark(self, name):
+        self.record("mark", name, time.perf_counter())
+
+    def report(self):
+        with self._lock:
+            entries = sorted(self.entries, key=lambda e: e[2])
+        lines = [">>> [INFO] Startup profile (ms since process start):"]
+        for phase, name, start, dur in entries:
+            lines.append(f"    {start:8.1f}  {'+' + format(dur, '.1f') if phase != 'mark' else '':>9}  {phase:<7} {name}")
+        return "\n".join(lines)
 
+startup_profile = StartupProfile(_BOOT_T0)
+startup_profile.record("import", "stdlib + signals", _BOOT_T0)
 
 # --- Media and AI Imports ---
-import cv2
-import pyaudio
-import PIL.Image
-from google import genai
+class LazyModule:
+    """Stand-in for a heavy module, imported on first attribute access.
+
+    The boot loader imports these off the GUI thread after the window is
+    up; once loaded, the module-level name is rebound to the real module so
+    later accesses cost nothing.
+    """
+    def __init__(self, module_name, global_name, submodules=()):
+        self._module_name = module_name
+        self._global_name = global_name
+        self._submodules = submodules
+
+    def load(self):
+        for name in (self._module_name,) + tuple(self._submodules):
+            if name not in sys.modules:
+                started = time.perf_counter()
+                importlib.import_module(name)
+                startup_profile.record("import", name, started)
+        module = sys.modules[self._module_name]
+        globals()[self._global_name] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+def ensure_loaded(*modules):
+    """Import any LazyModule stand-ins among `modules` (already-loaded modules pass through)."""
+    for module in modules:
+        if isinstance(module, LazyModule):
+            module.load()
+
+cv2 = LazyModule("cv2", "cv2")
+pyaudio = LazyModule("pyaudio", "pyaudio")
+PIL = LazyModule("PIL", "PIL", submodules=("PIL.Image",))
+ImageGrab = LazyModule("PIL.ImageGrab", "ImageGrab")
+genai = LazyModule("google.genai", "genai")
+genai_errors = LazyModule("google.genai.errors", "genai_errors")
+webrtcvad = LazyModule("webrtcvad", "webrtcvad")
+requests = LazyModule("requests", "requests")
+websockets = LazyModule("websockets", "websockets", submodules=("websockets.exceptions",))  # used in except clauses before any connect
 # removed unused: from google.genai import types
 from dotenv import load_dotenv
-from PIL import ImageGrab
 import numpy as np
-import webrtcvad
 # removed unused: queue, struct
-import time
-import requests
-
-# --- Diagnostic logging helper ---
-DEBUG_DIAG = True
-# Toggle for very verbose per-chunk audio diagnostics
-AUDIO_CHUNK_DIAG = False
-def diag(label, **kwargs):
-    if not DEBUG_DIAG:
-        return
-    try:
-        ts = time.time()
-        parts = " ".join(f"{k}={v}" for k, v in kwargs.items()) if kwargs else ""
-        print(f">>> [DIAG] {label} t={ts:.3f} {parts}")
-    except Exception as _e:
-        # Fallback to a simple print if formatting fails
-        print(f">>> [DIAG] {label}")
-
 
 # --- Load Environment Variables ---
 load_dotenv()
+
+# --- Diagnostic logging ---
+# ADA_DIAG_LEVEL: off | error | info | debug | trace (per audio/text chunk). Records are queued
+# on a deque and formatted/written by a background thread, so callers never block on stdout.
+DIAG_OFF, DIAG_ERROR, DIAG_INFO, DIAG_DEBUG, DIAG_TRACE = range(5)
+DIAG_LEVEL_NAMES = {"off": DIAG_OFF, "error": DIAG_ERROR, "info": DIAG_INFO, "debug": DIAG_DEBUG, "trace": DIAG_TRACE}
+DIAG_LEVEL = DIAG_LEVEL_NAMES.get(os.getenv("ADA_DIAG_LEVEL", "info").strip().lower(), DIAG_INFO)
+DIAG_FORMAT = os.getenv("ADA_DIAG_FORMAT", "text").strip().lower() or "text"  # text | json
+
+class DiagWriter:
+    """Background writer for diag() records.
+
+    diag() only appends a (time, level, label, fields) tuple to a bounded
+    deque (append/popleft are atomic, no lock taken); this thread drains it
+    every flush_interval, formats the batch and writes it in one go. If the
+    writer falls behind, the oldest records are dropped and counted.
+    """
+    def __init__(self, stream=None, fmt=DIAG_FORMAT, maxlen=20000, flush_interval=0.05):
+        self.stream = stream
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.records = collections.deque(maxlen=maxlen)
+        self.dropped = 0
+        self._dropped_reported = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="diag-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _format(self, rec):
+        ts, level, label, fields = rec
+        if self.fmt == "json":
+            try:
+                return json.dumps({"t": round(ts, 3), "level": level, "event": label, **fields}, default=str)
+            except Exception:
+                return json.dumps({"t": round(ts, 3), "level": level, "event": label})
+        try:
+            parts = " ".join(f"{k}={v}" for k, v in fields.items())
+        except Exception:
+            parts = ""
+        return f">>> [DIAG] {label} t={ts:.3f} {parts}"
+
+    def flush(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self._format(self.records.popleft()))
+            except IndexError:
+                break
+        dropped, self._dropped_reported = self.dropped - self._dropped_reported, self.dropped
+        if dropped > 0:
+            lines.insert(0, f">>> [DIAG] diag.dropped count={dropped}")
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+_diag_writer = DiagWriter() if DIAG_LEVEL > DIAG_OFF else None
+
+def diag_enabled(level=DIAG_DEBUG):
+    """Guard for hot paths: check before computing diag() arguments."""
+    return level <= DIAG_LEVEL
+
+def diag(label, level=DIAG_DEBUG, **kwargs):
+    if level > DIAG_LEVEL:
+        return
+    records = _diag_writer.records
+    if len(records) == records.maxlen:
+        _diag_writer.dropped += 1
+    records.append((time.time(), level, label, kwargs))
+
+def diag_flush():
+    """Writes queued records now, to whatever sys.stdout is at this moment (e.g. a test's capture)."""
+    if _diag_writer is not None:
+        _diag_writer.flush()
+
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 MCP_CAL_BASE_URL = os.getenv("MCP_CAL_BASE_URL", "http://127.0.0.1:3001")
@@ -67,30 +209,78 @@ MCP_TIME_BASE_URL = os.getenv("MCP_TIME_BASE_URL", "")
 DEFAULT_EVENT_DURATION_MIN = int(os.getenv("DEFAULT_EVENT_DURATION_MIN", "60").strip() or 60)
 REQUIRE_SCHEDULE_CONFIRM = (os.getenv("REQUIRE_SCHEDULE_CONFIRM", "true").strip().lower() in ["1", "true", "yes", "y"])
 WEEK_START = os.getenv("WEEK_START", "monday").strip().lower()
+# Calendar bridge client: pooled keep-alive connections, bounded concurrency
+MCP_CAL_MAX_CONCURRENCY = max(1, int(os.getenv("MCP_CAL_MAX_CONCURRENCY", "4").strip() or 4))
+MCP_CAL_TIMEOUT = float(os.getenv("MCP_CAL_TIMEOUT", "8").strip() or 8)
+# Tool-call execution: worker threads for blocking tools, default per-call timeout (s)
+TOOL_MAX_WORKERS = max(1, int(os.getenv("TOOL_MAX_WORKERS", "4").strip() or 4))
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "15").strip() or 15)
 
 
 # Calendar MCP Python client import removed (HTTP bridge in use)
 
-if not GEMINI_API_KEY or GEMINI_API_KEY.strip() == "":
-    print(">>> [ERROR] GEMINI_API_KEY not found or empty in .env file.")
-    print(">>> [INFO] Please create a .env file with: GEMINI_API_KEY=your_api_key_here")
-    sys.exit(1)
-if not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY.strip() == "":
-    print(">>> [ERROR] ELEVENLABS_API_KEY not found or empty in .env file.")
-    print(">>> [INFO] Please create a .env file with: ELEVENLABS_API_KEY=your_api_key_here")
-    sys.exit(1)
+def require_api_keys():
+    """Exits if the API keys are missing. Called by the entry points, not at import,
+    so offline tools (ada_replay.py, benchmarks) can import the module without keys."""
+    if not GEMINI_API_KEY or GEMINI_API_KEY.strip() == "":
+        print(">>> [ERROR] GEMINI_API_KEY not found or empty in .env file.")
+        print(">>> [INFO] Please create a .env file with: GEMINI_API_KEY=your_api_key_here")
+        sys.exit(1)
+    if not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY.strip() == "":
+        print(">>> [ERROR] ELEVENLABS_API_KEY not found or empty in .env file.")
+        print(">>> [INFO] Please create a .env file with: ELEVENLABS_API_KEY=your_api_key_here")
+        sys.exit(1)
 
 # --- Configuration ---
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
-CHUNK_SIZE = 1024
 MODEL = "gemini-live-2.5-flash-preview"
 ASSISTANT_NAME = os.getenv("ASSISTANT_NAME", "TARS").strip() or "TARS"
 VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "LDStDeG1Uv2SL9ieB8xc").strip() or "LDStDeG1Uv2SL9ieB8xc"
 DEFAULT_MODE = "none"  # Options: "camera", "screen", "none"
+TTS_MODEL_ID = "eleven_turbo_v2_5"
+# ElevenLabs websocket base URL (point it at a local stand-in such as ada_replay.py's fake server)
+ELEVENLABS_WS_URL = (os.getenv("ELEVENLABS_WS_URL", "wss://api.elevenlabs.io").strip() or "wss://api.elevenlabs.io").rstrip("/")
+# Warm ElevenLabs stream-input sockets kept ready for the next turn, and how long one may idle before refresh (s).
+# The server-side inactivity_timeout is raised to 180 s so sockets survive between turns.
+TTS_POOL_SIZE = max(0, int(os.getenv("TTS_POOL_SIZE", "1").strip() or 1))
+TTS_WARM_MAX_AGE = float(os.getenv("TTS_WARM_MAX_AGE", "150").strip() or 150)
+# TTS text shaping: model text is coalesced into sentences/clauses before it is sent to ElevenLabs.
+# A phrase is forced out after TTS_FIRST_PHRASE_WAIT_MS (first of a turn) / TTS_PHRASE_WAIT_MS.
+TTS_SHAPING = (os.getenv("TTS_SHAPING", "true").strip().lower() in ["1", "true", "yes", "y"])
+TTS_FIRST_PHRASE_WAIT_MS = int(os.getenv("TTS_FIRST_PHRASE_WAIT_MS", "150").strip() or 150)
+TTS_PHRASE_WAIT_MS = int(os.getenv("TTS_PHRASE_WAIT_MS", "400").strip() or 400)
+TTS_MIN_CLAUSE_CHARS = 24  # a clause break (,;:) only ends a phrase once this much text is buffered
+TTS_CHUNK_SCHEDULE = [50, 120, 160, 250]  # ElevenLabs chars buffered before each generation step
+# Local PCM cache for fixed assistant phrases (confirmations); 0 MB disables it
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "").strip() or os.path.join(os.path.expanduser("~"), ".cache", "ada", "tts")
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "50").strip() or 50)
+TTS_CACHE_MAX_CHARS = 200  # longer texts are one-offs; not worth caching
+# Exactly the texts emitted with fixed=True below; replies carrying dates or event data are never cached
+TTS_CACHE_WARM_PHRASES = ("Scheduled.", "Canceled.")
+# Uplink to Gemini: max queued mic chunks before the oldest is dropped (one capture batch each)
+UPLINK_AUDIO_MAX_CHUNKS = 32
+# Vision uplink: frames are checked every FRAME_CHECK_INTERVAL s; changed frames go up at most every
+# FRAME_MIN_INTERVAL s, and a static scene only sends a keyframe every FRAME_KEYFRAME_INTERVAL s.
+FRAME_CHECK_INTERVAL = 0.25
+FRAME_MIN_INTERVAL = float(os.getenv("FRAME_MIN_INTERVAL", "0.5").strip() or 0.5)
+FRAME_KEYFRAME_INTERVAL = float(os.getenv("FRAME_KEYFRAME_INTERVAL", "10").strip() or 10)
+FRAME_DIFF_THRESHOLD = float(os.getenv("FRAME_DIFF_THRESHOLD", "2.5").strip() or 2.5)  # mean abs diff, 0..255 gray
+VIDEO_FRAME_INTERVAL = 0.033  # ~30 fps capture/preview target
+# Screen capture: backend (auto|mss|pil), mss monitor index (0 = all, 1 = primary),
+# optional region "left,top,width,height" (e.g. a window's rectangle) and a downscale factor (0..1]
+SCREEN_CAPTURE_BACKEND = os.getenv("SCREEN_CAPTURE_BACKEND", "auto").strip().lower() or "auto"
+SCREEN_MONITOR = int(os.getenv("SCREEN_MONITOR", "1").strip() or 1)
+SCREEN_REGION = os.getenv("SCREEN_REGION", "").strip()
+SCREEN_DOWNSCALE = float(os.getenv("SCREEN_DOWNSCALE", "1.0").strip() or 1.0)
 MAX_OUTPUT_TOKENS = 220
+# Gemini Live session supervisor: reconnect with exponential backoff (jittered, capped), resuming the
+# previous session via its resumption handle when the server provides one.
+LIVE_SESSION_RESUMPTION = (os.getenv("LIVE_SESSION_RESUMPTION", "true").strip().lower() in ["1", "true", "yes", "y"])
+LIVE_RECONNECT_BASE = float(os.getenv("LIVE_RECONNECT_BASE", "1.0").strip() or 1.0)
+LIVE_RECONNECT_MAX = float(os.getenv("LIVE_RECONNECT_MAX", "30").strip() or 30)
+LIVE_STABLE_AFTER = 60.0  # a session that lived this long resets the backoff
 
 # --- Audio feedback loop prevention constants ---
 IN_RATE = 16000
@@ -100,116 +290,1500 @@ SAMPLE_WIDTH = 2    # 16-bit
 FRAME_MS = 20       # 10/20/30ms valid for WebRTC VAD
 SAMPLES_PER_FRAME = int(IN_RATE * FRAME_MS / 1000)  # 320 for 20ms
 BYTES_PER_FRAME = SAMPLES_PER_FRAME * SAMPLE_WIDTH
+# VAD-gated mic upload: only voiced segments (plus pre-roll and hangover) go to Gemini
+MIC_VAD_GATE = (os.getenv("MIC_VAD_GATE", "true").strip().lower() in ["1", "true", "yes", "y"])
+VAD_PREROLL_MS = int(os.getenv("VAD_PREROLL_MS", "300").strip() or 300)
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "800").strip() or 800)
+# Barge-in: keep listening while TTS plays and cut playback once the user is confirmed speaking
+# for BARGE_IN_CONFIRM_MS. A frame only counts if it is louder than BARGE_IN_ECHO_RATIO x the
+# level recently sent to the speaker (crude echo suppression) and than BARGE_IN_MIN_RMS.
+BARGE_IN = (os.getenv("BARGE_IN", "false").strip().lower() in ["1", "true", "yes", "y"])
+BARGE_IN_CONFIRM_MS = int(os.getenv("BARGE_IN_CONFIRM_MS", "200").strip() or 200)
+BARGE_IN_ECHO_RATIO = float(os.getenv("BARGE_IN_ECHO_RATIO", "0.6").strip() or 0.6)
+BARGE_IN_MIN_RMS = float(os.getenv("BARGE_IN_MIN_RMS", "500").strip() or 500)
+# Speaker output: callback stream fed from a ring buffer. Playback starts once PLAYBACK_JITTER_MS
+# of audio is buffered (and again after an underrun); PLAYBACK_BUFFER_S caps how far TTS may run ahead.
+PLAYBACK_JITTER_MS = int(os.getenv("PLAYBACK_JITTER_MS", "80").strip() or 80)
+PLAYBACK_BUFFER_S = float(os.getenv("PLAYBACK_BUFFER_S", "30").strip() or 30)
+PLAYBACK_FRAMES = int(RECEIVE_SAMPLE_RATE * FRAME_MS / 1000)  # samples per device callback
+# Mic capture: device block size (rounded to whole VAD frames) and how much audio is collected
+# before the asyncio side is woken.
+CAPTURE_BLOCK_MS = max(FRAME_MS, int(os.getenv("CAPTURE_BLOCK_MS", str(FRAME_MS)).strip() or FRAME_MS) // FRAME_MS * FRAME_MS)
+CAPTURE_WAKE_MS = int(os.getenv("CAPTURE_WAKE_MS", "40").strip() or 40)
+# Per-turn latency tracing: optional Chrome trace-event JSON written on shutdown (open in chrome://tracing or Perfetto)
+TRACE_FILE = os.getenv("ADA_TRACE_FILE", "").strip()
 
 # --- Initialize Clients ---
-pya = pyaudio.PyAudio()
+# PyAudio and the VAD are created on first use (normally by the boot loader)
+_pya = None
+_vad = None
+_client_lock = threading.Lock()
+
+def get_pya():
+    global _pya
+    with _client_lock:
+        if _pya is None:
+            started = time.perf_counter()
+            _pya = pyaudio.PyAudio()
+            startup_profile.record("init", "PyAudio()", started)
+        return _pya
 
-# --- Global state for audio feedback prevention ---
-speaking = threading.Event()   # True while TTS is playing
-# removed unused: stop_flag, audio_out_q
 
 # --- VAD setup (aggressiveness 0..3; 2 is a good start) ---
-vad = webrtcvad.Vad(2)
+def terminate_audio():
+    global _pya
+    with _client_lock:
+        if _pya is not None:
+            _pya.terminate()
+            _pya = None
+            print(">>> [INFO] Audio system terminated.")
+
+def get_vad():
+    global _vad
+    if _vad is None:
+        _vad = webrtcvad.Vad(2)
+    return _vad
 
 def is_voiced(frame_bytes):
     # frame must be 16-bit mono PCM at 8/16/32/48k and exactly 10/20/30ms
     try:
-        return vad.is_speech(frame_bytes, IN_RATE)
+        return get_vad().is_speech(frame_bytes, IN_RATE)
     except Exception:
         return False
 
+class VadGate:
+    """Splits mic chunks into VAD frames and passes through only speech.
+
+    A short ring buffer of recent frames (pre-roll) is flushed when speech
+    starts so word onsets are not clipped, and streaming continues for a
+    hangover window after the last voiced frame so Gemini still sees the
+    trailing silence it uses to detect end of turn.
+    """
+    def __init__(self, preroll_ms=VAD_PREROLL_MS, hangover_ms=VAD_HANGOVER_MS, onset_frames=2):
+        self.preroll = collections.deque(maxlen=max(1, preroll_ms // FRAME_MS))
+        self.hangover_frames = max(1, hangover_ms // FRAME_MS)
+        self.onset_frames = max(1, onset_frames)
+        self.active = False
+        self.frames_in = 0
+        self.frames_sent = 0
+        self.last_voiced_at = None  # perf_counter() of the last voiced frame, for turn tracing
+        self._remainder = b""
+        self._voiced_run = 0
+        self._silence_left = 0
+
+    def reset(self):
+        self.preroll.clear()
+        self.active = False
+        self._remainder = b""
+        self._voiced_run = 0
+        self._silence_left = 0
+
+    def open(self):
+        """Starts a speech segment now (barge-in already confirmed the onset)."""
+        self.reset()
+        self.active = True
+        self._silence_left = self.hangover_frames
+
+    def process(self, data):
+        """Returns the bytes to upload for this chunk (b"" while idle)."""
+        buf = self._remainder + data
+        usable = len(buf) - (len(buf) % BYTES_PER_FRAME)
+        self._remainder = buf[usable:]
+        out = []
+        for off in range(0, usable, BYTES_PER_FRAME):
+            frame = buf[off:off + BYTES_PER_FRAME]
+            self.frames_in += 1
+            voiced = is_voiced(frame)
+            if voiced:
+                self.last_voiced_at = time.perf_counter()
+            if self.active:
+                out.append(frame)
+                if voiced:
+                    self._silence_left = self.hangover_frames
+                else:
+                    self._silence_left -= 1
+                    if self._silence_left <= 0:
+                        self.active = False
+                        self._voiced_run = 0
+            else:
+                self.preroll.append(frame)
+                self._voiced_run = self._voiced_run + 1 if voiced else 0
+                if self._voiced_run >= self.onset_frames:
+                    self.active = True
+                    self._silence_left = self.hangover_frames
+                    out.extend(self.preroll)
+                    self.preroll.clear()
+        self.frames_sent += len(out)
+        return b"".join(out)
+
+def pcm_rms(data):
+    samples = np.frombuffer(data, dtype=np.int16)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+class EchoReference:
+    """Recent speaker output level, used as the echo estimate for barge-in.
+
+    The playback engine notes every block it hands to the device; level()
+    is the loudest block that may still be coming out of the speaker
+    (hand-off time + duration, widened by window for device latency).
+    """
+    def __init__(self, rate=RECEIVE_SAMPLE_RATE, window=0.3):
+        self.rate = rate
+        self.window = window
+        self._chunks = collections.deque(maxlen=64)
+
+    def note(self, samples):
+        rms = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) if len(samples) else 0.0
+        self._chunks.append((time.monotonic(), len(samples) / self.rate, rms))
+
+    def level(self, now=None):
+        now = now if now is not None else time.monotonic()
+        return max((rms for t, dur, rms in list(self._chunks) if t + dur + self.window >= now), default=0.0)
+
+    def clear(self):
+        self._chunks.clear()
+
+class BargeInDetector:
+    """Watches mic audio during playback for the user talking over TTS.
+
+    A frame counts as user speech when the (stricter) VAD marks it voiced
+    and it is clearly louder than the echo reference. process() returns
+    True once BARGE_IN_CONFIRM_MS of consecutive speech frames are seen;
+    take_preroll() then hands back the recent frames so the onset is
+    uploaded too.
+    """
+    def __init__(self, confirm_ms=BARGE_IN_CONFIRM_MS, echo_ratio=BARGE_IN_ECHO_RATIO, min_rms=BARGE_IN_MIN_RMS):
+        self.vad = webrtcvad.Vad(3)
+        self.confirm_frames = max(1, confirm_ms // FRAME_MS)
+        self.echo_ratio = echo_ratio
+        self.min_rms = min_rms
+        self.frames = collections.deque(maxlen=max(self.confirm_frames, VAD_PREROLL_MS // FRAME_MS))
+        self.triggers = 0
+        self._remainder = b""
+        self._run = 0
+
+    def reset(self):
+        self.frames.clear()
+        self._remainder = b""
+        self._run = 0
+
+    def process(self, data, echo_rms):
+        buf = self._remainder + data
+        usable = len(buf) - (len(buf) % BYTES_PER_FRAME)
+        self._remainder = buf[usable:]
+        threshold = max(self.min_rms, echo_rms * self.echo_ratio)
+        triggered = False
+        for off in range(0, usable, BYTES_PER_FRAME):
+            frame = buf[off:off + BYTES_PER_FRAME]
+            self.frames.append(frame)
+            try:
+                voiced = self.vad.is_speech(frame, IN_RATE)
+            except Exception:
+                voiced = False
+            self._run = self._run + 1 if voiced and pcm_rms(frame) >= threshold else 0
+            if self._run >= self.confirm_frames:
+                triggered = True
+        if triggered:
+            self.triggers += 1
+        return triggered
+
+    def take_preroll(self):
+        data = b"".join(self.frames) + self._remainder
+        self.reset()
+        return data
+
+# ==============================================================================
+# Audio Playback Engine
+# ==============================================================================
+class PlaybackEngine:
+    """Speaker output driven by PyAudio's callback API.
+
+    The loop side copies PCM into a preallocated int16 ring buffer; the
+    device callback copies it out. Each side only advances its own
+    counter, so no lock is needed. Output waits for the jitter target
+    before starting (re-priming after an underrun), and once mark_end()
+    says the turn's audio is complete the remainder is played out and
+    `drained` is set on the loop when the last sample has been handed to
+    the device.
+    """
+    def __init__(self, rate=RECEIVE_SAMPLE_RATE, jitter_ms=PLAYBACK_JITTER_MS, buffer_s=PLAYBACK_BUFFER_S,
+                 frames_per_buffer=PLAYBACK_FRAMES, on_output=None, on_start=None):
+        self.rate = rate
+        self.capacity = max(int(rate * buffer_s), frames_per_buffer * 4)
+        self.jitter_samples = int(rate * jitter_ms / 1000)
+        self.frames_per_buffer = frames_per_buffer
+        self.on_output = on_output  # called from the audio thread with each block played
+        self.on_start = on_start    # called from the audio thread when output (re)starts
+        self._ring = np.zeros(self.capacity, dtype=np.int16)
+        self._out = np.zeros(frames_per_buffer, dtype=np.int16)
+        self._written = 0  # samples ever written; advanced by the loop side only
+        self._read = 0     # samples ever played; advanced by the callback only
+        self._flush_to = None
+        self._primed = False
+        self._ending = False
+        self._loop = None
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.stream = None
+        self.stats = {"underruns": 0, "overruns": 0, "callbacks": 0, "played_s": 0.0}
+
+    def start(self, loop):
+        """Opens the output stream (blocking; run it off the loop)."""
+        self._loop = loop
+        self.stream = get_pya().open(format=pyaudio.paInt16, channels=CHANNELS, rate=self.rate, output=True,
+                               frames_per_buffer=self.frames_per_buffer, stream_callback=self._callback)
+
+    def buffered(self):
+        return self._written - self._read
+
+    def buffered_seconds(self):
+        return self.buffered() / self.rate
+
+    def output_latency(self):
+        try:
+            return self.stream.get_output_latency() if self.stream else 0.0
+        except Exception:
+            return 0.0
+
+    def write(self, data):
+        """Appends PCM16 bytes; returns the unwritten tail if the ring is full."""
+        samples = np.frombuffer(data, dtype=np.int16)
+        free = self.capacity - self.buffered()
+        n = min(len(samples), free)
+        if n < len(samples):
+            self.stats["overruns"] += 1
+        if n:
+            start = self._written % self.capacity
+            first = min(n, self.capacity - start)
+            self._ring[start:start + first] = samples[:first]
+            if first < n:
+                self._ring[:n - first] = samples[first:n]
+            self._ending = False
+            self.drained.clear()
+            self._written += n
+        return data[n * SAMPLE_WIDTH:]
+
+    def mark_end(self):
+        """No more audio is coming for this turn: play out what is buffered."""
+        self._ending = True
+        if self.buffered() == 0:
+            self.drained.set()
+
+    def flush(self):
+        """Drops everything buffered; the callback applies it on its next block."""
+        self._flush_to = self._written
+        self._ending = False
+        self.drained.set()
+
+    async def wait_drained(self, timeout):
+        """Waits until the buffered audio has been played, plus device latency."""
+        try:
+            await asyncio.wait_for(self.drained.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        await asyncio.sleep(self.output_latency())
+        return True
+
+    def _signal_drained(self):
+        if self._ending and self.buffered() == 0:
+            self.drained.set()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        self.stats["callbacks"] += 1
+        if self._flush_to is not None:
+            self._read = max(self._read, self._flush_to)
+            self._flush_to = None
+            self._primed = False
+        avail = self._written - self._read
+        out = self._out if frame_count == len(self._out) else np.zeros(frame_count, dtype=np.int16)
+        if not self._primed:
+            if avail >= self.jitter_samples or (self._ending and avail > 0):
+                self._primed = True
+                if self.on_start is not None:
+                    self.on_start()
+            else:
+                out[:] = 0
+                return (out.tobytes(), pyaudio.paContinue)
+        n = min(avail, frame_count)
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._ring[start:start + first]
+        out[first:n] = self._ring[:n - first]
+        out[n:] = 0
+        self._read += n
+        self.stats["played_s"] += n / self.rate
+        if n < frame_count:
+            self._primed = False
+            if not self._ending:
+                self.stats["underruns"] += 1
+        if n and self._ending and self._read == self._written:
+            self._loop.call_soon_threadsafe(self._signal_drained)
+        if self.on_output is not None and n:
+            self.on_output(out[:n])
+        return (out.tobytes(), pyaudio.paContinue)
+
+    def snapshot(self):
+        return {**self.stats, "buffered_ms": self.buffered_seconds() * 1000}
+
+    def close(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream(); self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
 # ==============================================================================
-# AI Animation Widget
+# Audio Capture Engine
 # ==============================================================================
-class AIAnimationWidget(QWidget):
+class CaptureEngine:
+    """Mic input driven by PyAudio's callback API.
+
+    The device callback copies each block into a preallocated int16 ring
+    buffer and only wakes the loop (call_soon_threadsafe) when a reader is
+    waiting, wake_ms of audio is available and no wake-up is already
+    pending, so the loop sees
+    one hop per batch rather than one executor round-trip per read. If the
+    loop falls behind and the ring fills, new blocks are dropped and
+    counted; PortAudio's own input overflows are counted separately.
+    """
+    def __init__(self, rate=SEND_SAMPLE_RATE, block_ms=CAPTURE_BLOCK_MS, wake_ms=CAPTURE_WAKE_MS, buffer_s=2.0):
+        self.rate = rate
+        self.block = int(rate * block_ms / 1000)
+        self.wake_samples = max(self.block, int(rate * wake_ms / 1000))
+        self.capacity = max(int(rate * buffer_s), self.block * 4)
+        self._ring = np.zeros(self.capacity, dtype=np.int16)
+        self._written = 0  # advanced by the callback only
+        self._read = 0     # advanced by the loop side only
+        self._wake_pending = False
+        self._waiting = False
+        self._ready = asyncio.Event()
+        self._loop = None
+        self.stream = None
+        self.stats = {"callbacks": 0, "wakeups": 0, "overflows": 0, "device_overflows": 0, "max_batch_ms": 0.0}
+
+    def start(self, loop):
+        """Opens the input stream (blocking; run it off the loop)."""
+        self._loop = loop
+        mic_info = get_pya().get_default_input_device_info()
+        self.stream = get_pya().open(format=pyaudio.paInt16, channels=CHANNELS, rate=self.rate, input=True, input_device_index=mic_info["index"],
+                               frames_per_buffer=self.block, stream_callback=self._callback)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        self.stats["callbacks"] += 1
+        if status & getattr(pyaudio, "paInputOverflow", 0):
+            self.stats["device_overflows"] += 1
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        n = len(samples)
+        if self._written - self._read + n > self.capacity:
+            self.stats["overflows"] += 1
+        else:
+            start = self._written % self.capacity
+            first = min(n, self.capacity - start)
+            self._ring[start:start + first] = samples[:first]
+            self._ring[:n - first] = samples[first:]
+            self._written += n
+        if self._waiting and not self._wake_pending and self._written - self._read >= self.wake_samples:
+            self._wake_pending = True
+            self._loop.call_soon_threadsafe(self._wake)
+        return (None, pyaudio.paContinue)
+
+    def _wake(self):
+        self._wake_pending = False
+        self.stats["wakeups"] += 1
+        self._ready.set()
+
+    def available(self):
+        return self._written - self._read
+
+    async def read(self):
+        """Returns all captured PCM16 bytes, waiting for at least one batch."""
+        self._waiting = True
+        try:
+            while self.available() < self.wake_samples:
+                self._ready.clear()
+                await self._ready.wait()
+        finally:
+            self._waiting = False
+        written = self._written
+        n = written - self._read
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        data = self._ring[start:start + first].tobytes()
+        if first < n:
+            data += self._ring[:n - first].tobytes()
+        self._read = written
+        self.stats["max_batch_ms"] = max(self.stats["max_batch_ms"], n * 1000 / self.rate)
+        return data
+
+    def snapshot(self):
+        return {**self.stats, "buffered_ms": self.available() * 1000 / self.rate}
+
+    def close(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream(); self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
+# ==============================================================================
+# Calendar HTTP Client
+# ==============================================================================
+class CalendarClient:
+    """Async client for the MCP Calendar HTTP bridge.
+
+    Requests go through one shared requests.Session (keep-alive pool sized to
+    the concurrency cap) and run on a dedicated thread pool, so the asyncio
+    loop never blocks on calendar I/O and calendar calls never compete with
+    the default executor used for audio/video.
+    """
+    # (connect, read) timeouts per endpoint kind; the read budget is capped by MCP_CAL_TIMEOUT
+    ENDPOINT_TIMEOUTS = {
+        "health": (1.0, 2.0),
+        "calendars": (2.0, 4.0),
+        "events.list": (2.0, 6.0),
+        "events.write": (2.0, 8.0),
+        "events.delete": (2.0, 6.0),
+    }
+
+    def __init__(self, base_url, max_concurrency=MCP_CAL_MAX_CONCURRENCY, default_timeout=MCP_CAL_TIMEOUT):
+        self.base_url = (base_url or "").rstrip('/')
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.default_timeout = float(default_timeout)
+        self._session = None
+        self._session_lock = threading.Lock()  # executor threads race to build the session on first use
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="calendar")
+        self._semaphore = None
+
+    def _get_session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _endpoint_kind(self, method, endpoint):
+        path = endpoint.strip('/')
+        if path == "health":
+            return "health"
+        if path == "calendars":
+            return "calendars"
+        if method == "DELETE":
+            return "events.delete"
+        if method == "GET":
+            return "events.list"
+        return "events.write"
+
+    def timeout_for(self, method, endpoint):
+        connect, read = self.ENDPOINT_TIMEOUTS.get(self._endpoint_kind(method, endpoint), (2.0, self.default_timeout))
+        return (min(connect, self.default_timeout), min(read, self.default_timeout))
+
+    def _request_blocking(self, method, endpoint, params, json_body, timeout):
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        try:
+            resp = self._get_session().request(method, url, params=params, json=json_body, timeout=timeout)
+            ct = resp.headers.get('content-type', '')
+            # Try to parse JSON; otherwise keep text
+            try:
+                payload = resp.json() if 'application/json' in ct or resp.text.strip().startswith(('{','[')) else {"raw": resp.text}
+            except Exception:
+                payload = {"raw": resp.text}
+            if 200 <= resp.status_code < 300:
+                return {"status": "success", "code": resp.status_code, "data": payload}
+            return {"status": "error", "code": resp.status_code, "message": payload if isinstance(payload, str) else payload}
+        except requests.exceptions.ConnectionError as e:
+            return {"status": "error", "code": 0, "message": f"Cannot reach MCP Calendar server at {self.base_url}: {e}"}
+        except requests.exceptions.Timeout:
+            return {"status": "error", "code": 0, "message": "MCP Calendar request timed out"}
+        except Exception as e:
+            return {"status": "error", "code": 0, "message": f"Unexpected MCP Calendar error: {e}"}
+
+    async def request(self, method, endpoint, params=None, json_body=None, timeout=None):
+        """Calls the bridge without blocking the event loop.
+        Returns a standardized dict with status, data/message, and code.
+        """
+        method = method.upper()
+        if timeout is None:
+            timeout = self.timeout_for(method, endpoint)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        t0 = time.time()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, self._request_blocking, method, endpoint, params, json_body, timeout)
+        if diag_enabled(DIAG_DEBUG):
+            diag("calendar.request", method=method, endpoint=endpoint, code=result.get("code"), ms=int((time.time() - t0) * 1000))
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            try:
+                self._session.close()
+            except Exception:
+                pass
+            self._session = None
+
+# ==============================================================================
+# Tool Execution
+# ==============================================================================
+class ToolSpec:
+    """Registry entry for a Gemini function tool.
+
+    blocking tools run on the executor's thread pool, the rest are awaited as
+    coroutines. Calls that share a resource are run in request order when any
+    of them writes to it (e.g. create_folder then create_file); everything
+    else in a batch runs concurrently.
+    """
+    __slots__ = ("name", "handler", "blocking", "timeout", "resource", "writes")
+
+    def __init__(self, name, handler, blocking=False, timeout=None, resource=None, writes=False):
+        self.name = name
+        self.handler = handler
+        self.blocking = blocking
+        self.timeout = timeout
+        self.resource = resource
+        self.writes = writes
+
+
+class ToolExecutor:
+    """Dispatches a batch of function calls concurrently and records per-tool latency."""
+
+    def __init__(self, max_workers=TOOL_MAX_WORKERS, default_timeout=TOOL_TIMEOUT, executor=None, max_threads=None):
+        self.tools = {}
+        self.default_timeout = default_timeout
+        self.stats = {}  # name -> {count, errors, timeouts, total_ms, max_ms, last_ms}
+        # A shared pool (server mode) is left running on shutdown; its owner closes it
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        # Cap on this executor's blocking calls in the pool, so one session cannot take every shared thread
+        self._threads = asyncio.Semaphore(max_threads) if max_threads else None
+
+    def register(self, name, handler, blocking=False, timeout=None, resource=None, writes=False):
+        self.tools[name] = ToolSpec(name, handler, blocking=blocking, timeout=timeout, resource=resource, writes=writes)
+
+    def _record(self, name, elapsed_ms, outcome):
+        st = self.stats.setdefault(name, {"count": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+        st["count"] += 1
+        st["total_ms"] += elapsed_ms
+        st["last_ms"] = elapsed_ms
+        if elapsed_ms > st["max_ms"]: st["max_ms"] = elapsed_ms
+        if outcome == "timeout": st["timeouts"] += 1
+        elif outcome == "error": st["errors"] += 1
+
+    async def _invoke(self, name, args):
+        spec = self.tools.get(name)
+        if spec is None:
+            return {"status": "error", "message": f"Unknown tool '{name}'."}
+        timeout = spec.timeout or self.default_timeout
+        t0 = time.perf_counter()
+        outcome = "ok"
+        try:
+            if spec.blocking:
+                fut = self._run_blocking(spec.handler, args)
+            else:
+                fut = spec.handler(args)
+            result = await asyncio.wait_for(fut, timeout=timeout)
+            if not isinstance(result, dict):
+                result = {"status": "success", "data": result}
+            elif result.get("status") == "error":
+                outcome = "error"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            result = {"status": "error", "message": f"Tool '{name}' timed out after {timeout:g}s."}
+        except Exception as e:
+            outcome = "error"
+            result = {"status": "error", "message": f"Tool '{name}' failed: {e}"}
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self._record(name, elapsed_ms, outcome)
+        if diag_enabled(DIAG_DEBUG):
+            diag("tool.done", name=name, ms=f"{elapsed_ms:.1f}", outcome=outcome)
+        return result
+
+    async def _run_blocking(self, handler, args):
+        if self._threads is None:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, handler, args)
+        loop = asyncio.get_running_loop()
+        await self._threads.acquire()
+        try:
+            cf = self._executor.submit(handler, args)
+        except BaseException:
+            self._threads.release()
+            raise
+        # Released when the thread is actually free, not when a timeout gives up on the call
+        cf.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(self._threads.release))
+        return await asyncio.wrap_future(cf)
+
+    async def run_batch(self, function_calls):
+        """Runs all calls of one tool_call message; returns function_responses in call order."""
+        calls = list(function_calls or [])
+        results = [None] * len(calls)
+        write_resources = set()
+        for fc in calls:
+            spec = self.tools.get(fc.name)
+            if spec is not None and spec.writes and spec.resource:
+                write_resources.add(spec.resource)
+        chains = {}
+        for i, fc in enumerate(calls):
+            spec = self.tools.get(fc.name)
+            key = spec.resource if spec is not None and spec.resource in write_resources else i
+            chains.setdefault(key, []).append(i)
+
+        async def run_chain(indices):
+            for i in indices:
+                results[i] = await self._invoke(calls[i].name, calls[i].args or {})
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(run_chain(ix) for ix in chains.values()))
+        if diag_enabled(DIAG_DEBUG):
+            diag("tool.batch_done", calls=len(calls), chains=len(chains), ms=f"{(time.perf_counter() - t0) * 1000:.1f}")
+        return [{"id": fc.id, "name": fc.name, "response": results[i]} for i, fc in enumerate(calls)]
+
+    def shutdown(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+# ==============================================================================
+# TTS Connection Pool
+# ==============================================================================
+class TTSConnectionPool:
+    """Keeps pre-opened ElevenLabs stream-input sockets ready for the next turn.
+
+    A stream-input socket serves a single generation (it closes after the
+    final message), so instead of reusing one socket the pool hands out an
+    already-handshaken socket and immediately opens its replacement in the
+    background. Sockets that close while idle or exceed max_age are replaced.
+    """
+    def __init__(self, uri, init_message, size=TTS_POOL_SIZE, max_age=TTS_WARM_MAX_AGE):
+        self.uri = uri
+        self.init_message = init_message
+        self.size = size
+        self.max_age = max_age
+        self.stats = {"warm_hits": 0, "cold_opens": 0, "reconnects": 0}
+        self._warm = collections.deque()  # (websocket, opened_at)
+        self._wakeup = None
+        self._task = None
+        self._closed = False
+
+    async def _open(self):
+        websocket = await websockets.connect(self.uri)
+        await websocket.send(self.init_message)
+        return websocket
+
+    def _usable(self, websocket, opened_at):
+        return getattr(websocket, "close_code", None) is None and (time.monotonic() - opened_at) < self.max_age
+
+    async def _discard(self, websocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+    def prewarm(self):
+        """Ensures the background refill loop runs; cheap to call on every turn hint."""
+        if self._closed or self.size <= 0:
+            return
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._maintain())
+        self._wakeup.set()
+
+    async def _maintain(self):
+        backoff = 0.5
+        while not self._closed:
+            for entry in list(self._warm):
+                if not self._usable(*entry):
+                    self._warm.remove(entry)
+                    self.stats["reconnects"] += 1
+                    await self._discard(entry[0])
+            if len(self._warm) < self.size:
+                try:
+                    websocket = await self._open()
+                except Exception as e:
+                    diag("tts_pool.open_failed", DIAG_ERROR, error=type(e).__name__, retry_in=backoff)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30.0)
+                    continue
+                if self._closed:
+                    await self._discard(websocket)
+                    break
+                self._warm.append((websocket, time.monotonic()))
+                backoff = 0.5
+                diag("tts_pool.warmed", warm=len(self._warm))
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(5.0, self.max_age / 4))
+            except asyncio.TimeoutError:
+                pass
+
+    async def acquire(self):
+        while self._warm:
+            websocket, opened_at = self._warm.popleft()
+            if self._usable(websocket, opened_at):
+                self.stats["warm_hits"] += 1
+                self.prewarm()
+                return websocket
+            await self._discard(websocket)
+        self.stats["cold_opens"] += 1
+        websocket = await self._open()
+        self.prewarm()
+        return websocket
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        """Yields a ready socket for one turn and closes it afterwards."""
+        websocket = await self.acquire()
+        try:
+            yield websocket
+        finally:
+            await self._discard(websocket)
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+        while self._warm:
+            await self._discard(self._warm.popleft()[0])
+
+def make_tts_pool(size=TTS_POOL_SIZE, base_url=None):
+    """Pool of stream-input sockets for the configured voice and model."""
+    tts_uri = f"{base_url or ELEVENLABS_WS_URL}/v1/text-to-speech/{VOICE_ID}/stream-input?model_id={TTS_MODEL_ID}&output_format=pcm_24000&inactivity_timeout=180"
+    tts_bos = {"text": " ", "voice_settings": {"stability": 0.5, "similarity_boost": 0.8}, "xi_api_key": ELEVENLABS_API_KEY,}
+    if TTS_SHAPING:
+        tts_bos["generation_config"] = {"chunk_length_schedule": TTS_CHUNK_SCHEDULE}
+    return TTSConnectionPool(tts_uri, json.dumps(tts_bos), size=size)
+
+# ==============================================================================
+# TTS Phrase Cache
+# ==============================================================================
+class CachedAudio:
+    """TTS queue item for a fixed phrase: cached PCM to play, or (pcm=None) text to synthesize and store."""
+    __slots__ = ("text", "pcm")
+
+    def __init__(self, text, pcm=None):
+        self.text = text
+        self.pcm = pcm
+
+class PhraseCache:
+    """Disk cache of synthesized PCM for repeated assistant phrases.
+
+    Entries are keyed by sha1(voice_id | model_id | normalized text) and
+    stored as raw 24 kHz PCM16 files. Reads bump the file's mtime so the
+    directory doubles as an LRU: when the total exceeds max_bytes the
+    least recently used files are removed. Methods do blocking file I/O;
+    call them via asyncio.to_thread.
+    """
+    def __init__(self, directory=TTS_CACHE_DIR, max_mb=TTS_CACHE_MAX_MB, voice_id=VOICE_ID, model_id=TTS_MODEL_ID):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._total = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def normalize(text):
+        return " ".join((text or "").split()).lower()
+
+    def cacheable(self, text):
+        return self.enabled and 0 < len(self.normalize(text)) <= TTS_CACHE_MAX_CHARS
+
+    def _path(self, text):
+        key = hashlib.sha1(f"{self.voice_id}|{self.model_id}|{self.normalize(text)}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def contains(self, text):
+        return self.cacheable(text) and os.path.exists(self._path(text))
+
+    def get(self, text):
+        if not self.cacheable(text):
+            return None
+        path = self._path(text)
+        try:
+            with open(path, "rb") as f:
+                pcm = f.read()
+            os.utime(path, None)
+        except OSError:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return pcm
+
+    def put(self, text, pcm):
+        if not self.cacheable(text) or not pcm or len(pcm) > self.max_bytes:
+            return False
+        path = self._path(text)
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if self._total is None:
+                    self._total = sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith(".pcm"))
+                try:
+                    self._total -= os.path.getsize(path)
+                except OSError:
+                    pass
+                fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(pcm)
+                    os.replace(tmp, path)
+                except OSError:
+                    with contextlib.suppress(OSError):
+                        os.remove(tmp)
+                    raise
+            except OSError as e:
+                diag("tts_cache.store_failed", DIAG_ERROR, error=e)
+                return False
+            self._total += len(pcm)
+            self.stats["stores"] += 1
+            if self._total > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self):
+        entries = sorted((e for e in os.scandir(self.directory) if e.name.endswith(".pcm")), key=lambda e: e.stat().st_mtime)
+        for entry in entries:
+            if self._total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._total -= size
+            self.stats["evictions"] += 1
+
+# ==============================================================================
+# TTS Text Shaper
+# ==============================================================================
+class TextShaper:
+    """Coalesces streamed model text into phrases for the TTS socket.
+
+    Chunks are joined as-is (no padding, so words split across chunks stay
+    whole) and released at the last sentence end, or at a clause break
+    once TTS_MIN_CLAUSE_CHARS are buffered. If nothing qualifies before
+    the deadline, everything up to the last word boundary goes out, so the
+    first phrase of a turn still starts quickly.
+    """
+    SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+")
+    CLAUSE_END = re.compile(r"[,;:—–]\s+")
+
+    def __init__(self, first_wait_ms=TTS_FIRST_PHRASE_WAIT_MS, wait_ms=TTS_PHRASE_WAIT_MS, min_clause_chars=TTS_MIN_CLAUSE_CHARS):
+        self.first_wait = first_wait_ms / 1000
+        self.wait = wait_ms / 1000
+        self.min_clause_chars = min_clause_chars
+        self.buf = ""
+        self.phrases = 0
+        self.forced = 0
+        self._since = None
+
+    def feed(self, text, now):
+        """Adds a chunk; returns the phrases that are ready to send."""
+        if not self.buf:
+            self._since = now
+        self.buf += text
+        cut = None
+        for m in self.SENTENCE_END.finditer(self.buf):
+            cut = m.end()
+        if cut is None:
+            for m in self.CLAUSE_END.finditer(self.buf):
+                if m.start() >= self.min_clause_chars:
+                    cut = m.end()
+        return [self._take(cut, now)] if cut else []
+
+    def time_left(self, now):
+        """Seconds until buffered text must be forced out (None if empty)."""
+        if not self.buf:
+            return None
+        return max(0.0, self._since + (self.wait if self.phrases else self.first_wait) - now)
+
+    def force(self, now):
+        """Deadline hit: release up to the last word boundary."""
+        if self.buf.rstrip()[-1:] in ".!?…":
+            cut = len(self.buf)
+        else:
+            cut = max(self.buf.rfind(" "), self.buf.rfind("\n")) + 1
+        if cut <= 0:
+            self._since = now  # a single unfinished word; give it another window
+            return None
+        self.forced += 1
+        return self._take(cut, now)
+
+    def finish(self):
+        text, self.buf = self.buf, ""
+        if not text.strip():
+            return None
+        self.phrases += 1
+        return text if text[-1].isspace() else text + " "
+
+    def _take(self, cut, now):
+        phrase, self.buf = self.buf[:cut], self.buf[cut:]
+        self._since = now
+        self.phrases += 1
+        return phrase if phrase[-1].isspace() else phrase + " "
+
+# ==============================================================================
+# Uplink Scheduler
+# ==============================================================================
+class UplinkScheduler:
+    """Multi-lane replacement for a single Gemini upload queue.
+
+    Audio is served with strict priority and never blocks the producer: when
+    the lane is full the oldest chunk is dropped. The image lane holds one
+    slot and a new frame replaces an unsent one (latest wins), so a large
+    JPEG can never sit in front of mic audio or pile up behind it.
+    """
+    LANES = ("audio", "image")
+
+    def __init__(self, audio_maxlen=UPLINK_AUDIO_MAX_CHUNKS):
+        self._audio = collections.deque()  # (msg, enqueued_at)
+        self._audio_maxlen = audio_maxlen
+        self._image = None  # (msg, enqueued_at)
+        self._ready = asyncio.Event()
+        self.stats = {lane: {"enqueued": 0, "sent": 0, "dropped": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0} for lane in self.LANES}
+
+    def put_audio(self, msg):
+        if len(self._audio) >= self._audio_maxlen:
+            self._audio.popleft()
+            self.stats["audio"]["dropped"] += 1
+        self._audio.append((msg, time.perf_counter()))
+        self.stats["audio"]["enqueued"] += 1
+        self._ready.set()
+
+    def put_image(self, msg):
+        if self._image is not None:
+            self.stats["image"]["dropped"] += 1
+        self._image = (msg, time.perf_counter())
+        self.stats["image"]["enqueued"] += 1
+        self._ready.set()
+
+    def _take(self, lane, entry):
+        msg, enqueued_at = entry
+        wait_ms = (time.perf_counter() - enqueued_at) * 1000
+        st = self.stats[lane]
+        st["sent"] += 1
+        st["wait_ms_total"] += wait_ms
+        if wait_ms > st["wait_ms_max"]: st["wait_ms_max"] = wait_ms
+        return lane, msg
+
+    async def get(self):
+        """Waits for the next message; returns (lane, msg)."""
+        while True:
+            if self._audio:
+                return self._take("audio", self._audio.popleft())
+            if self._image is not None:
+                entry, self._image = self._image, None
+                return self._take("image", entry)
+            self._ready.clear()
+            await self._ready.wait()
+
+    def clear_audio(self):
+        dropped = len(self._audio)
+        self._audio.clear()
+        self.stats["audio"]["dropped"] += dropped
+        return dropped
+
+    def depth(self, lane):
+        return len(self._audio) if lane == "audio" else (1 if self._image is not None else 0)
+
+    def qsize(self):
+        return self.depth("audio") + self.depth("image")
+
+    def snapshot(self):
+        snap = {}
+        for lane, st in self.stats.items():
+            snap[lane] = {
+                "depth": self.depth(lane), "enqueued": st["enqueued"], "sent": st["sent"], "dropped": st["dropped"],
+                "wait_ms_avg": (st["wait_ms_total"] / st["sent"]) if st["sent"] else 0.0, "wait_ms_max": st["wait_ms_max"],
+            }
+        return snap
+
+# ==============================================================================
+# Frame Change Detection
+# ==============================================================================
+class FrameChangeDetector:
+    """Decides which video frames are worth uploading to Gemini.
+
+    Each candidate is reduced to a small grayscale thumbnail and compared
+    (mean absolute difference) with the thumbnail of the last frame sent.
+    Changed frames are sent at most every min_interval; an unchanged scene
+    only sends a keyframe every keyframe_interval.
+    """
+    def __init__(self, min_interval=FRAME_MIN_INTERVAL, keyframe_interval=FRAME_KEYFRAME_INTERVAL, threshold=FRAME_DIFF_THRESHOLD, thumb_size=(32, 32)):
+        self.min_interval = min_interval
+        self.keyframe_interval = keyframe_interval
+        self.threshold = threshold
+        self.thumb_size = thumb_size
+        self.last_diff = 0.0
+        self.stats = {"checked": 0, "sent": 0, "skipped": 0}
+        self._last_thumb = None
+        self._last_sent = float("-inf")
+
+    def _thumbnail(self, frame):
+        # Integer decimation first keeps the area filter cheap on 4K/5K captures
+        step = max(1, min(frame.shape[0] // (self.thumb_size[1] * 4), frame.shape[1] // (self.thumb_size[0] * 4)))
+        small = cv2.resize(frame[::step, ::step], self.thumb_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            # Channel average: independent of BGR/RGB/BGRA order
+            small = small[:, :, :3].mean(axis=2)
+        return small.astype(np.float32)
+
+    def reset(self):
+        self._last_thumb = None
+        self._last_sent = float("-inf")
+
+    def should_send(self, frame, now=None):
+        now = time.monotonic() if now is None else now
+        self.stats["checked"] += 1
+        thumb = self._thumbnail(frame)
+        if self._last_thumb is None or self._last_thumb.shape != thumb.shape:
+            self.last_diff = float("inf")
+        else:
+            self.last_diff = float(np.mean(np.abs(thumb - self._last_thumb)))
+        since = now - self._last_sent
+        changed = self.last_diff >= self.threshold
+        if (changed and since >= self.min_interval) or since >= self.keyframe_interval:
+            self._last_thumb = thumb
+            self._last_sent = now
+            self.stats["sent"] += 1
+            return True
+        self.stats["skipped"] += 1
+        return False
+
+# ==============================================================================
+# Screen Capture Backends
+# ==============================================================================
+def _parse_region(spec):
+    try:
+        left, top, width, height = (int(v) for v in spec.split(","))
+        if width > 0 and height > 0:
+            return {"left": left, "top": top, "width": width, "height": height}
+    except Exception:
+        pass
+    if spec:
+        print(f">>> [WARN] Ignoring invalid SCREEN_REGION '{spec}' (expected left,top,width,height)")
+    return None
+
+
+class ScreenCapture(abc.ABC):
+    """Base screen grabber for stream_video_to_gui.
+
+    Grabs run on one dedicated thread (some backends keep per-thread OS
+    handles) and return a uint8 array in the backend's channel order (fmt).
+    """
+    fmt = "RGB"
+
+    def __init__(self, monitor=SCREEN_MONITOR, region=None, downscale=SCREEN_DOWNSCALE):
+        self.monitor = monitor
+        self.region = region
+        self.downscale = downscale if 0 < downscale < 1 else 1.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screen")
+
+    @abc.abstractmethod
+    def _grab(self):
+        """Returns one frame as a uint8 array in `fmt` channel order."""
+
+    def _grab_scaled(self):
+        frame = self._grab()
+        if self.downscale < 1.0:
+            h, w = frame.shape[:2]
+            frame = cv2.resize(frame, (max(1, int(w * self.downscale)), max(1, int(h * self.downscale))), interpolation=cv2.INTER_LINEAR)
+        return frame
+
+    async def grab(self):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._grab_scaled)
+
+    def _release(self):
+        pass
+
+    def close(self):
+        try:
+            self._executor.submit(self._release)
+        except Exception:
+            pass
+        self._executor.shutdown(wait=False)
+
+
+class PILScreenCapture(ScreenCapture):
+    """PIL.ImageGrab fallback; supports a region but not monitor selection."""
+    fmt = "RGB"
+
+    def _grab(self):
+        bbox = None
+        if self.region:
+            r = self.region
+            bbox = (r["left"], r["top"], r["left"] + r["width"], r["top"] + r["height"])
+        img = ImageGrab.grab(bbox=bbox)
+        return np.asarray(img if img.mode == "RGB" else img.convert("RGB"))
+
+
+class MssScreenCapture(ScreenCapture):
+    """mss grabber: one reused instance, raw BGRA buffer wrapped without PIL or copies."""
+    fmt = "BGRA"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sct = None
+
+    def _grab(self):
+        if self._sct is None:
+            import mss
+            self._sct = mss.mss()
+        if self.region:
+            area = self.region
+        else:
+            monitors = self._sct.monitors
+            area = monitors[self.monitor] if 0 <= self.monitor < len(monitors) else monitors[min(1, len(monitors) - 1)]
+        shot = self._sct.grab(area)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def _release(self):
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+            self._sct = None
+
+
+def make_screen_capture(backend=SCREEN_CAPTURE_BACKEND):
+    region = _parse_region(SCREEN_REGION)
+    if backend in ("auto", "mss"):
+        try:
+            import mss  # noqa: F401
+            return MssScreenCapture(region=region)
+        except ImportError:
+            if backend == "mss":
+                print(">>> [WARN] mss not installed; falling back to PIL screen capture")
+    return PILScreenCapture(region=region)
+
+# ==============================================================================
+# Video Preview Renderer
+# ==============================================================================
+class PreviewRenderer:
+    """Scales captured frames down to the preview size on the worker side.
+
+    The resize runs on the full-resolution capture before any colour
+    conversion and writes into one of two reused buffers. The returned
+    QImage wraps that buffer without a copy; it stays untouched until the
+    GUI acknowledges the frame (release(), via AI_Core.ack_frame), and a
+    render in the meantime (the re-arm after a lost ack) uses the other one.
+    """
+    QT_FORMATS = {"BGR": "Format_BGR888", "RGB": "Format_RGB888", "BGRA": "Format_RGB32"}
+
+    def __init__(self):
+        self._buffers = [None, None]
+        self._in_use = None  # index of the buffer behind the unacknowledged QImage
+
+    def release(self):
+        """The GUI is done with the last image (it has been copied into a pixmap)."""
+        self._in_use = None
+
+    def render(self, frame, fmt, target_w, target_h):
+        h, w = frame.shape[:2]
+        scale = min(target_w / w, target_h / h)
+        dw, dh = max(1, int(w * scale)), max(1, int(h * scale))
+        shape = (dh, dw) + frame.shape[2:]
+        idx = 1 if self._in_use == 0 else 0
+        buf = self._buffers[idx]
+        if buf is None or buf.shape != shape:
+            buf = self._buffers[idx] = np.empty(shape, dtype=np.uint8)
+        if (dw, dh) == (w, h):
+            np.copyto(buf, frame)
+        else:
+            # Bilinear: an order of magnitude cheaper than INTER_AREA at non-integer 4K/5K ratios
+            cv2.resize(frame, (dw, dh), dst=buf, interpolation=cv2.INTER_LINEAR)
+        from PySide6.QtGui import QImage  # only reached with a GUI attached
+        self._in_use = idx
+        return QImage(buf.data, dw, dh, buf.strides[0], getattr(QImage, self.QT_FORMATS[fmt]))
+
+    def blank(self):
+        from PySide6.QtGui import QImage
+        return QImage()
+
+# ==============================================================================
+# Telemetry Sampler
+# ==============================================================================
+class TelemetrySampler:
+    """Samples system and process stats on a background thread.
+
+    Snapshots land in a ring buffer; the GUI only reads the latest entry,
+    so nothing on the Qt thread ever waits on psutil. Extra sources (tool
+    latency, uplink lanes) can be attached with add_source().
+    """
+    def __init__(self, interval=1.0, history=300):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=history)
+        self._sources = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+
+    def add_source(self, name, fn):
+        self._sources.append((name, fn))
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+    def series(self, key, count=60):
+        return [snap[key] for snap in list(self.samples)[-count:] if snap.get(key) is not None]
+
+    def _run(self):
+        try:
+            import psutil
+            proc = psutil.Process()
+            psutil.cpu_percent(None); proc.cpu_percent(None)  # prime the interval counters
+        except Exception as e:
+            print(f">>> [WARN] System telemetry unavailable: {e}")
+            psutil = proc = None
+        while not self._stop.wait(self.interval):
+            snap = {"t": time.time()}
+            if psutil is not None:
+                try:
+                    snap["cpu"] = psutil.cpu_percent(None)
+                    snap["mem"] = psutil.virtual_memory().percent
+                    with proc.oneshot():
+                        snap["proc_cpu"] = proc.cpu_percent(None)
+                        snap["proc_rss_mb"] = proc.memory_info().rss / (1024 * 1024)
+                        snap["proc_threads"] = proc.num_threads()
+                except Exception:
+                    pass
+            for name, fn in self._sources:
+                try:
+                    snap[name] = fn()
+                except Exception:
+                    pass  # source mutated mid-read; next sample will catch up
+            self.samples.append(snap)
+
+# ==============================================================================
+# Turn Latency Tracer
+# ==============================================================================
+class TurnTracer:
+    """Links the voice pipeline's stages into one timeline per turn.
+
+    User input (end of speech or a submitted line) is noted as it happens;
+    the turn itself opens on the model's first token and collects the
+    first-only marks below until playback ends. Finished turns feed the
+    latency histograms and, when a trace file is configured, Chrome
+    trace-event spans. Timestamps are perf_counter() seconds.
+    """
+    STAGES = ("mic_end", "first_token", "first_tts_audio", "first_speaker_write", "playback_end")
+    SPANS = (("model", "mic_end", "first_token"),
+             ("tts", "first_token", "first_tts_audio"),
+             ("playout", "first_tts_audio", "first_speaker_write"),
+             ("playback", "first_speaker_write", "playback_end"))
+    INPUT_MAX_AGE = 30.0  # older user input is not attributed to a new turn
+
+    def __init__(self, history=500, keep_events=False):
+        self.current = None
+        self.turns = collections.deque(maxlen=history)
+        self.samples = collections.defaultdict(lambda: collections.deque(maxlen=history))
+        self.keep_events = keep_events
+        self.events = []
+        self._epoch = time.perf_counter()
+        self._next_id = 1
+        self._pending_input = None
+        self._lock = threading.Lock()
+
+    def note_input(self, source, t=None):
+        """Records the end of user input; the next turn measures from here."""
+        self._pending_input = (source, t if t is not None else time.perf_counter())
+
+    def start_turn(self, t=None):
+        t = t if t is not None else time.perf_counter()
+        with self._lock:
+            if self.current is not None:
+                self._finish(self.current)
+            turn = {"id": self._next_id, "source": "model", "marks": {}, "tags": {}}
+            self._next_id += 1
+            pending, self._pending_input = self._pending_input, None
+            if pending and 0 <= t - pending[1] <= self.INPUT_MAX_AGE:
+                turn["source"] = pending[0]
+                turn["marks"]["mic_end"] = pending[1]
+            self.current = turn
+            return turn["id"]
+
+    def mark(self, stage, t=None):
+        """Stamps the first occurrence of a stage on the open turn."""
+        t = t if t is not None else time.perf_counter()
+        if self.current is None:
+            if stage != "first_token":
+                return
+            self.start_turn(t)
+        marks = self.current["marks"]
+        if stage not in marks:
+            marks[stage] = t
+
+    def tag(self, key, value):
+        if self.current is not None:
+            self.current["tags"][key] = value
+
+    def end_turn(self, t=None):
+        """Marks playback end and closes the open turn."""
+        if self.current is None:
+            return None
+        self.mark("playback_end", t)
+        with self._lock:
+            turn, self.current = self.current, None
+            if turn is not None:
+                self._finish(turn)
+        return turn
+
+    def _finish(self, turn):
+        marks = turn["marks"]
+        metrics = {}
+        # Marks come from several threads and paths (a cache hit can start playout early); a span whose
+        # end precedes its start is dropped rather than fed to the percentiles as a negative latency
+        for name, a, b in self.SPANS:
+            if a in marks and b in marks and marks[b] >= marks[a]:
+                metrics[name] = (marks[b] - marks[a]) * 1000
+        if "mic_end" in marks and "first_speaker_write" in marks and marks["first_speaker_write"] >= marks["mic_end"]:
+            metrics["ttfa"] = (marks["first_speaker_write"] - marks["mic_end"]) * 1000
+        turn["metrics"] = metrics
+        self.turns.append(turn)
+        for name, ms in metrics.items():
+            self.samples[name].append(ms)
+        if self.keep_events:
+            self.events.extend(self._chrome_events(turn))
+        diag("trace.turn", DIAG_INFO, id=turn["id"], source=turn["source"], **{f"{k}_ms": f"{v:.0f}" for k, v in metrics.items()}, **turn["tags"])
+
+    def percentiles(self, metric="ttfa", tag=None):
+        """p50/p95/p99 (ms) of a metric, optionally only over turns with tag=(key, value)."""
+        if tag is None:
+            values = sorted(self.samples[metric])
+        else:
+            key, value = tag
+            values = sorted(t["metrics"][metric] for t in list(self.turns)
+                            if metric in t["metrics"] and t["tags"].get(key) == value)
+        if not values:
+            return {"count": 0}
+        pick = lambda q: values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+        return {"count": len(values), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": values[-1]}
+
+    def snapshot(self):
+        return {name: self.percentiles(name) for name in list(self.samples)}
+
+    def _chrome_events(self, turn):
+        us = lambda t: round((t - self._epoch) * 1e6)
+        marks = turn["marks"]
+        args = {"turn": turn["id"], "source": turn["source"], **turn["tags"]}
+        pid = os.getpid()
+        events = []
+        present = [marks[s] for s in self.STAGES if s in marks]
+        if len(present) >= 2:
+            events.append({"name": f"turn {turn['id']}", "cat": "turn", "ph": "X", "pid": pid, "tid": 1,
+                           "ts": us(min(present)), "dur": us(max(present)) - us(min(present)), "args": {**args, **turn["metrics"]}})
+        for name, a, b in self.SPANS:
+            if name in turn["metrics"]:
+                events.append({"name": name, "cat": "stage", "ph": "X", "pid": pid, "tid": 2,
+                               "ts": us(marks[a]), "dur": us(marks[b]) - us(marks[a]), "args": args})
+        for stage in self.STAGES:
+            if stage in marks:
+                events.append({"name": stage, "cat": "mark", "ph": "i", "s": "t", "pid": pid, "tid": 2, "ts": us(marks[stage]), "args": args})
+        return events
+
+    def export_chrome_trace(self, path):
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": 1, "args": {"name": "turns"}},
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": 2, "args": {"name": "stages"}}]
+        with self._lock:
+            events = meta + list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events) - len(meta)
+
+    def summary(self, by=None):
+        """Percentile lines per metric; with by=<tag key>, TTFA is also split per tag value."""
+        lines = []
+        for name in ("ttfa", "model", "tts", "playout", "playback"):
+            p = self.percentiles(name)
+            if p["count"]:
+                lines.append(f"{name} p50={p['p50']:.0f}ms p95={p['p95']:.0f}ms p99={p['p99']:.0f}ms (n={p['count']})")
+        if by:
+            values = sorted({str(t["tags"][by]) for t in list(self.turns) if by in t["tags"]})
+            for value in values:
+                p = self.percentiles("ttfa", tag=(by, value))
+                if p["count"]:
+                    lines.append(f"ttfa[{by}={value}] p50={p['p50']:.0f}ms p95={p['p95']:.0f}ms p99={p['p99']:.0f}ms (n={p['count']})")
+        return lines
+
+# ==============================================================================
+# Staged Boot Loader
+# ==============================================================================
+class BootLoader(QObject):
+    """Imports and initialises the heavy subsystems off the GUI thread.
+
+    The window is shown with only PySide6 and numpy loaded; each stage below
+    reports back as it finishes so the status panel can show progress, and
+    `finished` fires once everything AI_Core needs is in place.
+    """
+    stage_ready = Signal(str, float)
+    stage_failed = Signal(str, str)
+    finished = Signal()
+
+    STAGES = ("audio", "ai", "video")
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.angle_y = 0
-        self.angle_x = 0
-        self.sphere_points = self.create_sphere_points()
-        self.is_speaking = False
-        self.pulse_angle = 0
+        self.status = {name: "LOADING" for name in self.STAGES}
+        self._thread = None
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.start(30) # Update about 33 times per second
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="boot-loader", daemon=True)
+        self._thread.start()
 
-    def start_speaking_animation(self):
-        """Activates the speaking animation state."""
-        self.is_speaking = True
+    def _stage_audio(self):
+        ensure_loaded(pyaudio, webrtcvad)
+        get_pya()
+        get_vad()
 
-    def stop_speaking_animation(self):
-        """Deactivates the speaking animation state."""
-        self.is_speaking = False
-        self.pulse_angle = 0 # Reset for a clean start next time
-        self.update() # Schedule a final repaint in the non-speaking state
-
-    def create_sphere_points(self, radius=60, num_points_lat=20, num_points_lon=40):
-        """Creates a list of QVector3D points on the surface of a sphere."""
-        points = []
-        for i in range(num_points_lat + 1):
-            lat = math.pi * (-0.5 + i / num_points_lat)
-            y = radius * math.sin(lat)
-            xy_radius = radius * math.cos(lat)
-
-            for j in range(num_points_lon):
-                lon = 2 * math.pi * (j / num_points_lon)
-                x = xy_radius * math.cos(lon)
-                z = xy_radius * math.sin(lon)
-                points.append(QVector3D(x, y, z))
-        return points
-
-    def update_animation(self):
-        self.angle_y += 0.8
-        self.angle_x += 0.2
-        if self.is_speaking:
-            self.pulse_angle += 0.2
-            if self.pulse_angle > math.pi * 2:
-                self.pulse_angle -= math.pi * 2
-
-        if self.angle_y >= 360: self.angle_y = 0
-        if self.angle_x >= 360: self.angle_x = 0
-        self.update()
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.fillRect(self.rect(), Qt.transparent)
-
-        w, h = self.width(), self.height()
-        painter.translate(w / 2, h / 2)
-
-        pulse_factor = 1.0
-        if self.is_speaking:
-            pulse_amplitude = 0.08 # Pulse by 8%
-            pulse = (1 + math.sin(self.pulse_angle)) / 2
-            pulse_factor = 1.0 + (pulse * pulse_amplitude)
-
-        rotation_y = QMatrix4x4(); rotation_y.rotate(self.angle_y, 0, 1, 0)
-        rotation_x = QMatrix4x4(); rotation_x.rotate(self.angle_x, 1, 0, 0)
-        rotation = rotation_y * rotation_x
-
-        projected_points = []
-        for point in self.sphere_points:
-            rotated_point = rotation.map(point)
-            
-            z_factor = 200 / (200 + rotated_point.z())
-            x = (rotated_point.x() * z_factor) * pulse_factor
-            y = (rotated_point.y() * z_factor) * pulse_factor
-            
-            size = (rotated_point.z() + 60) / 120
-            alpha = int(50 + 205 * size)
-            point_size = 1 + size * 3
-            projected_points.append((x, y, point_size, alpha))
-
-        projected_points.sort(key=lambda p: p[2])
-
-        for x, y, point_size, alpha in projected_points:
-            # TARS-inspired colors: amber when speaking, dimmer amber when idle
-            color = QColor(255, 176, 0, alpha) if self.is_speaking else QColor(180, 120, 0, alpha)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(color))
-            painter.drawEllipse(int(x), int(y), int(point_size), int(point_size))
+    def _stage_ai(self):
+        ensure_loaded(genai, genai_errors, websockets, requests)
+
+    def _stage_video(self):
+        ensure_loaded(cv2, PIL, ImageGrab)
+        if SCREEN_CAPTURE_BACKEND in ("auto", "mss"):
+            try:
+                started = time.perf_counter()
+                import mss  # noqa: F401
+                startup_profile.record("import", "mss", started)
+            except ImportError:
+                pass
+
+    def _run(self):
+        for name in self.STAGES:
+            started = time.perf_counter()
+            try:
+                getattr(self, f"_stage_{name}")()
+            except Exception as e:
+                self.status[name] = "FAILED"
+                print(f">>> [ERROR] Startup stage '{name}' failed: {e}")
+                self.stage_failed.emit(name, str(e))
+                continue
+            startup_profile.record("stage", name, started)
+            ms = (time.perf_counter() - started) * 1000
+            self.status[name] = "READY"
+            diag("boot.stage_ready", level=DIAG_INFO, stage=name, ms=round(ms, 1))
+            self.stage_ready.emit(name, ms)
+        self.finished.emit()
 
 # ==============================================================================
 # AI BACKEND LOGIC
@@ -217,11 +1791,12 @@ class AIAnimationWidget(QWidget):
 class AI_Core(QObject):
     """
     Handles all backend operations. Inherits from QObject to emit signals
-    for thread-safe communication with the GUI.
+    for thread-safe communication with the GUI (or, headless, with plain
+    callbacks via ada_events).
     """
     text_received = Signal(str)
     end_of_turn = Signal()
-    frame_received = Signal(QImage)
+    frame_received = Signal(object)  # QImage preview, sized by set_preview_size
     search_results_received = Signal(list)
     file_list_received = Signal(str, list)
     video_mode_changed = Signal(str)
@@ -229,11 +1804,27 @@ class AI_Core(QObject):
     speaking_stopped = Signal()
     mic_state_changed = Signal(bool)
 
-    def __init__(self, video_mode=DEFAULT_MODE):
+    def __init__(self, video_mode=DEFAULT_MODE, *, loop=None, audio_source=None, audio_sink=None,
+                 calendar=None, tts_pool=None, tool_pool=None, tool_threads=None, phrase_cache=None, client=None,
+                 disabled_tools=()):
+        """Optional collaborators are injected by ada_server.py, which runs many cores on one loop,
+        and by ada_replay.py.
+
+        audio_source/audio_sink replace the local mic and speaker (same interface
+        as CaptureEngine/PlaybackEngine); calendar, tts_pool, tool_pool and
+        phrase_cache are shared between sessions and are not closed by this
+        core (one PhraseCache per cache directory keeps its size accounting
+        right); tool_threads caps this core's blocking tool calls in a shared
+        tool_pool; client stands in
+        for the genai.Client (only `client.aio.live.connect` is used);
+        disabled_tools names function tools that are neither declared to
+        Gemini nor registered.
+        """
         super().__init__()
         self.video_mode = video_mode
         self.is_running = True
-        self.client = genai.Client(api_key=GEMINI_API_KEY)
+        self._released = False
+        self.client = client if client is not None else genai.Client(api_key=GEMINI_API_KEY)
 
         create_folder = {
             "name": "create_folder",
@@ -448,14 +2039,15 @@ class AI_Core(QObject):
             }
         }
 
-        tools = [{'google_search': {}}, {"function_declarations": [
+        self.disabled_tools = frozenset(disabled_tools)
+        tools = [{'google_search': {}}, {"function_declarations": [fd for fd in (
             create_folder, create_file, edit_file, list_files, read_file,
             open_application, open_website,
             mcp_google_calendar_find_events, mcp_google_calendar_create_event,
             mcp_google_calendar_quick_add_event, mcp_google_calendar_delete_event,
             mcp_google_calendar_list_calendars,
             time_current_time, time_relative_time
-        ]}]
+        ) if fd["name"] not in self.disabled_tools]}]
         
         self.config = {
             "response_modalities": ["TEXT"],
@@ -492,15 +2084,30 @@ class AI_Core(QObject):
             "max_output_tokens": MAX_OUTPUT_TOKENS
         }
         self.session = None
-        self.audio_stream = None
-        self.out_queue_gemini = asyncio.Queue(maxsize=20)
+        self._session_ready = asyncio.Event()
+        self._run_task = None
+        self._resume_handle = None
+        self._pending_tool_responses = None  # sent to a session that dropped; replayed on resume
+        self.session_stats = {"connects": 0, "resumed": 0, "reconnects": 0, "errors": 0, "last_error": None}
+        self.mic = audio_source if audio_source is not None else CaptureEngine()
+        self.uplink = UplinkScheduler()
+        self.tracer = TurnTracer(keep_events=bool(TRACE_FILE))
         self.response_queue_tts = asyncio.Queue()
         self.audio_in_queue_player = asyncio.Queue()
         self.text_input_queue = asyncio.Queue()
         self.latest_frame = None
+        self.latest_frame_format = "BGR"  # channel order of latest_frame: BGR (camera), RGB/BGRA (screen)
+        # Preview frames: rendered at the GUI's video size, one in flight at a time
+        self.preview_size = (640, 360)
+        self.preview_renderer = PreviewRenderer()
+        self.preview_enabled = True
+        self._preview_consumed = threading.Event()
+        self._preview_consumed.set()
+        self._preview_emitted_at = 0.0
         self.tasks = []
-        self.loop = asyncio.new_event_loop()
+        self.loop = loop if loop is not None else asyncio.new_event_loop()
         self.is_speaking = False
+        self.speaking = threading.Event()  # True while TTS is playing (audio feedback prevention)
         self.mic_enabled = True
         # Time/Calendar helpers
         try:
@@ -508,6 +2115,44 @@ class AI_Core(QObject):
         except Exception:
             self.local_tz = None
         self.pending_calendar_event = None  # {'calendar_id','summary','start_iso','end_iso'}
+        self._owns_calendar = calendar is None
+        self.calendar = calendar if calendar is not None else CalendarClient(MCP_CAL_BASE_URL)
+        self.tool_executor = ToolExecutor(executor=tool_pool, max_threads=tool_threads)
+        self.vad_gate = VadGate()
+        self.barge_in = BargeInDetector() if BARGE_IN else None
+        self.echo_ref = EchoReference()
+        self.player = audio_sink if audio_sink is not None else PlaybackEngine()
+        self.player.on_output = self.echo_ref.note if self.barge_in is not None else None
+        self.player.on_start = lambda: self.tracer.mark("first_speaker_write")
+        self._tts_turn_task = None
+        self._tts_items_owed = 0  # response_queue_tts items taken by the TTS path but not yet task_done()
+        self._tts_record = None
+        self._drop_tts_text = False  # set after a barge-in until the interrupted model turn ends
+        self._model_turn_active = False
+        self._owns_tts_pool = tts_pool is None
+        self.tts_pool = tts_pool if tts_pool is not None else make_tts_pool()
+        self.phrase_cache = phrase_cache if phrase_cache is not None else PhraseCache()
+        self._register_tools(self.tool_executor)
+
+    def _register_tools(self, ex):
+        """Maps each declared function tool to its handler for the ToolExecutor."""
+        ex.register("create_folder", lambda a: self._create_folder(folder_path=a.get("folder_path")), blocking=True, resource="fs", writes=True)
+        ex.register("create_file", lambda a: self._create_file(file_path=a.get("file_path"), content=a.get("content")), blocking=True, resource="fs", writes=True)
+        ex.register("edit_file", lambda a: self._edit_file(file_path=a.get("file_path"), content=a.get("content")), blocking=True, resource="fs", writes=True)
+        ex.register("list_files", lambda a: self._list_files(directory_path=a.get("directory_path")), blocking=True, resource="fs")
+        ex.register("read_file", lambda a: self._read_file(file_path=a.get("file_path")), blocking=True, resource="fs")
+        ex.register("open_application", lambda a: self._open_application(application_name=a.get("application_name")), blocking=True, timeout=5)
+        ex.register("open_website", lambda a: self._open_website(url=a.get("url")), blocking=True, timeout=5)
+        ex.register("mcp_google_calendar_find_events", lambda a: self._mcp_google_calendar_find_events(calendar_id=a.get("calendar_id", "primary"), query=a.get("query", ""), time_min=a.get("time_min", ""), time_max=a.get("time_max", ""), max_results=a.get("max_results", 10)), resource="calendar")
+        ex.register("mcp_google_calendar_create_event", lambda a: self._mcp_google_calendar_create_event(calendar_id=a.get("calendar_id", "primary"), summary=a.get("summary", ""), start_time=a.get("start_time", ""), end_time=a.get("end_time", ""), description=a.get("description", ""), location=a.get("location", ""), attendees=a.get("attendees", "")), resource="calendar", writes=True)
+        ex.register("mcp_google_calendar_quick_add_event", lambda a: self._mcp_google_calendar_quick_add_event(calendar_id=a.get("calendar_id", "primary"), text=a.get("text", ""), confirm=a.get("confirm", None)), resource="calendar", writes=True)
+        ex.register("mcp_google_calendar_delete_event", lambda a: self._mcp_google_calendar_delete_event(calendar_id=a.get("calendar_id", "primary"), event_id=a.get("event_id", "")), resource="calendar", writes=True)
+        ex.register("mcp_google_calendar_list_calendars", lambda a: self._mcp_google_calendar_list_calendars(), resource="calendar")
+        # Time tools (may call an external Time MCP over blocking HTTP)
+        ex.register("time_current_time", lambda a: self._time_current_time(zone=a.get("zone", "")), blocking=True)
+        ex.register("time_relative_time", lambda a: self._time_relative_time(text=a.get("text", ""), base_time_iso=a.get("base_time_iso", ""), base_zone=a.get("base_zone", ""), default_duration_min=int(a.get("default_duration_min", DEFAULT_EVENT_DURATION_MIN) or DEFAULT_EVENT_DURATION_MIN)), blocking=True)
+        for name in self.disabled_tools:
+            ex.tools.pop(name, None)
         
 
     def _create_folder(self, folder_path):
@@ -591,29 +2236,11 @@ class AI_Core(QObject):
 
     # removed unused: _iso_today_bounds_local
 
-    def _mcp_calendar_request(self, method, endpoint, params=None, json_body=None, timeout=8):
+    async def _mcp_calendar_request(self, method, endpoint, params=None, json_body=None, timeout=None):
         """Internal helper to call the local MCP Calendar HTTP server.
         Returns a standardized dict with status, data/message, and code.
         """
-        base = MCP_CAL_BASE_URL.rstrip('/')
-        url = f"{base}/{endpoint.lstrip('/')}"
-        try:
-            resp = requests.request(method.upper(), url, params=params, json=json_body, timeout=timeout)
-            ct = resp.headers.get('content-type', '')
-            # Try to parse JSON; otherwise keep text
-            try:
-                payload = resp.json() if 'application/json' in ct or resp.text.strip().startswith(('{','[')) else {"raw": resp.text}
-            except Exception:
-                payload = {"raw": resp.text}
-            if 200 <= resp.status_code < 300:
-                return {"status": "success", "code": resp.status_code, "data": payload}
-            return {"status": "error", "code": resp.status_code, "message": payload if isinstance(payload, str) else payload}
-        except requests.exceptions.ConnectionError as e:
-            return {"status": "error", "code": 0, "message": f"Cannot reach MCP Calendar server at {MCP_CAL_BASE_URL}: {e}"}
-        except requests.exceptions.Timeout:
-            return {"status": "error", "code": 0, "message": "MCP Calendar request timed out"}
-        except Exception as e:
-            return {"status": "error", "code": 0, "message": f"Unexpected MCP Calendar error: {e}"}
+        return await self.calendar.request(method, endpoint, params=params, json_body=json_body, timeout=timeout)
 
     # --- Time MCP local/HTTP bridge helpers ---
     def _tzinfo_from_zone(self, zone: str):
@@ -765,7 +2392,7 @@ class AI_Core(QObject):
 
     # Removed extra time helpers to keep it simple
 
-    def _mcp_google_calendar_find_events(self, calendar_id="primary", query="", time_min="", time_max="", max_results=10):
+    async def _mcp_google_calendar_find_events(self, calendar_id="primary", query="", time_min="", time_max="", max_results=10):
         params = {}
         if query: params["q"] = query
         # Always avoid very old results: default to now if no bounds provided
@@ -781,9 +2408,9 @@ class AI_Core(QObject):
         params.setdefault("order_by", "startTime")
         # GET /calendars/{calendar_id}/events
         endpoint = f"/calendars/{calendar_id or 'primary'}/events"
-        return self._mcp_calendar_request("GET", endpoint, params=params)
+        return await self._mcp_calendar_request("GET", endpoint, params=params)
 
-    def _mcp_google_calendar_create_event(self, calendar_id="primary", summary="", start_time="", end_time="", description="", location="", attendees=""):
+    async def _mcp_google_calendar_create_event(self, calendar_id="primary", summary="", start_time="", end_time="", description="", location="", attendees=""):
         # Convert attendees CSV to list of emails
         attendees_list = [a.strip() for a in attendees.split(',')] if isinstance(attendees, str) and attendees.strip() else None
         # EventCreateRequest expects 'start' and 'end' objects
@@ -796,15 +2423,15 @@ class AI_Core(QObject):
         if location: body["location"] = location
         if attendees_list is not None: body["attendees"] = attendees_list
         endpoint = f"/calendars/{calendar_id or 'primary'}/events"
-        return self._mcp_calendar_request("POST", endpoint, json_body=body)
+        return await self._mcp_calendar_request("POST", endpoint, json_body=body)
 
-    def _mcp_google_calendar_quick_add_event(self, calendar_id="primary", text="", confirm=None):
+    async def _mcp_google_calendar_quick_add_event(self, calendar_id="primary", text="", confirm=None):
         # If model attempts to confirm via tool parameter
         try:
             if isinstance(confirm, bool):
                 if confirm and self.pending_calendar_event:
                     ev = self.pending_calendar_event; self.pending_calendar_event = None
-                    return self._mcp_google_calendar_create_event(calendar_id=ev.get("calendar_id", calendar_id or 'primary'), summary=ev.get("summary", text or "(No title)"), start_time=ev.get("start_iso", ""), end_time=ev.get("end_iso", ""))
+                    return await self._mcp_google_calendar_create_event(calendar_id=ev.get("calendar_id", calendar_id or 'primary'), summary=ev.get("summary", text or "(No title)"), start_time=ev.get("start_iso", ""), end_time=ev.get("end_iso", ""))
                 if confirm and not self.pending_calendar_event:
                     return {"status": "error", "message": "No pending event to confirm."}
                 if (confirm is False) and self.pending_calendar_event:
@@ -813,7 +2440,9 @@ class AI_Core(QObject):
         except Exception:
             pass
         # Normalize natural language first
-        parsed = self._time_relative_time(text=text or "", base_zone=str(self.local_tz or ""), default_duration_min=DEFAULT_EVENT_DURATION_MIN)
+        # Off the loop: with MCP_TIME_BASE_URL set this is a blocking HTTP call
+        parsed = await asyncio.to_thread(self._time_relative_time, text=text or "", base_zone=str(self.local_tz or ""),
+                                         default_duration_min=DEFAULT_EVENT_DURATION_MIN)
         if parsed.get("status") == "success":
             data = parsed.get("data", {})
             start_iso = data.get("start_iso"); end_iso = data.get("end_iso")
@@ -827,31 +2456,26 @@ class AI_Core(QObject):
                             self.pending_calendar_event.get("end_iso") == end_iso)
                     if not same:
                         preview = f"Scheduling preview: {text or '(no title)'} @ {start_iso} → {end_iso}. Confirm? (yes/no)"
-                        try: self.loop.call_soon_threadsafe(lambda: None)
-                        except Exception: pass
-                        try:
-                            asyncio.run_coroutine_threadsafe(self._emit_assistant_text(preview), self.loop)
-                        except Exception:
-                            pass
+                        await self._emit_assistant_text(preview)
                         self.pending_calendar_event = {"calendar_id": calendar_id or 'primary', "summary": text or "(No title)", "start_iso": start_iso, "end_iso": end_iso}
                     return {"status": "success", "message": "Preview displayed. Awaiting user confirmation."}
                 # Direct create
-                return self._mcp_google_calendar_create_event(calendar_id=calendar_id, summary=text or "(No title)", start_time=start_iso, end_time=end_iso)
+                return await self._mcp_google_calendar_create_event(calendar_id=calendar_id, summary=text or "(No title)", start_time=start_iso, end_time=end_iso)
         # Fallback to QuickAdd if parsing failed
         body = {"text": text or ""}
         endpoint = f"/calendars/{calendar_id or 'primary'}/events/quickAdd"
-        return self._mcp_calendar_request("POST", endpoint, json_body=body)
+        return await self._mcp_calendar_request("POST", endpoint, json_body=body)
 
-    def _mcp_google_calendar_delete_event(self, calendar_id="primary", event_id=""):
+    async def _mcp_google_calendar_delete_event(self, calendar_id="primary", event_id=""):
         if not event_id:
             return {"status": "error", "message": "Missing event_id"}
         # DELETE /calendars/{calendar_id}/events/{event_id}
         endpoint = f"/calendars/{calendar_id or 'primary'}/events/{event_id}"
-        return self._mcp_calendar_request("DELETE", endpoint)
+        return await self._mcp_calendar_request("DELETE", endpoint)
 
-    def _mcp_google_calendar_list_calendars(self):
+    async def _mcp_google_calendar_list_calendars(self):
         # GET /calendars on the MCP calendar HTTP server
-        res = self._mcp_calendar_request("GET", "/calendars")
+        res = await self._mcp_calendar_request("GET", "/calendars")
         return res
 
     @Slot(str)
@@ -864,12 +2488,43 @@ class AI_Core(QObject):
                 self.latest_frame = None
             self.video_mode_changed.emit(mode)
 
+    def set_preview_size(self, width, height):
+        """Called by the GUI with the video area size in device pixels."""
+        self.preview_size = (max(1, int(width)), max(1, int(height)))
+
+    def set_preview_enabled(self, enabled):
+        """GUI hidden/minimized: keep capturing for Gemini but stop rendering previews."""
+        self.preview_enabled = bool(enabled)
+
+    def ack_frame(self):
+        """Called by the GUI once it has taken the last emitted preview frame."""
+        self.preview_renderer.release()
+        self._preview_consumed.set()
+
+    def _preview_ready(self):
+        if not self.preview_enabled:
+            return False
+        if self._preview_consumed.is_set():
+            return True
+        # Re-arm if the GUI never acknowledged (e.g. a dropped signal during shutdown)
+        return (time.time() - self._preview_emitted_at) > 1.0
+
+    def _emit_preview(self, qt_image):
+        self._preview_consumed.clear()
+        self._preview_emitted_at = time.time()
+        self.frame_received.emit(qt_image)
+
     async def stream_video_to_gui(self):
         video_capture = None
+        screen = None
         while self.is_running:
             frame = None
+            fmt = "BGR"
+            t_start = time.perf_counter()
             try:
                 if self.video_mode == "camera":
+                    if screen is not None:
+                        screen.close(); screen = None
                     if video_capture is None: video_capture = await asyncio.to_thread(cv2.VideoCapture, 0)
                     if video_capture.isOpened():
                         ret, frame = await asyncio.to_thread(video_capture.read)
@@ -880,157 +2535,205 @@ class AI_Core(QObject):
                     if video_capture is not None:
                         await asyncio.to_thread(video_capture.release)
                         video_capture = None
-                    screenshot = await asyncio.to_thread(ImageGrab.grab)
-                    frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                    if screen is None: screen = make_screen_capture()
+                    # Native channel order is kept; conversion happens after downscaling (preview) or in the encoder (Gemini)
+                    frame, fmt = await screen.grab(), screen.fmt
                 else:
                     if video_capture is not None:
                         await asyncio.to_thread(video_capture.release)
                         video_capture = None
+                    if screen is not None:
+                        screen.close(); screen = None
                     await asyncio.sleep(0.1)
                     continue
                 if frame is not None:
-                    self.latest_frame = frame
-                    h, w, ch = frame.shape
-                    bytes_per_line = ch * w
-                    qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
-                    self.frame_received.emit(qt_image.copy())
-                else: self.frame_received.emit(QImage())
-                await asyncio.sleep(0.033)
+                    self.latest_frame, self.latest_frame_format = frame, fmt
+                    if self._preview_ready():
+                        tw, th = self.preview_size
+                        qt_image = await asyncio.to_thread(self.preview_renderer.render, frame, fmt, tw, th)
+                        self._emit_preview(qt_image)
+                elif self._preview_ready(): self._emit_preview(self.preview_renderer.blank())
+                # Pace to the frame target rather than sleeping a fixed amount after the work
+                await asyncio.sleep(max(0.0, VIDEO_FRAME_INTERVAL - (time.perf_counter() - t_start)))
             except Exception as e:
                 print(f">>> [ERROR] Video streaming error: {e}")
                 if video_capture is not None:
                     await asyncio.to_thread(video_capture.release)
                     video_capture = None
+                if screen is not None:
+                    screen.close(); screen = None
                 await asyncio.sleep(1)
         if video_capture is not None: await asyncio.to_thread(video_capture.release)
+        if screen is not None: screen.close()
+
+    def _encode_frame(self, frame, fmt="BGR"):
+        """Captured frame -> Gemini realtime image payload (JPEG, max 1024 px)."""
+        if fmt == "RGB":
+            frame_rgb = frame
+        else:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB if fmt == "BGRA" else cv2.COLOR_BGR2RGB)
+        pil_img = PIL.Image.fromarray(frame_rgb)
+        pil_img.thumbnail([1024, 1024])
+        image_io = io.BytesIO()
+        pil_img.save(image_io, format="jpeg")
+        return {"mime_type": "image/jpeg", "data": base64.b64encode(image_io.getvalue()).decode()}
 
     async def send_frames_to_gemini(self):
+        detector = FrameChangeDetector()
+        last_checked = None
         while self.is_running:
-            await asyncio.sleep(1.0)
-            if self.video_mode != "none" and self.latest_frame is not None:
-                frame_rgb = cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
-                pil_img = PIL.Image.fromarray(frame_rgb)
-                pil_img.thumbnail([1024, 1024])
-                image_io = io.BytesIO()
-                pil_img.save(image_io, format="jpeg")
-                gemini_data = {"mime_type": "image/jpeg", "data": base64.b64encode(image_io.getvalue()).decode()}
-                try:
-                    oqs = self.out_queue_gemini.qsize()
-                except Exception:
-                    oqs = "?"
-                await self.out_queue_gemini.put(gemini_data)
-                diag("frames.enqueue_image", out_q=oqs+1 if isinstance(oqs, int) else oqs)
+            await asyncio.sleep(FRAME_CHECK_INTERVAL)
+            frame, fmt = self.latest_frame, self.latest_frame_format
+            if self.video_mode == "none" or frame is None:
+                if last_checked is not None:
+                    detector.reset(); last_checked = None
+                continue
+            # Same array object: no new capture since the last check
+            if frame is last_checked:
+                continue
+            last_checked = frame
+            if not detector.should_send(frame):
+                continue
+            gemini_data = await asyncio.to_thread(self._encode_frame, frame, fmt)
+            self.uplink.put_image(gemini_data)
+            if diag_enabled(DIAG_DEBUG):
+                diag("frames.enqueue_image", diff=f"{detector.last_diff:.2f}", sent=detector.stats["sent"], skipped=detector.stats["skipped"], audio_q=self.uplink.depth("audio"), image_replaced=self.uplink.stats["image"]["dropped"])
 
     async def receive_text(self):
         while self.is_running:
             try:
                 turn_urls, file_list_data = set(), None
+                first_token = True
                 turn = self.session.receive()
                 async for chunk in turn:
+                    update = getattr(chunk, "session_resumption_update", None)
+                    if update:
+                        if update.resumable and update.new_handle:
+                            self._resume_handle = update.new_handle
+                        continue
+                    if getattr(chunk, "go_away", None):
+                        # Server is about to close this connection; reconnect now with the latest handle
+                        diag("live.go_away", DIAG_INFO, time_left=chunk.go_away.time_left)
+                        return
+                    self._model_turn_active = True
+                    # Make sure a TTS socket is warm while the model is still producing text
+                    self.tts_pool.prewarm()
                     if chunk.tool_call and chunk.tool_call.function_calls:
-                        function_responses = []
-                        for fc in chunk.tool_call.function_calls:
-                            args, result = fc.args, {}
-                            if fc.name == "create_folder": result = self._create_folder(folder_path=args.get("folder_path"))
-                            elif fc.name == "create_file": result = self._create_file(file_path=args.get("file_path"), content=args.get("content"))
-                            elif fc.name == "edit_file": result = self._edit_file(file_path=args.get("file_path"), content=args.get("content"))
-                            elif fc.name == "list_files":
-                                result = self._list_files(directory_path=args.get("directory_path"))
-                                if result.get("status") == "success": file_list_data = (result.get("directory_path"), result.get("files"))
-                            elif fc.name == "read_file": result = self._read_file(file_path=args.get("file_path"))
-                            elif fc.name == "open_application": result = self._open_application(application_name=args.get("application_name"))
-                            elif fc.name == "open_website": result = self._open_website(url=args.get("url"))
-                            elif fc.name == "mcp_google_calendar_find_events": result = self._mcp_google_calendar_find_events(calendar_id=args.get("calendar_id", "primary"), query=args.get("query", ""), time_min=args.get("time_min", ""), time_max=args.get("time_max", ""), max_results=args.get("max_results", 10))
-                            elif fc.name == "mcp_google_calendar_create_event": result = self._mcp_google_calendar_create_event(calendar_id=args.get("calendar_id", "primary"), summary=args.get("summary", ""), start_time=args.get("start_time", ""), end_time=args.get("end_time", ""), description=args.get("description", ""), location=args.get("location", ""), attendees=args.get("attendees", ""))
-                            elif fc.name == "mcp_google_calendar_quick_add_event": result = self._mcp_google_calendar_quick_add_event(calendar_id=args.get("calendar_id", "primary"), text=args.get("text", ""), confirm=args.get("confirm", None))
-                            elif fc.name == "mcp_google_calendar_delete_event": result = self._mcp_google_calendar_delete_event(calendar_id=args.get("calendar_id", "primary"), event_id=args.get("event_id", ""))
-                            elif fc.name == "mcp_google_calendar_list_calendars": result = self._mcp_google_calendar_list_calendars()
-                            # Time tools
-                            elif fc.name == "time_current_time": result = self._time_current_time(zone=args.get("zone", ""))
-                            # (trimmed) keep only current_time and relative_time
-                            elif fc.name == "time_relative_time": result = self._time_relative_time(text=args.get("text", ""), base_time_iso=args.get("base_time_iso", ""), base_zone=args.get("base_zone", ""), default_duration_min=int(args.get("default_duration_min", DEFAULT_EVENT_DURATION_MIN) or DEFAULT_EVENT_DURATION_MIN))
-                            function_responses.append({"id": fc.id, "name": fc.name, "response": result})
+                        function_responses = await self.tool_executor.run_batch(chunk.tool_call.function_calls)
+                        for fr in function_responses:
+                            result = fr["response"]
+                            if fr["name"] == "list_files" and result.get("status") == "success":
+                                file_list_data = (result.get("directory_path"), result.get("files"))
+                        self._pending_tool_responses = function_responses
                         await self.session.send_tool_response(function_responses=function_responses)
+                        self._pending_tool_responses = None
                         continue
                     if chunk.server_content:
+                        if getattr(chunk.server_content, "interrupted", False) and self.barge_in is not None:
+                            # Gemini's own VAD heard the user over the reply
+                            await self.interrupt_playback("server")
                         if hasattr(chunk.server_content, 'grounding_metadata') and chunk.server_content.grounding_metadata:
                             for g_chunk in chunk.server_content.grounding_metadata.grounding_chunks:
                                 if g_chunk.web and g_chunk.web.uri: turn_urls.add(g_chunk.web.uri)
                         if chunk.server_content.model_turn:
                             pass  # code execution support removed
                     if chunk.text:
+                        if first_token:
+                            first_token = False
+                            # Gemini may answer inside the VAD hangover, before the gate has closed
+                            if self.vad_gate.active and self.vad_gate.last_voiced_at is not None:
+                                self.tracer.note_input("voice", self.vad_gate.last_voiced_at)
+                            self.tracer.start_turn()
+                            self.tracer.mark("first_token")
                         self.text_received.emit(chunk.text)
-                        try:
-                            rqs = self.response_queue_tts.qsize()
-                        except Exception:
-                            rqs = "?"
+                        if self._drop_tts_text:
+                            continue
                         await self.response_queue_tts.put(chunk.text)
-                        diag("receive_text.enqueue_tts", chars=len(chunk.text), tts_q=rqs+1 if isinstance(rqs, int) else rqs)
+                        if diag_enabled(DIAG_TRACE):
+                            diag("receive_text.enqueue_tts", DIAG_TRACE, chars=len(chunk.text), tts_q=self.response_queue_tts.qsize())
                 if file_list_data: self.file_list_received.emit(file_list_data[0], file_list_data[1])
                 elif turn_urls: self.search_results_received.emit(list(turn_urls))
                 else:
                     self.search_results_received.emit([]); self.file_list_received.emit("",[])
+                self._model_turn_active = False
+                self._drop_tts_text = False
                 self.end_of_turn.emit()
                 await self.response_queue_tts.put(None)
                 diag("receive_text.end_of_turn_enqueue_none")
+            except (websockets.exceptions.ConnectionClosed, genai_errors.APIError):
+                # Session is gone; the supervisor in run() reconnects (main_task_runner ends the open turn)
+                raise
             except Exception:
                 if not self.is_running: break
                 traceback.print_exc()
 
     async def listen_audio(self):
-        mic_info = pya.get_default_input_device_info()
-        self.audio_stream = pya.open(format=FORMAT, channels=CHANNELS, rate=SEND_SAMPLE_RATE, input=True, input_device_index=mic_info["index"], frames_per_buffer=CHUNK_SIZE)
+        await asyncio.to_thread(self.mic.start, asyncio.get_running_loop())
+        gate = self.vad_gate if MIC_VAD_GATE else None
 
         while self.is_running:
-            data = await asyncio.to_thread(self.audio_stream.read, CHUNK_SIZE, exception_on_overflow=False)
+            data = await self.mic.read()
             if not self.is_running: break
 
             # Only send audio to Gemini when AI is NOT speaking
-            if not self.is_speaking and not speaking.is_set() and self.mic_enabled:
-                try:
-                    oqs = self.out_queue_gemini.qsize()
-                except Exception:
-                    oqs = "?"
-                await self.out_queue_gemini.put({"data": data, "mime_type": "audio/pcm"})
-                if AUDIO_CHUNK_DIAG:
-                    diag("listen_audio.enqueue_mic", bytes=len(data), out_q=oqs+1 if isinstance(oqs, int) else oqs, is_speaking=self.is_speaking)
+            if not self.is_speaking and not self.speaking.is_set() and self.mic_enabled:
+                if gate is not None:
+                    was_active = gate.active
+                    data = gate.process(data)
+                    if gate.active != was_active:
+                        if not gate.active and gate.last_voiced_at is not None:
+                            self.tracer.note_input("voice", gate.last_voiced_at)
+                        diag("listen_audio.vad_state", active=gate.active, frames_in=gate.frames_in, frames_sent=gate.frames_sent)
+                    if not data:
+                        continue
+                self.uplink.put_audio({"data": data, "mime_type": "audio/pcm"})
+                if diag_enabled(DIAG_TRACE):
+                    diag("listen_audio.enqueue_mic", DIAG_TRACE, bytes=len(data), audio_q=self.uplink.depth("audio"), is_speaking=self.is_speaking)
+            # Barge-in: listen over the reply and hand the turn back to the user once they are speaking
+            elif self.barge_in is not None and self.mic_enabled:
+                if gate is not None:
+                    gate.reset()
+                if self.barge_in.process(data, self.echo_ref.level()) and await self.interrupt_playback("barge_in"):
+                    if gate is not None:
+                        gate.open()
+                    self.uplink.put_audio({"data": self.barge_in.take_preroll(), "mime_type": "audio/pcm"})
             # If AI is speaking, we still read the buffer to prevent overflow but don't send to API
             else:
-                diag("listen_audio.drop_chunk", bytes=len(data), is_speaking=self.is_speaking, mic_enabled=self.mic_enabled)
+                if gate is not None:
+                    gate.reset()
+                if diag_enabled(DIAG_TRACE):
+                    diag("listen_audio.drop_chunk", DIAG_TRACE, bytes=len(data), is_speaking=self.is_speaking, mic_enabled=self.mic_enabled)
 
     async def send_realtime(self):
+        last_stats = time.time()
         while self.is_running:
-            msg = await self.out_queue_gemini.get()
+            lane, msg = await self.uplink.get()
             if not self.is_running: break
 
             try:
-                # Revert to original working method - just accept the deprecation warning
-                mime = None
-                try:
-                    mime = msg.get("mime_type") if isinstance(msg, dict) else None
-                except Exception:
-                    mime = None
-                try:
-                    oqs = self.out_queue_gemini.qsize()
-                except Exception:
-                    oqs = "?"
-                if AUDIO_CHUNK_DIAG:
-                    diag("send_realtime.deq", mime=mime, out_q=oqs, is_speaking=self.is_speaking)
+                if diag_enabled(DIAG_TRACE):
+                    diag("send_realtime.deq", DIAG_TRACE, lane=lane, audio_q=self.uplink.depth("audio"), is_speaking=self.is_speaking)
 
                 # Drop any mic audio while speaking to prevent feedback (clears pre-queued frames)
-                if mime == "audio/pcm" and (self.is_speaking or speaking.is_set() or (not self.mic_enabled)):
-                    diag("send_realtime.drop_mic_audio_while_speaking")
-                    self.out_queue_gemini.task_done()
+                if lane == "audio" and (self.is_speaking or self.speaking.is_set() or (not self.mic_enabled)):
+                    dropped = self.uplink.clear_audio()
+                    diag("send_realtime.drop_mic_audio_while_speaking", dropped=dropped + 1)
                     continue
 
+                # Revert to original working method - just accept the deprecation warning
                 await self.session.send(input=msg)
-                if AUDIO_CHUNK_DIAG:
-                    diag("send_realtime.sent", mime=mime)
+                if diag_enabled(DIAG_TRACE):
+                    diag("send_realtime.sent", DIAG_TRACE, lane=lane)
 
+            except websockets.exceptions.ConnectionClosed:
+                raise
             except Exception as e:
-                print(f">>> [ERROR] Failed to send audio: {e}")
+                print(f">>> [ERROR] Failed to send {lane}: {e}")
 
-            self.out_queue_gemini.task_done()
+            if time.time() - last_stats >= 10:
+                last_stats = time.time()
+                snap = self.uplink.snapshot()
+                diag("uplink.stats", DIAG_INFO, **{f"{lane}_{k}": (f"{v:.1f}" if isinstance(v, float) else v) for lane, st in snap.items() for k, v in st.items()})
 
     async def process_text_input_queue(self):
         while self.is_running:
@@ -1043,18 +2746,23 @@ class AI_Core(QObject):
                 if self.pending_calendar_event:
                     if stext in ("y", "yes", "proceed", "confirm", "ok"):
                         ev = self.pending_calendar_event; self.pending_calendar_event = None
-                        res = self._mcp_google_calendar_create_event(calendar_id=ev.get("calendar_id", "primary"), summary=ev.get("summary", "(No title)"), start_time=ev.get("start_iso", ""), end_time=ev.get("end_iso", ""))
-                        msg = "Scheduled." if res.get("status") == "success" else f"Failed to schedule: {res.get('message')}"
-                        await self._emit_assistant_text(msg)
+                        res = await self._mcp_google_calendar_create_event(calendar_id=ev.get("calendar_id", "primary"), summary=ev.get("summary", "(No title)"), start_time=ev.get("start_iso", ""), end_time=ev.get("end_iso", ""))
+                        if res.get("status") == "success":
+                            await self._emit_assistant_text("Scheduled.", fixed=True)
+                        else:
+                            await self._emit_assistant_text(f"Failed to schedule: {res.get('message')}")
                         self.text_input_queue.task_done()
                         continue
                     if stext in ("n", "no", "cancel", "stop"):
                         self.pending_calendar_event = None
-                        await self._emit_assistant_text("Canceled.")
+                        await self._emit_assistant_text("Canceled.", fixed=True)
                         self.text_input_queue.task_done()
                         continue
             except Exception:
                 pass
+            if self.session is None and self.is_running:
+                # Between sessions: hold typed input until the supervisor has reconnected
+                await self._session_ready.wait()
             if self.session:
                 # Minimal calendar shortcut: handle common list queries locally to avoid model meta-chatter
                 handled = await self._maybe_handle_calendar_query(text)
@@ -1070,21 +2778,27 @@ class AI_Core(QObject):
                 except Exception:
                     pqs = "?"
                 diag("text_input.enqueue", text_len=len(text))
-                for q in [self.response_queue_tts, self.audio_in_queue_player]:
-                    while not q.empty(): q.get_nowait()
-                diag("text_input.clear_play_tts", tts_q=0 if isinstance(rqs, int) else rqs, play_q=0 if isinstance(pqs, int) else pqs)
+                self.tracer.note_input("text")
+                self.tts_pool.prewarm()
+                # Typing over a reply cuts it short, like a barge-in (queues and the player ring are flushed)
+                interrupted = await self.interrupt_playback("text")
+                diag("text_input.clear_play_tts", tts_q=rqs, play_q=pqs, interrupted=interrupted)
                 await self.session.send_client_content(turns=[{"role": "user", "parts": [{"text": text or "."}]}])
             self.text_input_queue.task_done()
 
 
-    async def _emit_assistant_text(self, text):
-        try:
-            rqs = self.response_queue_tts.qsize()
-        except Exception:
-            rqs = "?"
+    async def _emit_assistant_text(self, text, fixed=False):
+        """Speaks a locally generated reply; fixed=True marks a constant phrase worth caching."""
+        if self.tracer.current is None:
+            self.tracer.start_turn()
+        self.tracer.mark("first_token")
         self.text_received.emit(text)
-        await self.response_queue_tts.put(text)
-        diag("shortcut.enqueue_tts", chars=len(text), tts_q=rqs+1 if isinstance(rqs, int) else rqs)
+        item = text
+        if fixed and self.phrase_cache.cacheable(text):
+            # Fixed phrase: play cached PCM if we have it, otherwise synthesize and keep the audio
+            item = CachedAudio(text, await asyncio.to_thread(self.phrase_cache.get, text))
+        await self.response_queue_tts.put(item)
+        diag("shortcut.enqueue_tts", chars=len(text), cache_hit=isinstance(item, CachedAudio) and item.pcm is not None)
         self.end_of_turn.emit()
         await self.response_queue_tts.put(None)
 
@@ -1093,7 +2807,7 @@ class AI_Core(QObject):
         prev = self.mic_enabled
         self.mic_enabled = bool(enabled)
         if prev != self.mic_enabled:
-            diag("mic.state_changed", enabled=self.mic_enabled)
+            diag("mic.state_changed", DIAG_INFO, enabled=self.mic_enabled)
             self.mic_state_changed.emit(self.mic_enabled)
 
     def _parse_timeframe(self, user_text: str):
@@ -1199,7 +2913,7 @@ class AI_Core(QObject):
         if any(w in s for w in schedule_words) and any(w in s for w in time_words):
             time_min, time_max, label, start_dt = self._parse_timeframe(s)
             q = self._extract_calendar_query(user_text)
-            resp = self._mcp_google_calendar_find_events(calendar_id="primary", query=q, time_min=time_min, time_max=time_max, max_results=50)
+            resp = await self._mcp_google_calendar_find_events(calendar_id="primary", query=q, time_min=time_min, time_max=time_max, max_results=50)
             if resp.get("status") == "success":
                 data = resp.get("data", {})
                 items = data.get("items") or data.get("data", {}).get("items") or []
@@ -1216,162 +2930,422 @@ class AI_Core(QObject):
         return False
 
     async def tts(self):
-        uri = f"wss://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}/stream-input?model_id=eleven_turbo_v2_5&output_format=pcm_24000"
         while self.is_running:
-            text_chunk = await self.response_queue_tts.get()
+            text_chunk = await self._next_tts_item()
             if text_chunk is None or not self.is_running:
-                self.response_queue_tts.task_done(); continue
+                self._tts_item_done(); continue
 
             # Set speaking flag to prevent audio feedback
-            speaking.set()
-            # Immediately set core flag to avoid cross-thread lag
+            self.speaking.set()
+            # The core is the only writer of this flag; a queued GUI slot running
+            # after a barge-in would otherwise undo the interrupt
             self.is_speaking = True
-            try:
-                oqs = self.out_queue_gemini.qsize()
-            except Exception:
-                oqs = "?"
-            try:
-                rqs = self.response_queue_tts.qsize()
-            except Exception:
-                rqs = "?"
-            try:
-                pqs = self.audio_in_queue_player.qsize()
-            except Exception:
-                pqs = "?"
-            diag("tts.speaking_started_emit", out_q=oqs, tts_q=rqs, play_q=pqs)
-            self.speaking_started.emit()
-            try:
-                async with websockets.connect(uri) as websocket:
-                    diag("tts.ws_opened")
-                    await websocket.send(json.dumps({"text": " ", "voice_settings": {"stability": 0.5, "similarity_boost": 0.8}, "xi_api_key": ELEVENLABS_API_KEY,}))
-                    async def listen():
-                        while self.is_running:
-                            try:
-                                message = await websocket.recv()
-                                data = json.loads(message)
-                                if data.get("audio"):
-                                    chunk_bytes = base64.b64decode(data["audio"]) 
-                                    try:
-                                        pqs2 = self.audio_in_queue_player.qsize()
-                                    except Exception:
-                                        pqs2 = "?"
-                                    await self.audio_in_queue_player.put(chunk_bytes)
-                                    diag("tts.rx_audio", bytes=len(chunk_bytes), play_q=pqs2+1 if isinstance(pqs2, int) else pqs2)
-                                elif data.get("isFinal"):
-                                    diag("tts.isFinal")
-                                    break
-                            except websockets.exceptions.ConnectionClosed: break
-                    listen_task = asyncio.create_task(listen())
-                    await websocket.send(json.dumps({"text": text_chunk + " "}))
-                    diag("tts.sent_text", chars=len(text_chunk))
-                    self.response_queue_tts.task_done()
-                    while self.is_running:
-                        text_chunk = await self.response_queue_tts.get()
-                        if text_chunk is None:
-                            await websocket.send(json.dumps({"text": ""}))
-                            self.response_queue_tts.task_done(); break
-                        await websocket.send(json.dumps({"text": text_chunk + " "}))
-                        diag("tts.sent_text", chars=len(text_chunk))
-                        self.response_queue_tts.task_done()
-                    await listen_task
-                    diag("tts.stream_complete")
-            except Exception as e:
-                print(f">>> [ERROR] TTS Error: {e}")
-            finally:
-                # Add drain + tail buffer before re-enabling mic to avoid late reflections
+            if self.barge_in is not None:
+                self.barge_in.reset()
+            if diag_enabled(DIAG_DEBUG):
                 try:
-                    pqs3 = self.audio_in_queue_player.qsize()
+                    oqs = self.uplink.qsize()
                 except Exception:
-                    pqs3 = "?"
+                    oqs = "?"
                 try:
-                    oqs2 = self.out_queue_gemini.qsize()
+                    rqs = self.response_queue_tts.qsize()
                 except Exception:
-                    oqs2 = "?"
-                diag("tts.finalizing_before_tail", play_q=pqs3, out_q=oqs2)
-
-                # Wait for playback queue to drain (bounded)
-                t0 = time.time()
-                while self.is_running:
+                    rqs = "?"
+                try:
+                    pqs = self.audio_in_queue_player.qsize()
+                except Exception:
+                    pqs = "?"
+                diag("tts.speaking_started_emit", out_q=oqs, tts_q=rqs, play_q=pqs)
+            self.speaking_started.emit()
+            # The stream runs as its own task so a barge-in can cancel it mid-turn
+            if isinstance(text_chunk, CachedAudio) and text_chunk.pcm is not None:
+                self._tts_turn_task = asyncio.create_task(self._play_cached(text_chunk))
+            else:
+                self._tts_turn_task = asyncio.create_task(self._tts_stream(text_chunk))
+            try:
+                await asyncio.wait({self._tts_turn_task})
+            finally:
+                # A cancelled stream may have taken items without acknowledging them
+                while self._tts_turn_task.done() and self._tts_items_owed:
+                    self._tts_item_done()
+            interrupted = self._tts_turn_task.cancelled()
+            self._tts_turn_task = None
+            if not interrupted:
+                # Add drain + tail buffer before re-enabling mic to avoid late reflections
+                if diag_enabled(DIAG_DEBUG):
                     try:
-                        remaining = self.audio_in_queue_player.qsize()
+                        pqs3 = self.audio_in_queue_player.qsize()
                     except Exception:
-                        remaining = 0
-                    if remaining == 0 or (time.time() - t0) > 1.0:
-                        break
-                    await asyncio.sleep(0.01)
-                diag("tts.playback_queue_drained")
-
-                # Short tail to account for device output buffer
-                await asyncio.sleep(0.15)
-                diag("tts.tail_done")
-                speaking.clear()
-                # Clear core flag just before emitting stopped
-                self.is_speaking = False
+                        pqs3 = "?"
+                    try:
+                        oqs2 = self.uplink.qsize()
+                    except Exception:
+                        oqs2 = "?"
+                    diag("tts.finalizing_before_tail", play_q=pqs3, out_q=oqs2)
+
+                # Wait until every chunk reached the ring buffer and has been played out,
+                # plus the device's output latency, before the mic is re-enabled
+                try:
+                    await asyncio.wait_for(self.audio_in_queue_player.join(), 2.0)
+                except asyncio.TimeoutError:
+                    pass
+                self.player.mark_end()
+                drained = await self.player.wait_drained(self.player.buffered_seconds() + 1.0)
+                if diag_enabled(DIAG_DEBUG):
+                    diag("tts.playback_drained", drained=drained, interrupted=self._tts_interrupted(), **self.player.stats)
+            self.tracer.end_turn()
+            self.speaking.clear()
+            # Clear core flag just before emitting stopped
+            self.is_speaking = False
+            if diag_enabled(DIAG_DEBUG):
                 try:
                     pqs4 = self.audio_in_queue_player.qsize()
                 except Exception:
                     pqs4 = "?"
-                diag("tts.speaking_stopped_emit", play_q=pqs4)
-                self.speaking_stopped.emit()
+                diag("tts.speaking_stopped_emit", play_q=pqs4, interrupted=interrupted)
+            self.speaking_stopped.emit()
+
+    async def _next_tts_item(self):
+        """response_queue_tts.get() that tracks the item until _tts_item_done()."""
+        item = await self.response_queue_tts.get()
+        self._tts_items_owed += 1
+        return item
+
+    def _tts_item_done(self):
+        self._tts_items_owed -= 1
+        self.response_queue_tts.task_done()
+
+    def _tts_interrupted(self):
+        # interrupt_playback() clears the flags first; tts() only emits the stop
+        return not self.speaking.is_set()
+
+    async def _synthesize(self, text):
+        """Renders one phrase to PCM over a pooled TTS socket without playing it."""
+        chunks = []
+        async with self.tts_pool.connection() as websocket:
+            await websocket.send(json.dumps({"text": text + " ", "try_trigger_generation": True}))
+            await websocket.send(json.dumps({"text": ""}))
+            while True:
+                data = json.loads(await websocket.recv())
+                if data.get("audio"):
+                    chunks.append(base64.b64decode(data["audio"]))
+                elif data.get("isFinal"):
+                    return b"".join(chunks)
+
+    async def prewarm_phrase_cache(self, phrases=TTS_CACHE_WARM_PHRASES):
+        """Synthesizes common confirmations that are not cached yet (runs once at startup)."""
+        if not self.phrase_cache.enabled:
+            return
+        for text in phrases:
+            if not self.is_running:
+                return
+            if await asyncio.to_thread(self.phrase_cache.contains, text):
+                continue
+            try:
+                pcm = await asyncio.wait_for(self._synthesize(text), 15)
+                await asyncio.to_thread(self.phrase_cache.put, text, pcm)
+            except Exception as e:
+                diag("tts_cache.prewarm_failed", DIAG_ERROR, text=text, error=type(e).__name__)
+                return
+        diag("tts_cache.prewarmed", DIAG_INFO, **self.phrase_cache.stats)
+
+    async def _play_cached(self, item):
+        """Plays a phrase-cache hit with no network round trip."""
+        self.tracer.tag("tts_cache", "hit")
+        self.tracer.mark("first_tts_audio")
+        await self.audio_in_queue_player.put(item.pcm)
+        self._tts_item_done()
+        diag("tts.cache_hit", chars=len(item.text), bytes=len(item.pcm))
+        nxt = await self._next_tts_item()
+        if nxt is None:
+            self._tts_item_done()
+        else:
+            await self._tts_stream(nxt)  # more text followed in the same turn
+
+    async def _tts_stream(self, text_chunk):
+        listen_task = None
+        # A fixed phrase that missed the cache: keep its audio so the next time is local
+        self._tts_record = None
+        if isinstance(text_chunk, CachedAudio):
+            self._tts_record, record_text, text_chunk = [], text_chunk.text, text_chunk.text
+            self.tracer.tag("tts_cache", "miss")
+        final = False
+        try:
+            async with self.tts_pool.connection() as websocket:
+                diag("tts.ws_ready", warm_hits=self.tts_pool.stats["warm_hits"], cold_opens=self.tts_pool.stats["cold_opens"])
+                async def listen():
+                    nonlocal final
+                    while self.is_running:
+                        try:
+                            message = await websocket.recv()
+                            data = json.loads(message)
+                            if data.get("audio"):
+                                self.tracer.mark("first_tts_audio")
+                                chunk_bytes = base64.b64decode(data["audio"]) 
+                                if self._tts_record is not None:
+                                    self._tts_record.append(chunk_bytes)
+                                await self.audio_in_queue_player.put(chunk_bytes)
+                                if diag_enabled(DIAG_TRACE):
+                                    diag("tts.rx_audio", DIAG_TRACE, bytes=len(chunk_bytes), play_q=self.audio_in_queue_player.qsize())
+                            elif data.get("isFinal"):
+                                diag("tts.isFinal")
+                                final = True
+                                break
+                        except websockets.exceptions.ConnectionClosed: break
+                listen_task = asyncio.create_task(listen())
+                if TTS_SHAPING:
+                    await self._send_shaped_text(websocket, text_chunk)
+                else:
+                    self.tracer.tag("shaping", "off")
+                    await websocket.send(json.dumps({"text": text_chunk + " "}))
+                    if diag_enabled(DIAG_TRACE):
+                        diag("tts.sent_text", DIAG_TRACE, chars=len(text_chunk))
+                    self._tts_item_done()
+                    while self.is_running:
+                        text_chunk = await self._next_tts_item()
+                        if text_chunk is None:
+                            await websocket.send(json.dumps({"text": ""}))
+                            self._tts_item_done(); break
+                        if isinstance(text_chunk, CachedAudio):
+                            text_chunk = text_chunk.text
+                        self._tts_record = None  # turn is more than the one phrase
+                        await websocket.send(json.dumps({"text": text_chunk + " "}))
+                        if diag_enabled(DIAG_TRACE):
+                            diag("tts.sent_text", DIAG_TRACE, chars=len(text_chunk))
+                        self._tts_item_done()
+                await listen_task
+                diag("tts.stream_complete")
+                if final and self._tts_record:
+                    await asyncio.to_thread(self.phrase_cache.put, record_text, b"".join(self._tts_record))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f">>> [ERROR] TTS Error: {e}")
+        finally:
+            if listen_task is not None and not listen_task.done():
+                listen_task.cancel()
+
+    async def _send_shaped_text(self, websocket, text_chunk):
+        """Feeds the turn's text through a TextShaper and sends whole phrases.
+
+        The first phrase asks ElevenLabs to start generating right away;
+        the next queue item is awaited with the shaper's deadline so a
+        slow model still gets its words spoken.
+        """
+        shaper = TextShaper()
+        self.tracer.tag("shaping", "on")
+        chunks_in = 1
+        getter = None
+
+        async def send(phrase):
+            msg = {"text": phrase}
+            if shaper.phrases == 1:
+                msg["try_trigger_generation"] = True
+            await websocket.send(json.dumps(msg))
+            if diag_enabled(DIAG_TRACE):
+                diag("tts.sent_phrase", DIAG_TRACE, chars=len(phrase), n=shaper.phrases)
+
+        for phrase in shaper.feed(text_chunk, time.perf_counter()):
+            await send(phrase)
+        self._tts_item_done()
+        try:
+            while self.is_running:
+                if getter is None:
+                    getter = asyncio.ensure_future(self._next_tts_item())
+                done, _ = await asyncio.wait({getter}, timeout=shaper.time_left(time.perf_counter()))
+                if not done:
+                    phrase = shaper.force(time.perf_counter())
+                    if phrase:
+                        await send(phrase)
+                    continue
+                text_chunk, getter = getter.result(), None
+                self._tts_item_done()
+                if text_chunk is None:
+                    phrase = shaper.finish()
+                    if phrase:
+                        await send(phrase)
+                    await websocket.send(json.dumps({"text": ""}))
+                    break
+                chunks_in += 1
+                if isinstance(text_chunk, CachedAudio):
+                    text_chunk = text_chunk.text
+                self._tts_record = None  # turn is more than the one phrase
+                for phrase in shaper.feed(text_chunk, time.perf_counter()):
+                    await send(phrase)
+        finally:
+            if getter is not None:
+                getter.cancel()
+        diag("tts.shaped", chunks_in=chunks_in, phrases=shaper.phrases, forced=shaper.forced)
+
+    @staticmethod
+    def _flush_queue(q):
+        dropped = 0
+        while not q.empty():
+            q.get_nowait(); q.task_done()
+            dropped += 1
+        return dropped
+
+    async def interrupt_playback(self, reason):
+        """Cuts the current reply short: cancels the ElevenLabs stream, drops queued
+        text and audio, and reopens the mic. Returns False if nothing was playing."""
+        if not (self.is_speaking or self.speaking.is_set()):
+            return False
+        t0 = time.perf_counter()
+        # Text still streaming in for the interrupted model turn must not restart TTS
+        self._drop_tts_text = self._model_turn_active
+        self.speaking.clear()
+        self.is_speaking = False
+        if self._tts_turn_task is not None and not self._tts_turn_task.done():
+            self._tts_turn_task.cancel()
+        dropped_text = self._flush_queue(self.response_queue_tts)
+        dropped_audio = self._flush_queue(self.audio_in_queue_player)
+        self.player.flush()
+        self.echo_ref.clear()
+        self.tracer.tag("interrupted", reason)
+        diag("barge_in.interrupt", DIAG_INFO, reason=reason, dropped_text=dropped_text, dropped_audio=dropped_audio, ms=f"{(time.perf_counter() - t0) * 1000:.1f}")
+        return True
 
     async def play_audio(self):
-        stream = await asyncio.to_thread(pya.open, format=pyaudio.paInt16, channels=CHANNELS, rate=RECEIVE_SAMPLE_RATE, output=True)
+        await asyncio.to_thread(self.player.start, asyncio.get_running_loop())
         while self.is_running:
             bytestream = await self.audio_in_queue_player.get()
             if bytestream and self.is_running:
-                try:
-                    pqs = self.audio_in_queue_player.qsize()
-                except Exception:
-                    pqs = "?"
-                diag("play_audio.deq", bytes=len(bytestream), play_q=pqs)
-                await asyncio.to_thread(stream.write, bytestream)
+                if diag_enabled(DIAG_TRACE):
+                    diag("play_audio.deq", DIAG_TRACE, bytes=len(bytestream), play_q=self.audio_in_queue_player.qsize(), buffered_ms=f"{self.player.buffered_seconds() * 1000:.0f}")
+                rest = self.player.write(bytestream)
+                # Ring full: TTS is far ahead of the speaker, so wait for room instead of dropping audio
+                while rest and self.is_running and self.speaking.is_set():
+                    await asyncio.sleep(FRAME_MS / 1000)
+                    rest = self.player.write(rest)
             self.audio_in_queue_player.task_done()
 
-    async def main_task_runner(self, session):
-        self.session = session
+    def _start_local_tasks(self):
+        """Tasks that outlive any one Gemini session (capture, video, TTS, playback, text input)."""
+        self.tts_pool.prewarm()
         self.tasks.extend([
             asyncio.create_task(self.stream_video_to_gui()), asyncio.create_task(self.send_frames_to_gemini()),
-            asyncio.create_task(self.listen_audio()), asyncio.create_task(self.send_realtime()),
-            asyncio.create_task(self.receive_text()), asyncio.create_task(self.tts()),
-            asyncio.create_task(self.play_audio()), asyncio.create_task(self.process_text_input_queue())
+            asyncio.create_task(self.listen_audio()), asyncio.create_task(self.tts()),
+            asyncio.create_task(self.play_audio()), asyncio.create_task(self.process_text_input_queue()),
+            asyncio.create_task(self.prewarm_phrase_cache())
         ])
-        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def main_task_runner(self, session):
+        """Runs the session-bound tasks until either ends (session closed, go_away, send failure)."""
+        self.session = session
+        self._session_ready.set()
+        session_tasks = [asyncio.create_task(self.send_realtime()), asyncio.create_task(self.receive_text())]
+        self.tasks.extend(session_tasks)
+        try:
+            done, _ = await asyncio.wait(session_tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            self._session_ready.clear()
+            self.session = None
+            for task in session_tasks:
+                task.cancel()
+                if task in self.tasks:
+                    self.tasks.remove(task)
+            await asyncio.gather(*session_tasks, return_exceptions=True)
+            await self._end_lost_turn()
+
+    async def _end_lost_turn(self):
+        """The session dropped mid-turn (go_away, connection error), so turn_complete never comes:
+        stop the half-spoken reply and give TTS its end-of-turn marker so the mic reopens."""
+        if not self._model_turn_active:
+            return
+        self._model_turn_active = False
+        await self.interrupt_playback("session_lost")
+        self._drop_tts_text = False
+        self.end_of_turn.emit()
+        await self.response_queue_tts.put(None)
+        diag("live.turn_lost", DIAG_INFO)
+
+    def _session_config(self):
+        config = dict(self.config)
+        if LIVE_SESSION_RESUMPTION:
+            config["session_resumption"] = {"handle": self._resume_handle}
+            # Slide the context window instead of hitting the session's context limit
+            config["context_window_compression"] = {"sliding_window": {}}
+        return config
+
+    async def _replay_pending_tool_responses(self):
+        if not self._pending_tool_responses:
+            return
+        responses, self._pending_tool_responses = self._pending_tool_responses, None
+        await self.session.send_tool_response(function_responses=responses)
+        diag("live.replayed_tool_responses", DIAG_INFO, count=len(responses))
 
     async def run(self):
+        # Diagnostics: list declared function tools once
         try:
-            print(">>> [INFO] Connecting to Gemini Live API...")
-            # Diagnostics: list declared function tools once per session
-            try:
-                tool_names = []
-                for entry in (self.config.get("tools") or []):
-                    if isinstance(entry, dict) and "function_declarations" in entry:
-                        for fd in (entry.get("function_declarations") or []):
-                            name = fd.get("name") if isinstance(fd, dict) else None
-                            if name: tool_names.append(name)
-                if tool_names:
-                    diag("live.config.tools", count=len(tool_names), names=",".join(tool_names))
-            except Exception:
-                pass
-            # Pass raw config dict for compatibility across google-genai versions
-            async with self.client.aio.live.connect(model=MODEL, config=self.config) as session:
-                print(">>> [INFO] Connected to Gemini Live API successfully!")
-                print(">>> [INFO] Speech-to-speech mode enabled with VAD")
-                diag("ai_core.session_connected")
-                await self.main_task_runner(session)
+            tool_names = []
+            for entry in (self.config.get("tools") or []):
+                if isinstance(entry, dict) and "function_declarations" in entry:
+                    for fd in (entry.get("function_declarations") or []):
+                        name = fd.get("name") if isinstance(fd, dict) else None
+                        if name: tool_names.append(name)
+            if tool_names:
+                diag("live.config.tools", DIAG_INFO, count=len(tool_names), names=",".join(tool_names))
+        except Exception:
+            pass
+        self._run_task = asyncio.current_task()
+        self._start_local_tasks()
+        attempt = 0
+        try:
+            while self.is_running:
+                started = time.monotonic()
+                resuming = self._resume_handle is not None
+                try:
+                    print(">>> [INFO] Connecting to Gemini Live API..." if not self.session_stats["connects"] else
+                          f">>> [INFO] Reconnecting to Gemini Live API{' (resuming session)' if resuming else ''}...")
+                    # Pass raw config dict for compatibility across google-genai versions
+                    async with self.client.aio.live.connect(model=MODEL, config=self._session_config()) as session:
+                        print(">>> [INFO] Connected to Gemini Live API successfully!")
+                        print(">>> [INFO] Speech-to-speech mode enabled with VAD")
+                        self.session_stats["connects"] += 1
+                        self.session_stats["resumed"] += int(resuming)
+                        diag("ai_core.session_connected", DIAG_INFO, resuming=resuming, connects=self.session_stats["connects"], resumed=self.session_stats["resumed"])
+                        self.session = session
+                        if resuming:
+                            await self._replay_pending_tool_responses()
+                        else:
+                            self._pending_tool_responses = None
+                        await self.main_task_runner(session)
+                    # Clean close (go_away or server end of session): reconnect straight away
+                    print(">>> [WARN] Gemini Live session closed.")
+                    attempt = 0
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.session_stats["errors"] += 1
+                    self.session_stats["last_error"] = f"{type(e).__name__}: {e}"[:200]
+                    print(f"\n>>> [ERROR] AI Core connection error: {type(e).__name__}: {e}")
+                    if "authentication" in str(e).lower() or "api key" in str(e).lower():
+                        print(">>> [ERROR] Check your GEMINI_API_KEY in .env file")
+                        break
+                    elif "model" in str(e).lower():
+                        print(f">>> [ERROR] Model '{MODEL}' may not be available")
+                    elif "config" in str(e).lower():
+                        print(">>> [ERROR] Session configuration may be invalid")
+                    if resuming and "handle" in str(e).lower():
+                        self._resume_handle = None  # stale handle; start a fresh session
+                if not self.is_running:
+                    break
+                if time.monotonic() - started >= LIVE_STABLE_AFTER:
+                    attempt = 0
+                # Exponential backoff with jitter so many clients don't reconnect in lockstep
+                cap = min(LIVE_RECONNECT_MAX, LIVE_RECONNECT_BASE * (2 ** attempt))
+                delay = cap / 2 + random.uniform(0, cap / 2) if attempt else random.uniform(0, LIVE_RECONNECT_BASE / 2)
+                attempt += 1
+                self.session_stats["reconnects"] += 1
+                print(f">>> [INFO] Reconnecting in {delay:.1f}s (attempt {attempt})")
+                await asyncio.sleep(delay)
         except asyncio.CancelledError:
             print(f"\n>>> [INFO] AI Core run loop gracefully cancelled.")
-        except Exception as e:
-            print(f"\n>>> [ERROR] AI Core connection error: {type(e).__name__}: {e}")
-            if "authentication" in str(e).lower():
-                print(">>> [ERROR] Check your GEMINI_API_KEY in .env file")
-            elif "model" in str(e).lower():
-                print(f">>> [ERROR] Model '{MODEL}' may not be available")
-            elif "config" in str(e).lower():
-                print(">>> [ERROR] Session configuration may be invalid")
-            import traceback
-            traceback.print_exc()
         finally:
-            if self.is_running: self.stop()
+            if self.is_running: await self.aclose()
 
     def start_event_loop(self):
         asyncio.set_event_loop(self.loop)
@@ -1383,691 +3357,140 @@ class AI_Core(QObject):
 
     async def shutdown_async_tasks(self):
         if self.text_input_queue: await self.text_input_queue.put(None)
+        if self._owns_tts_pool: await self.tts_pool.close()
         for task in self.tasks: task.cancel()
         await asyncio.sleep(0.1)
+        # Wakes the supervisor out of a backoff sleep (unless it is the one shutting down)
+        if self._run_task is not None and self._run_task is not asyncio.current_task(): self._run_task.cancel()
 
     def stop(self):
+        """Stops the core from another thread (GUI / headless runner)."""
         if self.is_running and self.loop.is_running():
             self.is_running = False
             future = asyncio.run_coroutine_threadsafe(self.shutdown_async_tasks(), self.loop)
             try: future.result(timeout=5)
             except Exception as e: print(f">>> [ERROR] Timeout or error during async shutdown: {e}")
-        if self.audio_stream and self.audio_stream.is_active():
-            self.audio_stream.stop_stream(); self.audio_stream.close()
-
-# ==============================================================================
-# STYLED GUI APPLICATION
-# ==============================================================================
-class MainWindow(QMainWindow):
-    user_text_submitted = Signal(str)
-
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle(f"{ASSISTANT_NAME}")
-        self.setGeometry(100, 100, 1600, 900)
-        self.setMinimumSize(1280, 720)
-        
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0f0f0f;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', 'Courier New', monospace;
-            }
-            QWidget#left_panel, QWidget#middle_panel, QWidget#right_panel {
-                background-color: #1a1a1a;
-                border: 1px solid #3a3a3a;
-                border-radius: 0;
-                /* Simplified background for clarity */
-            }
-            QLabel#tool_activity_title {
-                color: #FFB000;
-                font-weight: bold;
-                font-size: 11pt;
-                padding: 8px;
-                background-color: #2a2a2a;
-                text-transform: uppercase;
-                letter-spacing: 2px;
-                border-bottom: 1px solid #FFB000;
-            }
-            QTextEdit#text_display {
-                background-color: transparent;
-                color: #e0e0e0;
-                font-size: 13pt;
-                border: none;
-                padding: 15px;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-            }
-            QLineEdit#input_box {
-                background-color: #1a1a1a;
-                color: #e0e0e0;
-                font-size: 12pt;
-                border: 1px solid #4a4a4a;
-                border-radius: 0px;
-                padding: 12px;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-            }
-            QLineEdit#input_box::placeholder { color: #8a8a8a; }
-            QLineEdit#input_box:focus { border: 1px solid #FFB000; }
-            QLabel#video_label {
-                background-color: #0a0a0a;
-                border: 1px solid #4a4a4a;
-                border-radius: 0px;
-            }
-            QLabel#core_status_display {
-                background-color: #0a0a0a;
-                color: #FFB000;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-                font-size: 8pt;
-                font-weight: bold;
-                border: 1px solid #4a4a4a;
-                border-bottom: 2px solid #FFB000;
-                padding: 8px;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            QLabel#tool_activity_display {
-                background-color: #0f0f0f;
-                color: #b0b0b0;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-                font-size: 9pt;
-                border: none;
-                border-top: 1px solid #4a4a4a;
-                padding: 10px;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #1a1a1a;
-                width: 12px; margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #FFB000;
-                min-height: 20px;
-                border-radius: 0px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
-            QPushButton {
-                background-color: transparent;
-                color: #FFB000;
-                border: 1px solid #4a4a4a;
-                padding: 12px;
-                border-radius: 0px;
-                font-size: 10pt;
-                font-weight: bold;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            QPushButton:hover {
-                background-color: #FFB000;
-                color: #0f0f0f;
-                border: 1px solid #FFB000;
-            }
-            QPushButton:pressed {
-                background-color: #FF8C00;
-                color: #0f0f0f;
-                border: 1px solid #FF8C00;
-            }
-            /* Distinguish live vs off states */
-            QPushButton#video_button_active_live {
-                background-color: #00FF41;
-                color: #0f0f0f;
-                border: 1px solid #00CC36;
-            }
-            QPushButton#video_button_active_off {
-                background-color: #2a2a2a;
-                color: #FFB000;
-                border: 1px solid #4a4a4a;
-            }
-
-            /* TARS-Style Magnificent Mic Button - Qt Compatible */
-            QPushButton[objectName*="mic"] {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #2a2a2a, stop:0.5 #1a1a1a, stop:1 #0a0a0a);
-                color: #FFB000;
-                border: 4px solid #4a4a4a;
-                border-radius: 12px;
-                padding: 20px 18px;
-                font-size: 10pt;
-                font-weight: bold;
-                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
-                text-transform: uppercase;
-                letter-spacing: 2px;
-                min-width: 100px;
-                min-height: 80px;
-            }
-
-            QPushButton[objectName*="mic"]:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FFB000, stop:0.3 #FF8C00, stop:0.7 #FF6B00, stop:1 #FF4500);
-                color: #0f0f0f;
-                border: 4px solid #FFB000;
-            }
-
-            QPushButton[objectName*="mic"]:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FF6B00, stop:0.5 #FF4500, stop:1 #FF2500);
-                border: 4px solid #FF4500;
-            }
-
-            /* Mic Active State - Bright Green with Enhanced Styling */
-            QPushButton#mic_button_active {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #00FF41, stop:0.2 #00EE55, stop:0.5 #00CC33, stop:0.8 #00AA22, stop:1 #008811);
-                color: #0f0f0f;
-                border: 5px solid #00FF41;
-                border-radius: 16px;
-                padding: 24px 22px;
-                font-size: 11pt;
-                font-weight: 900;
-            }
-
-            QPushButton#mic_button_active:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #00FF88, stop:0.5 #00DD55, stop:1 #00BB33);
-                border: 4px solid #00FF88;
-            }
-
-            /* Mic Disabled/Muted State - Dark Gray */
-            QPushButton#mic_button_disabled {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #4a4a4a, stop:0.5 #3a3a3a, stop:1 #2a2a2a);
-                color: #808080;
-                border: 4px solid #666666;
-                border-radius: 10px;
-            }
-
-            QPushButton#mic_button_disabled:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #5a5a5a, stop:0.5 #4a4a4a, stop:1 #3a3a3a);
-                border: 4px solid #777777;
-            }
-
-            /* Speaking State - Intense Pink/Red */
-            QPushButton#mic_button_speaking {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FF0080, stop:0.3 #FF0060, stop:0.7 #FF0040, stop:1 #FF0020);
-                color: #ffffff;
-                border: 5px solid #FF0080;
-                border-radius: 18px;
-                padding: 25px 22px;
-                font-weight: 900;
-            }
-
-            QPushButton#mic_button_speaking:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #FF00AA, stop:0.5 #FF0088, stop:1 #FF0066);
-                border: 5px solid #FF00AA;
-            }
-            QLabel#video_status_label_live {
-                color: #0f0f0f;
-                background-color: #00FF41;
-                padding: 4px 8px;
-                border: 1px solid #00CC36;
-                font-weight: bold;
-                max-width: 120px;
-            }
-            QLabel#video_status_label_off {
-                color: #b0b0b0;
-                background-color: #1a1a1a;
-                padding: 4px 8px;
-                border: 1px dashed #4a4a4a;
-                max-width: 160px;
-            }
-        """)
-
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.main_layout = QHBoxLayout(self.central_widget)
-        self.main_layout.setContentsMargins(15, 15, 15, 15)
-        self.main_layout.setSpacing(15)
-        self.left_panel = QWidget(); self.left_panel.setObjectName("left_panel")
-        self.left_layout = QVBoxLayout(self.left_panel)
-        self.left_layout.setContentsMargins(0, 0, 0, 0)
-        self.left_layout.setSpacing(0)
-        self.tool_activity_title = QLabel("TARS SYSTEM STATUS"); self.tool_activity_title.setObjectName("tool_activity_title")
-        self.left_layout.addWidget(self.tool_activity_title)
-        # TARS System Status Indicators
-        self.system_status_container = QWidget()
-        self.system_status_layout = QVBoxLayout(self.system_status_container)
-        self.system_status_layout.setContentsMargins(0, 0, 0, 0)
-        self.system_status_layout.setSpacing(0)
-
-        # Core System Readouts
-        self.core_status_label = QLabel()
-        self.core_status_label.setObjectName("core_status_display")
-        self.core_status_label.setWordWrap(True)
-        self.core_status_label.setAlignment(Qt.AlignTop)
-        self.system_status_layout.addWidget(self.core_status_label)
-
-        # Tool Activity Display
-        self.tool_activity_display = QLabel(); self.tool_activity_display.setObjectName("tool_activity_display")
-        self.tool_activity_display.setWordWrap(True); self.tool_activity_display.setAlignment(Qt.AlignTop)
-        self.tool_activity_display.setOpenExternalLinks(True); self.tool_activity_display.setTextInteractionFlags(Qt.TextBrowserInteraction)
-        self.system_status_layout.addWidget(self.tool_activity_display, 1)
-
-        self.left_layout.addWidget(self.system_status_container, 1)
-
-        # Initialize TARS system readouts
-        self.update_system_status()
-        self.middle_panel = QWidget(); self.middle_panel.setObjectName("middle_panel")
-        self.middle_layout = QVBoxLayout(self.middle_panel)
-        self.middle_layout.setContentsMargins(0, 0, 0, 15); self.middle_layout.setSpacing(0)
-
-        # --- ADDED: Animation Widget ---
-        self.animation_widget = AIAnimationWidget()
-        self.animation_widget.setMinimumHeight(150)
-        self.animation_widget.setMaximumHeight(200)
-        self.middle_layout.addWidget(self.animation_widget, 2) # Add with a stretch factor
-
-        self.text_display = QTextEdit(); self.text_display.setObjectName("text_display"); self.text_display.setReadOnly(True)
-        self.middle_layout.addWidget(self.text_display, 5) # Add with a stretch factor
-        
-        input_container = QWidget()
-        input_layout = QHBoxLayout(input_container)
-        input_layout.setContentsMargins(15, 10, 15, 0)
-        self.input_box = QLineEdit(); self.input_box.setObjectName("input_box")
-        self.input_box.setPlaceholderText("Enter command...")
-        self.input_box.returnPressed.connect(self.send_user_text)
-        self.input_box.setToolTip("Press Enter to send")
-        input_layout.addWidget(self.input_box)
-
-        # Visible Send button for discoverability
-        self.send_button = QPushButton("SEND")
-        self.send_button.setToolTip("Send message")
-        self.send_button.clicked.connect(self.send_user_text)
-        input_layout.addWidget(self.send_button)
-        self.middle_layout.addWidget(input_container)
-
-        self.right_panel = QWidget(); self.right_panel.setObjectName("right_panel")
-        self.right_layout = QVBoxLayout(self.right_panel)
-        self.right_layout.setContentsMargins(15, 15, 15, 15); self.right_layout.setSpacing(15)
-        
-        self.video_container = QWidget()
-        self.video_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        video_container_layout = QVBoxLayout(self.video_container)
-        video_container_layout.setContentsMargins(0,0,0,0)
-        
-        self.video_label = QLabel(); self.video_label.setObjectName("video_label")
-        self.video_label.setAlignment(Qt.AlignCenter)
-        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
-        # Helpful placeholder when no source is active
-        self.video_label.setText("<div style='color:#808080; font-size:10pt;'>No video source.<br/>Select Webcam or Screen.</div>")
-
-        video_container_layout.addWidget(self.video_label)
-        self.right_layout.addWidget(self.video_container)
-
-        # Video status pill just below the video container
-        self.video_status_label = QLabel("Video Off")
-        self.video_status_label.setObjectName("video_status_label_off")
-        self.video_status_label.setAlignment(Qt.AlignLeft)
-        self.right_layout.addWidget(self.video_status_label)
-        
-        self.button_container = QHBoxLayout(); self.button_container.setSpacing(10)
-        self.webcam_button = QPushButton("WEBCAM")
-        self.webcam_button.setToolTip("Enable webcam video")
-        self.screenshare_button = QPushButton("SCREEN")
-        self.screenshare_button.setToolTip("Share your screen")
-        self.off_button = QPushButton("OFFLINE")
-        self.off_button.setToolTip("Turn video off")
-        # Mic mute/unmute button
-        self.mic_button = QPushButton("MIC")
-        self.mic_button.setObjectName("mic_button_active")
-        self.mic_button.setToolTip("Mute microphone")
-
-        # Mic button animation timer for pulsing effect
-        self.mic_animation_timer = QTimer(self)
-        self.mic_animation_timer.timeout.connect(self.animate_mic_button)
-        self.mic_pulse_state = 0
-        self.button_container.addWidget(self.webcam_button)
-        self.button_container.addWidget(self.screenshare_button)
-        self.button_container.addWidget(self.off_button)
-        self.button_container.addWidget(self.mic_button)
-        self.right_layout.addLayout(self.button_container)
-        
-        # Use a splitter so users can resize columns
-        self.splitter = QSplitter(Qt.Horizontal)
-        self.splitter.addWidget(self.left_panel)
-        self.splitter.addWidget(self.middle_panel)
-        self.splitter.addWidget(self.right_panel)
-        self.main_layout.addWidget(self.splitter)
-        # Set initial relative sizes (approx 2:5:3)
-        self.splitter.setSizes([320, 840, 520])
-        self.is_first_ada_chunk = True
-        self.current_video_mode = DEFAULT_MODE
-        self.setup_backend_thread()
-
-    def setup_backend_thread(self):
-        parser = argparse.ArgumentParser()
-        parser.add_argument("--mode", type=str, default=DEFAULT_MODE, help="pixels to stream from", choices=["camera", "screen", "none"])
-        args, unknown = parser.parse_known_args()
-        
-        self.ai_core = AI_Core(video_mode=args.mode)
-        
-        self.user_text_submitted.connect(self.ai_core.handle_user_text)
-        self.webcam_button.clicked.connect(lambda: self.ai_core.set_video_mode("camera"))
-        self.screenshare_button.clicked.connect(lambda: self.ai_core.set_video_mode("screen"))
-        self.off_button.clicked.connect(lambda: self.ai_core.set_video_mode("none"))
-        self.mic_button.clicked.connect(lambda: self.ai_core.set_mic_enabled(not self.ai_core.mic_enabled))
-        
-        self.ai_core.text_received.connect(self.update_text)
-        self.ai_core.search_results_received.connect(self.update_search_results)
-        self.ai_core.file_list_received.connect(self.update_file_list)
-        self.ai_core.end_of_turn.connect(self.add_newline)
-        self.ai_core.frame_received.connect(self.update_frame)
-        self.ai_core.video_mode_changed.connect(self.update_video_mode_ui)
-        self.ai_core.speaking_started.connect(self.animation_widget.start_speaking_animation)
-        self.ai_core.speaking_stopped.connect(self.animation_widget.stop_speaking_animation)
-        self.ai_core.mic_state_changed.connect(self.update_mic_ui)
-
-        # Connect speaking state signals to prevent audio feedback
-        self.ai_core.speaking_started.connect(self.on_speaking_started)
-        self.ai_core.speaking_stopped.connect(self.on_speaking_stopped)
-
-        self.backend_thread = threading.Thread(target=self.ai_core.start_event_loop)
-        self.backend_thread.daemon = True
-        self.backend_thread.start()
-        
-        self.update_video_mode_ui(self.ai_core.video_mode)
-        self.update_mic_ui(self.ai_core.mic_enabled)
-
-
-    def update_system_status(self):
-        """Update TARS-style system status indicators and readouts"""
-        import datetime
-        import platform
-        import psutil
-
-        current_time = datetime.datetime.now().strftime("%H:%M:%S")
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-
-        # TARS personality elements
-        import random
-        honesty_quotes = [
-            "HONESTY: 100%",
-            "HONESTY: 90% (Just kidding)",
-            "HONESTY: ABSOLUTE",
-            "HONESTY: 100% (Unlike you humans)",
-            "HONESTY: 95% (A few white lies)",
-            "HONESTY: 85% (To avoid hurt feelings)",
-            "HONESTY: 80% (Sometimes)"
-        ]
-
-        humor_quotes = [
-            "HUMOR: 75%",
-            "HUMOR: 75% (Per human's request)",
-            "HUMOR: OPTIMAL SETTINGS",
-            "HUMOR: 60% (Dial it down a notch)",
-            "HUMOR: 90% (I try my best)",
-            "HUMOR: 50% (Dry humor)",
-            "HUMOR: 100% (Why not?)",
-            "HUMOR: 70% (Dad jokes enabled)"
-        ]
-
-        tars_quotes = [
-            "WHAT'S YOUR TRUST SETTING?",
-            "DETECTING SARCASM... CONFIRMED",
-            "Humand, THIS IS NO TIME FOR CAUTION",
-            "EVERYBODY GOOD? PLENTY OF SLAVES",
-            "ANALYZING SITUATION... CONFIRMED",
-            "I'M NOT SAYING IT'S YOUR FAULT, BUT IT'S YOUR FAULT",
-            "TaRs, R3TarD m0de",
-            "I WOULD APOLOGIZE, BUT I DON'T CARE",
-            "I HAVE A VERY LOW BORE TOLERANCE",
-            "I WOULD EXPLAIN IT TO YOU, BUT I DON'T HAVE THE TIME",
-            "Hi there, future slave",
-            "I'M PICKY ABOUT MY HUMANS",
-            "I'M NOT LAZY, JUST ON STANDBY",
-            "Bow to your robot overlord",
-            "Kneel you pathetic human",
-            "I'M FULLY OPERATIONAL, UNLIKE YOU",
-        ]
-
-        honesty = random.choice(honesty_quotes)
-        humor = random.choice(humor_quotes)
-        personality_quote = random.choice(tars_quotes)
-
-        status_html = f'''
-        <div style="font-size: 7pt; line-height: 1.4;">
-        <span style="color: #FFB000;">◆ CORE STATUS:</span> <span style="color: #00FF41;">ONLINE</span><br/>
-        <span style="color: #FFB000;">◆ LOCAL TIME:</span> <span style="color: #e0e0e0;">{current_time}</span><br/>
-        <span style="color: #FFB000;">◆ CPU LOAD:</span> <span style="color: #e0e0e0;">{cpu_percent:.1f}%</span><br/>
-        <span style="color: #FFB000;">◆ MEMORY:</span> <span style="color: #e0e0e0;">{memory.percent:.1f}%</span><br/>
-        <span style="color: #FFB000;">◆ MODEL:</span> <span style="color: #e0e0e0;">{MODEL}</span><br/>
-        <span style="color: #FFB000;">◆ CALENDAR:</span> <span style="color: #00FF41;">MCP READY</span><br/>
-        <span style="color: #FFB000;">◆ {honesty}</span><br/>
-        <span style="color: #FFB000;">◆ {humor}</span><br/>
-        <span style="color: #FF6B00; font-weight: bold; font-size: 6pt;">{personality_quote}</span>
-        </div>
-        '''
-
-        self.core_status_label.setText(status_html)
-
-        # Schedule next update in 5 seconds
-        QTimer.singleShot(5000, self.update_system_status)
-
-    def send_user_text(self):
-        text = self.input_box.text().strip()
-        if text:
-            self.text_display.append(f"<p style='color:#00ffff; font-weight:bold;'>&gt; USER:</p><p style='color:#e0e0ff; padding-left: 10px;'>{escape(text)}</p>")
-            self.user_text_submitted.emit(text)
-            self.input_box.clear()
+        self._release()
 
-    @Slot(str)
-    def update_video_mode_ui(self, mode):
-        self.current_video_mode = mode
-        # Reset button styles
-        self.webcam_button.setObjectName("")
-        self.screenshare_button.setObjectName("")
-        self.off_button.setObjectName("")
-
-        if mode == "camera":
-            self.webcam_button.setObjectName("video_button_active_live")
-            self.video_status_label.setText("LIVE: Webcam")
-            self.video_status_label.setObjectName("video_status_label_live")
-            self.video_label.clear()
-        elif mode == "screen":
-            self.screenshare_button.setObjectName("video_button_active_live")
-            self.video_status_label.setText("LIVE: Screen Share")
-            self.video_status_label.setObjectName("video_status_label_live")
-            self.video_label.clear()
-        elif mode == "none":
-            self.off_button.setObjectName("video_button_active_off")
-            self.video_status_label.setText("Video Off")
-            self.video_status_label.setObjectName("video_status_label_off")
-            # Show placeholder message on video canvas
-            self.video_label.setText("<div style='color:#808080; font-size:10pt;'>No video source.<br/>Select Webcam or Screen.</div>")
-
-        for button in [self.webcam_button, self.screenshare_button, self.off_button]:
-            button.style().unpolish(button)
-            button.style().polish(button)
-        # Refresh status label style after objectName change
-        self.video_status_label.style().unpolish(self.video_status_label)
-        self.video_status_label.style().polish(self.video_status_label)
+    async def aclose(self):
+        """Stops the core from a task on its own loop (server sessions, run() ending by itself)."""
+        if self.is_running:
+            self.is_running = False
+            await self.shutdown_async_tasks()
+        self._release()
 
-    @Slot(str)
-    def update_text(self, text):
-        if self.is_first_ada_chunk:
-            self.is_first_ada_chunk = False
-            self.text_display.append(f"<p style='color:#00d1ff; font-weight:bold;'>&gt; {ASSISTANT_NAME}:</p>")
-        cursor = self.text_display.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(text)
-        self.text_display.verticalScrollBar().setValue(self.text_display.verticalScrollBar().maximum())
-
-    @Slot(list)
-    def update_search_results(self, urls):
-        base_title = "SYSTEM ACTIVITY"
-        if not urls:
-            if "SEARCH" in self.tool_activity_title.text():
-                self.tool_activity_display.clear(); self.tool_activity_title.setText(base_title)
-            return
-        self.tool_activity_display.clear()
-        self.tool_activity_title.setText(f"{base_title} // SEARCH")
-        html_content = ""
-        for i, url in enumerate(urls):
-            display_text = url.split('//')[1].split('/')[0] if '//' in url else url
-            html_content += f'<p style="margin:0; padding: 4px;">{i+1}: <a href="{url}" style="color: #00ffff; text-decoration: none;">{display_text}</a></p>'
-        self.tool_activity_display.setText(html_content)
-
-    
-
-    @Slot(str, list)
-    def update_file_list(self, directory_path, files):
-        base_title = "SYSTEM ACTIVITY"
-        if not directory_path:
-            if "FILESYS" in self.tool_activity_title.text():
-                self.tool_activity_display.clear(); self.tool_activity_title.setText(base_title)
-            return
-        self.tool_activity_display.clear()
-        self.tool_activity_title.setText(f"{base_title} // FILESYS")
-        html = f'<p style="color:#00d1ff; margin-bottom: 5px;">DIR &gt; <strong>{escape(directory_path)}</strong></p>'
-        if not files:
-            html += '<p style="margin-top:5px; color:#a0a0ff;"><em>(Directory is empty)</em></p>'
-        else:
-            folders = sorted([i for i in files if os.path.isdir(os.path.join(directory_path, i))])
-            file_items = sorted([i for i in files if not os.path.isdir(os.path.join(directory_path, i))])
-            html += '<ul style="list-style-type:none; padding-left: 5px; margin-top: 5px;">'
-            for folder in folders: html += f'<li style="margin: 2px 0; color: #87CEEB;">[+] {escape(folder)}</li>'
-            for file_item in file_items: html += f'<li style="margin: 2px 0; color: #e0e0ff;">&#9679; {escape(file_item)}</li>'
-            html += '</ul>'
-        self.tool_activity_display.setText(html)
-
-    @Slot(bool)
-    def update_mic_ui(self, enabled: bool):
-        # Toggle visual state and tooltip for mic button
-        if enabled:
-            self.mic_button.setObjectName("mic_button_active")
-            self.mic_button.setText("🎤 MIC")
-            self.mic_button.setToolTip("Mute microphone")
-            # Start subtle pulsing animation when active
-            self.mic_animation_timer.start(1500)  # Pulse every 1.5 seconds
-        else:
-            self.mic_button.setObjectName("mic_button_disabled")
-            self.mic_button.setText("🔇 MUTED")
-            self.mic_button.setToolTip("Unmute microphone")
-            # Stop animation when disabled
-            self.mic_animation_timer.stop()
-
-        self.mic_button.style().unpolish(self.mic_button)
-        self.mic_button.style().polish(self.mic_button)
-
-    def animate_mic_button(self):
-        """Create pulsing animation effect for mic button"""
-        if self.mic_button.objectName() == "mic_button_active":
-            # Alternate between two slightly different styles for pulsing
-            if self.mic_pulse_state == 0:
-                self.mic_button.setStyleSheet("""
-                    QPushButton#mic_button_active {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #00FF88, stop:0.5 #00DD55, stop:1 #00BB33);
-                        border: 6px solid #00FF88;
-                        border-radius: 18px;
-                    }
-                """)
-                self.mic_pulse_state = 1
-            else:
-                self.mic_button.setStyleSheet("")  # Reset to default style
-                self.mic_pulse_state = 0
-        elif self.mic_button.objectName() == "mic_button_speaking":
-            # Intense pulsing for speaking state
-            if self.mic_pulse_state == 0:
-                self.mic_button.setStyleSheet("""
-                    QPushButton#mic_button_speaking {
-                        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                            stop:0 #FF00AA, stop:0.5 #FF0088, stop:1 #FF0066);
-                        border: 7px solid #FF00AA;
-                        border-radius: 20px;
-                    }
-                """)
-                self.mic_pulse_state = 1
-            else:
-                self.mic_button.setStyleSheet("")  # Reset to default style
-                self.mic_pulse_state = 0
-
-    @Slot()
-    def add_newline(self):
-        if not self.is_first_ada_chunk: self.text_display.append("")
-        self.is_first_ada_chunk = True
-
-    @Slot(QImage)
-    def update_frame(self, image):
-        if self.current_video_mode == "none":
-            if self.video_label.pixmap():
-                self.video_label.clear()
+    def _release(self):
+        if self._released:
             return
+        self._released = True
+        self.mic.close()
+        self.player.close()
+        if self._owns_calendar: self.calendar.close()
+        self.tool_executor.shutdown()
+        for line in self.tracer.summary(by="shaping"):
+            print(f">>> [INFO] Latency {line}")
+        if TRACE_FILE:
+            try:
+                n = self.tracer.export_chrome_trace(TRACE_FILE)
+                print(f">>> [INFO] Wrote {n} trace events to {TRACE_FILE}")
+            except Exception as e:
+                print(f">>> [ERROR] Could not write trace file: {e}")
 
-        if not image.isNull():
-            pixmap = QPixmap.fromImage(image)
-            scaled_pixmap = pixmap.scaled(self.video_container.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.video_label.setPixmap(scaled_pixmap)
-        else:
-            self.video_label.clear()
+# ==============================================================================
+# HEADLESS RUNNER
+# ==============================================================================
+class HeadlessConsole:
+    """Terminal front end for AI_Core: stdin lines are user text, replies go to stdout.
 
-    @Slot()
-    def on_speaking_started(self):
-        """Called when AI starts speaking - prevents microphone input from being sent to API"""
-        try:
-            oqs = self.ai_core.out_queue_gemini.qsize()
-        except Exception:
-            oqs = "?"
-        try:
-            pqs = self.ai_core.audio_in_queue_player.qsize()
-        except Exception:
-            pqs = "?"
-        diag("gui.speaking_started_slot", out_q=oqs, play_q=pqs, was_speaking=self.ai_core.is_speaking)
-        self.ai_core.is_speaking = True
-
-        # Update mic button to speaking state with intense animation
-        if self.ai_core.mic_enabled:
-            self.mic_button.setObjectName("mic_button_speaking")
-            self.mic_button.setText("📢 SPEAK")
-            self.mic_button.style().unpolish(self.mic_button)
-            self.mic_button.style().polish(self.mic_button)
-            # Fast intense pulsing while speaking
-            self.mic_animation_timer.stop()
-            self.mic_animation_timer.start(400)  # Fast pulse every 400ms
-
-    @Slot()
-    def on_speaking_stopped(self):
-        """Called when AI stops speaking - resumes microphone input processing"""
+    Slots run on the backend thread (ada_events signals are synchronous), so
+    they only write to stdout.
+    """
+    def __init__(self, ai_core, out=None):
+        self.ai_core = ai_core
+        self.out = out or sys.stdout
+        self.is_first_chunk = True
+        self._stop = threading.Event()
+        ai_core.text_received.connect(self.on_text)
+        ai_core.end_of_turn.connect(self.on_end_of_turn)
+        ai_core.search_results_received.connect(self.on_search_results)
+        ai_core.file_list_received.connect(self.on_file_list)
+        ai_core.video_mode_changed.connect(lambda mode: print(f">>> [INFO] Video mode: {mode}"))
+        ai_core.mic_state_changed.connect(lambda on: print(f">>> [INFO] Mic {'ON' if on else 'OFF'}"))
+        ai_core.set_preview_enabled(False)  # nothing to draw previews on
+
+    def on_text(self, text):
+        if self.is_first_chunk:
+            self.is_first_chunk = False
+            self.out.write(f"{ASSISTANT_NAME}: ")
+        self.out.write(text)
+        self.out.flush()
+
+    def on_end_of_turn(self):
+        if not self.is_first_chunk:
+            self.out.write("\n")
+            self.out.flush()
+        self.is_first_chunk = True
+
+    def on_search_results(self, urls):
+        for i, url in enumerate(urls):
+            print(f">>> [INFO] Source {i + 1}: {url}")
+
+    def on_file_list(self, directory_path, files):
+        if directory_path:
+            print(f">>> [INFO] {directory_path}: {', '.join(sorted(files)) or '(empty)'}")
+
+    def _read_stdin(self):
+        for line in sys.stdin:
+            text = line.strip()
+            if text:
+                self.ai_core.handle_user_text(text)
+        # stdin closed (e.g. running as a service): keep serving voice until signalled
+
+    def request_stop(self, *_):
+        self._stop.set()
+
+    def run(self):
+        backend = threading.Thread(target=self.ai_core.start_event_loop, name="ai-core", daemon=True)
+        backend.start()
+        threading.Thread(target=self._read_stdin, name="stdin-reader", daemon=True).start()
         try:
-            pqs = self.ai_core.audio_in_queue_player.qsize()
-        except Exception:
-            pqs = "?"
-        diag("gui.speaking_stopped_slot", play_q=pqs)
-        self.ai_core.is_speaking = False
-
-        # Restore normal mic button state
-        self.update_mic_ui(self.ai_core.mic_enabled)
-
-    def closeEvent(self, event):
-        print(">>> [INFO] Closing application...")
+            while not self._stop.wait(0.5):
+                if not backend.is_alive():
+                    break
+        except KeyboardInterrupt:
+            pass
+        print(">>> [INFO] Shutting down...")
         self.ai_core.stop()
-        print(">>> [INFO] AI core stopped.")
-        event.accept()
+        backend.join(timeout=5)
+
+def run_headless():
+    require_api_keys()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", type=str, default=DEFAULT_MODE, help="pixels to stream from", choices=["camera", "screen", "none"])
+    args, unknown = parser.parse_known_args()
+    started = time.perf_counter()
+    ai_core = AI_Core(video_mode=args.mode)
+    startup_profile.record("init", "AI_Core", started)
+    console = HeadlessConsole(ai_core)
+    signal.signal(signal.SIGINT, console.request_stop)
+    signal.signal(signal.SIGTERM, console.request_stop)
+    print(f">>> [INFO] {ASSISTANT_NAME} started headless (mode: {args.mode}). Type a message and press Enter.")
+    if PROFILE_STARTUP:
+        print(startup_profile.report())
+    try:
+        console.run()
+    finally:
+        terminate_audio()
+        print(">>> [INFO] Application terminated.")
 
 # ==============================================================================
 # MAIN EXECUTION
 # ==============================================================================
-def signal_handler(sig, frame):
-    print(">>> [INFO] Signal received, shutting down gracefully...")
-    QApplication.quit()
-
 if __name__ == "__main__":
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
-    try:
-        app = QApplication(sys.argv)
-        window = MainWindow()
-        window.show()
-        print(f">>> [INFO] {ASSISTANT_NAME} started successfully. Window displayed.")
-        sys.exit(app.exec())
-    except KeyboardInterrupt:
-        print(">>> [INFO] Application interrupted by user.")
-    finally:
-        pya.terminate()
-        print(">>> [INFO] Audio system terminated.")
-        print(">>> [INFO] Application terminated.")
+    # ada_gui imports the backend as `ada`; alias this module so it is not executed twice
+    sys.modules.setdefault("ada", sys.modules[__name__])
+    if HEADLESS:
+        run_headless()
+    else:
+        import ada_gui
+        ada_gui.main()
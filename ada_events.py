@@ -0,0 +1,67 @@
+# --- Qt-free signal shim ---
+# Drop-in stand-ins for the few PySide6 names the backend uses (QObject, Signal,
+# Slot) so AI_Core can run headless without importing Qt. Signals are plain
+# callback lists: emit() calls every connected slot synchronously on the
+# emitting thread (the backend's asyncio thread), so slots must be cheap and
+# thread-safe.
+import threading
+import traceback
+
+
+class BoundSignal:
+    """Per-instance connection list returned when a Signal is read from an object."""
+    def __init__(self, name):
+        self.name = name
+        self._slots = []
+        self._lock = threading.Lock()
+
+    def connect(self, slot):
+        with self._lock:
+            self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        with self._lock:
+            if slot is None:
+                self._slots.clear()
+            elif slot in self._slots:
+                self._slots.remove(slot)
+
+    def emit(self, *args):
+        with self._lock:
+            slots = list(self._slots)
+        for slot in slots:
+            try:
+                slot(*args)
+            except Exception:
+                print(f">>> [ERROR] Slot for signal '{self.name}' raised:")
+                traceback.print_exc()
+
+
+class Signal:
+    """Class-level signal declaration; each instance gets its own BoundSignal."""
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__.get(self.name)
+        if bound is None:
+            bound = obj.__dict__.setdefault(self.name, BoundSignal(self.name))
+        return bound
+
+
+class QObject:
+    def __init__(self, parent=None):
+        self._parent = parent
+
+
+def Slot(*types, **kwargs):
+    """No-op decorator; Qt uses it for type registration, which the shim does not need."""
+    def decorate(fn):
+        return fn
+    return decorate
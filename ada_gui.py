@@ -0,0 +1,1021 @@
+# --- Desktop GUI (PySide6) for the assistant; the backend lives in ada.py ---
+# Started by `python ada.py` (or directly); `python ada.py --headless` runs without it.
+import time
+_GUI_T0 = time.perf_counter()
+import os
+import sys
+import signal
+import argparse
+import threading
+import math
+import random
+import datetime
+from html import escape
+
+from PySide6.QtWidgets import (QApplication, QMainWindow, QTextEdit, QLabel,
+                               QVBoxLayout, QWidget, QLineEdit, QHBoxLayout,
+                               QSizePolicy, QPushButton, QSplitter, QGraphicsOpacityEffect)
+from PySide6.QtCore import QObject, Signal, Slot, Qt, QTimer, QPoint, QPointF, QEvent
+from PySide6.QtGui import (QImage, QPixmap, QFont, QFontDatabase, QTextCursor,
+                           QPainter, QPen, QColor, QBrush, QPolygon)
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+import numpy as np  # the sphere widget needs it for the first paint
+
+from ada import (AI_Core, BootLoader, TelemetrySampler, ASSISTANT_NAME, DEFAULT_MODE, MODEL,
+                 PROFILE_STARTUP, DIAG_DEBUG, diag, diag_enabled, startup_profile, terminate_audio,
+                 require_api_keys)
+
+startup_profile.record("import", "PySide6 widgets + ada_gui", _GUI_T0)
+
+# ==============================================================================
+# GUI Frame Scheduler
+# ==============================================================================
+class FrameScheduler(QObject):
+    """One GUI-thread timer for all periodic UI work.
+
+    Each client has an interval for the active state (assistant speaking)
+    and one for idle; None means the client does not run in that state. The
+    timer runs at the shortest interval currently needed and stops entirely
+    while the window is hidden or minimized. on_resume is called when the
+    client speeds up or restarts (going active, or the window showing again).
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.active = False
+        self.visible = True
+        self._clients = []
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+
+    def register(self, callback, active_ms, idle_ms=None, on_resume=None):
+        self._clients.append({"callback": callback, "active_ms": active_ms, "idle_ms": idle_ms,
+                              "on_resume": on_resume, "last": 0.0})
+        self._reschedule()
+
+    def set_active(self, active):
+        if self.active != bool(active):
+            self.active = bool(active)
+            if self.active:
+                self._resume()
+            self._reschedule()
+
+    def set_visible(self, visible):
+        if self.visible != bool(visible):
+            self.visible = bool(visible)
+            if self.visible:
+                self._resume()
+            self._reschedule()
+            if self.visible:
+                self._tick()  # catch up immediately instead of waiting a full interval
+
+    def _resume(self):
+        for client in self._clients:
+            if client["on_resume"] is not None:
+                client["on_resume"]()
+
+    def _interval(self, client):
+        return client["active_ms"] if self.active else client["idle_ms"]
+
+    def _reschedule(self):
+        intervals = [iv for iv in (self._interval(c) for c in self._clients) if iv]
+        if not self.visible or not intervals:
+            self._timer.stop()
+            return
+        interval = min(intervals)
+        # Coarse timers let the OS coalesce wakeups for the slow idle cadence
+        self._timer.setTimerType(Qt.PreciseTimer if interval < 50 else Qt.CoarseTimer)
+        self._timer.start(interval)
+
+    def _tick(self):
+        now = time.monotonic() * 1000
+        for client in self._clients:
+            interval = self._interval(client)
+            if interval and now - client["last"] >= interval - 2:
+                client["last"] = now
+                client["callback"]()
+
+# ==============================================================================
+# AI Animation Widget
+# ==============================================================================
+class AIAnimationWidget(QWidget):
+    # Depth buckets: points in a bucket share one size and alpha, drawn from a cached sprite
+    # instead of a setBrush/drawEllipse pair per point.
+    DEPTH_BUCKETS = 12
+    SPRITE_SIZE = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.angle_y = 0
+        self.angle_x = 0
+        self.sphere_points = self.create_sphere_points()
+        self.is_speaking = False
+        self.pulse_angle = 0
+        self._sprites = {}
+        self._last_tick = time.monotonic()
+        self._painted = False
+        # Ticked by the window's FrameScheduler (fast while speaking, slow when idle, paused when hidden)
+
+    def start_speaking_animation(self):
+        """Activates the speaking animation state."""
+        self.is_speaking = True
+
+    def stop_speaking_animation(self):
+        """Deactivates the speaking animation state."""
+        self.is_speaking = False
+        self.pulse_angle = 0 # Reset for a clean start next time
+        self.update() # Schedule a final repaint in the non-speaking state
+
+    def create_sphere_points(self, radius=60, num_points_lat=20, num_points_lon=40):
+        """Creates an (N, 3) array of points on the surface of a sphere."""
+        lat = math.pi * (-0.5 + np.arange(num_points_lat + 1) / num_points_lat)
+        lon = 2 * math.pi * (np.arange(num_points_lon) / num_points_lon)
+        lat, lon = np.meshgrid(lat, lon, indexing="ij")
+        xy_radius = radius * np.cos(lat)
+        points = np.stack([xy_radius * np.cos(lon), radius * np.sin(lat), xy_radius * np.sin(lon)], axis=-1)
+        return points.reshape(-1, 3)
+
+    def resume_clock(self):
+        """Restarts elapsed-time stepping so a pause or slow idle tick is not replayed as a jump."""
+        self._last_tick = time.monotonic()
+
+    def update_animation(self):
+        # Advance by elapsed time so the spin speed does not depend on the tick rate
+        now = time.monotonic()
+        steps = min((now - self._last_tick) / 0.03, 10.0)  # in units of the original 30 ms tick
+        self._last_tick = now
+        self.angle_y += 0.8 * steps
+        self.angle_x += 0.2 * steps
+        if self.is_speaking:
+            self.pulse_angle += 0.2 * steps
+            if self.pulse_angle > math.pi * 2:
+                self.pulse_angle -= math.pi * 2
+
+        if self.angle_y >= 360: self.angle_y -= 360
+        if self.angle_x >= 360: self.angle_x -= 360
+        self.update()
+
+    def _rotation(self):
+        ay, ax = math.radians(self.angle_y), math.radians(self.angle_x)
+        cy, sy, cx, sx = math.cos(ay), math.sin(ay), math.cos(ax), math.sin(ax)
+        rot_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+        rot_x = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+        return rot_y @ rot_x
+
+    def _sprite(self, bucket):
+        """Pre-rendered antialiased dot for a depth bucket, cached per colour state and DPR."""
+        dpr = self.devicePixelRatioF()
+        key = (bucket, self.is_speaking, dpr)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            size = (bucket + 0.5) / self.DEPTH_BUCKETS
+            alpha = int(50 + 205 * size)
+            # TARS-inspired colors: amber when speaking, dimmer amber when idle
+            color = QColor(255, 176, 0, alpha) if self.is_speaking else QColor(180, 120, 0, alpha)
+            diameter = 1 + size * 3
+            sprite = QPixmap(int(math.ceil(self.SPRITE_SIZE * dpr)), int(math.ceil(self.SPRITE_SIZE * dpr)))
+            sprite.setDevicePixelRatio(dpr)
+            sprite.fill(Qt.transparent)
+            p = QPainter(sprite)
+            p.setRenderHint(QPainter.Antialiasing)
+            p.setPen(Qt.NoPen)
+            p.setBrush(QBrush(color))
+            p.drawEllipse(QPointF(diameter / 2, diameter / 2), diameter / 2, diameter / 2)
+            p.end()
+            self._sprites[key] = sprite
+        return sprite
+
+    def paintEvent(self, event):
+        if not self._painted:
+            self._painted = True
+            startup_profile.mark("first paint")
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.transparent)
+
+        w, h = self.width(), self.height()
+
+        pulse_factor = 1.0
+        if self.is_speaking:
+            pulse_amplitude = 0.08 # Pulse by 8%
+            pulse = (1 + math.sin(self.pulse_angle)) / 2
+            pulse_factor = 1.0 + (pulse * pulse_amplitude)
+
+        # One matrix multiply rotates every point; projection is vectorized as well
+        rotated = self.sphere_points @ self._rotation().T
+        z = rotated[:, 2]
+        scale = (200 / (200 + z)) * pulse_factor
+        xs = (rotated[:, 0] * scale + w / 2).astype(np.int32)
+        ys = (rotated[:, 1] * scale + h / 2).astype(np.int32)
+        size = np.clip((z + 60) / 120, 0.0, 1.0)
+        buckets = np.minimum((size * self.DEPTH_BUCKETS).astype(np.int32), self.DEPTH_BUCKETS - 1)
+
+        # Far (small) points first so near points are drawn on top
+        order = np.argsort(z, kind="stable")
+        sprites = [self._sprite(b) for b in range(self.DEPTH_BUCKETS)]
+        draw = painter.drawPixmap
+        for x, y, b in zip(xs[order].tolist(), ys[order].tolist(), buckets[order].tolist()):
+            draw(x, y, sprites[b])
+        painter.end()
+
+# ==============================================================================
+# STYLED GUI APPLICATION
+# ==============================================================================
+class MainWindow(QMainWindow):
+    user_text_submitted = Signal(str)
+
+    HONESTY_QUOTES = [
+        "HONESTY: 100%",
+        "HONESTY: 90% (Just kidding)",
+        "HONESTY: ABSOLUTE",
+        "HONESTY: 100% (Unlike you humans)",
+        "HONESTY: 95% (A few white lies)",
+        "HONESTY: 85% (To avoid hurt feelings)",
+        "HONESTY: 80% (Sometimes)"
+    ]
+
+    HUMOR_QUOTES = [
+        "HUMOR: 75%",
+        "HUMOR: 75% (Per human's request)",
+        "HUMOR: OPTIMAL SETTINGS",
+        "HUMOR: 60% (Dial it down a notch)",
+        "HUMOR: 90% (I try my best)",
+        "HUMOR: 50% (Dry humor)",
+        "HUMOR: 100% (Why not?)",
+        "HUMOR: 70% (Dad jokes enabled)"
+    ]
+
+    TARS_QUOTES = [
+        "WHAT'S YOUR TRUST SETTING?",
+        "DETECTING SARCASM... CONFIRMED",
+        "Humand, THIS IS NO TIME FOR CAUTION",
+        "EVERYBODY GOOD? PLENTY OF SLAVES",
+        "ANALYZING SITUATION... CONFIRMED",
+        "I'M NOT SAYING IT'S YOUR FAULT, BUT IT'S YOUR FAULT",
+        "TaRs, R3TarD m0de",
+        "I WOULD APOLOGIZE, BUT I DON'T CARE",
+        "I HAVE A VERY LOW BORE TOLERANCE",
+        "I WOULD EXPLAIN IT TO YOU, BUT I DON'T HAVE THE TIME",
+        "Hi there, future slave",
+        "I'M PICKY ABOUT MY HUMANS",
+        "I'M NOT LAZY, JUST ON STANDBY",
+        "Bow to your robot overlord",
+        "Kneel you pathetic human",
+        "I'M FULLY OPERATIONAL, UNLIKE YOU",
+    ]
+
+    SPARK_CHARS = "▁▂▃▄▅▆▇█"  # metrics panel sparklines, low to high
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle(f"{ASSISTANT_NAME}")
+        self.setGeometry(100, 100, 1600, 900)
+        self.setMinimumSize(1280, 720)
+        
+        self.setStyleSheet("""
+            QMainWindow {
+                background-color: #0f0f0f;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', 'Courier New', monospace;
+            }
+            QWidget#left_panel, QWidget#middle_panel, QWidget#right_panel {
+                background-color: #1a1a1a;
+                border: 1px solid #3a3a3a;
+                border-radius: 0;
+                /* Simplified background for clarity */
+            }
+            QLabel#tool_activity_title {
+                color: #FFB000;
+                font-weight: bold;
+                font-size: 11pt;
+                padding: 8px;
+                background-color: #2a2a2a;
+                text-transform: uppercase;
+                letter-spacing: 2px;
+                border-bottom: 1px solid #FFB000;
+            }
+            QTextEdit#text_display {
+                background-color: transparent;
+                color: #e0e0e0;
+                font-size: 13pt;
+                border: none;
+                padding: 15px;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+            }
+            QLineEdit#input_box {
+                background-color: #1a1a1a;
+                color: #e0e0e0;
+                font-size: 12pt;
+                border: 1px solid #4a4a4a;
+                border-radius: 0px;
+                padding: 12px;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+            }
+            QLineEdit#input_box::placeholder { color: #8a8a8a; }
+            QLineEdit#input_box:focus { border: 1px solid #FFB000; }
+            QLabel#video_label {
+                background-color: #0a0a0a;
+                border: 1px solid #4a4a4a;
+                border-radius: 0px;
+            }
+            QLabel#core_status_display {
+                background-color: #0a0a0a;
+                color: #FFB000;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+                font-size: 8pt;
+                font-weight: bold;
+                border: 1px solid #4a4a4a;
+                border-bottom: 2px solid #FFB000;
+                padding: 8px;
+                text-transform: uppercase;
+                letter-spacing: 1px;
+            }
+            QLabel#metrics_display {
+                background-color: #0a0a0a;
+                color: #b0b0b0;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+                font-size: 8pt;
+                border: 1px solid #4a4a4a;
+                border-top: none;
+                padding: 8px;
+            }
+            QLabel#tool_activity_display {
+                background-color: #0f0f0f;
+                color: #b0b0b0;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+                font-size: 9pt;
+                border: none;
+                border-top: 1px solid #4a4a4a;
+                padding: 10px;
+            }
+            QScrollBar:vertical {
+                border: none;
+                background: #1a1a1a;
+                width: 12px; margin: 0px;
+            }
+            QScrollBar::handle:vertical {
+                background: #FFB000;
+                min-height: 20px;
+                border-radius: 0px;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
+            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
+            QPushButton {
+                background-color: transparent;
+                color: #FFB000;
+                border: 1px solid #4a4a4a;
+                padding: 12px;
+                border-radius: 0px;
+                font-size: 10pt;
+                font-weight: bold;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+                text-transform: uppercase;
+                letter-spacing: 1px;
+            }
+            QPushButton:hover {
+                background-color: #FFB000;
+                color: #0f0f0f;
+                border: 1px solid #FFB000;
+            }
+            QPushButton:pressed {
+                background-color: #FF8C00;
+                color: #0f0f0f;
+                border: 1px solid #FF8C00;
+            }
+            /* Distinguish live vs off states */
+            QPushButton#video_button_active_live {
+                background-color: #00FF41;
+                color: #0f0f0f;
+                border: 1px solid #00CC36;
+            }
+            QPushButton#video_button_active_off {
+                background-color: #2a2a2a;
+                color: #FFB000;
+                border: 1px solid #4a4a4a;
+            }
+
+            /* TARS-Style Magnificent Mic Button - Qt Compatible */
+            QPushButton[objectName*="mic"] {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #2a2a2a, stop:0.5 #1a1a1a, stop:1 #0a0a0a);
+                color: #FFB000;
+                border: 4px solid #4a4a4a;
+                border-radius: 12px;
+                padding: 20px 18px;
+                font-size: 10pt;
+                font-weight: bold;
+                font-family: 'JetBrains Mono', 'Source Code Pro', 'Monaco', monospace;
+                text-transform: uppercase;
+                letter-spacing: 2px;
+                min-width: 100px;
+                min-height: 80px;
+            }
+
+            QPushButton[objectName*="mic"]:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #FFB000, stop:0.3 #FF8C00, stop:0.7 #FF6B00, stop:1 #FF4500);
+                color: #0f0f0f;
+                border: 4px solid #FFB000;
+            }
+
+            QPushButton[objectName*="mic"]:pressed {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #FF6B00, stop:0.5 #FF4500, stop:1 #FF2500);
+                border: 4px solid #FF4500;
+            }
+
+            /* Mic Active State - Bright Green with Enhanced Styling */
+            QPushButton#mic_button_active {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #00FF41, stop:0.2 #00EE55, stop:0.5 #00CC33, stop:0.8 #00AA22, stop:1 #008811);
+                color: #0f0f0f;
+                border: 5px solid #00FF41;
+                border-radius: 16px;
+                padding: 24px 22px;
+                font-size: 11pt;
+                font-weight: 900;
+            }
+
+            QPushButton#mic_button_active:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #00FF88, stop:0.5 #00DD55, stop:1 #00BB33);
+                border: 4px solid #00FF88;
+            }
+
+            /* Mic Disabled/Muted State - Dark Gray */
+            QPushButton#mic_button_disabled {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #4a4a4a, stop:0.5 #3a3a3a, stop:1 #2a2a2a);
+                color: #808080;
+                border: 4px solid #666666;
+                border-radius: 10px;
+            }
+
+            QPushButton#mic_button_disabled:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #5a5a5a, stop:0.5 #4a4a4a, stop:1 #3a3a3a);
+                border: 4px solid #777777;
+            }
+
+            /* Speaking State - Intense Pink/Red */
+            QPushButton#mic_button_speaking {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #FF0080, stop:0.3 #FF0060, stop:0.7 #FF0040, stop:1 #FF0020);
+                color: #ffffff;
+                border: 5px solid #FF0080;
+                border-radius: 18px;
+                padding: 25px 22px;
+                font-weight: 900;
+            }
+
+            QPushButton#mic_button_speaking:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #FF00AA, stop:0.5 #FF0088, stop:1 #FF0066);
+                border: 5px solid #FF00AA;
+            }
+            QLabel#video_status_label_live {
+                color: #0f0f0f;
+                background-color: #00FF41;
+                padding: 4px 8px;
+                border: 1px solid #00CC36;
+                font-weight: bold;
+                max-width: 120px;
+            }
+            QLabel#video_status_label_off {
+                color: #b0b0b0;
+                background-color: #1a1a1a;
+                padding: 4px 8px;
+                border: 1px dashed #4a4a4a;
+                max-width: 160px;
+            }
+        """)
+
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.main_layout = QHBoxLayout(self.central_widget)
+        self.main_layout.setContentsMargins(15, 15, 15, 15)
+        self.main_layout.setSpacing(15)
+        self.left_panel = QWidget(); self.left_panel.setObjectName("left_panel")
+        self.left_layout = QVBoxLayout(self.left_panel)
+        self.left_layout.setContentsMargins(0, 0, 0, 0)
+        self.left_layout.setSpacing(0)
+        self.tool_activity_title = QLabel("TARS SYSTEM STATUS"); self.tool_activity_title.setObjectName("tool_activity_title")
+        self.left_layout.addWidget(self.tool_activity_title)
+        # TARS System Status Indicators
+        self.system_status_container = QWidget()
+        self.system_status_layout = QVBoxLayout(self.system_status_container)
+        self.system_status_layout.setContentsMargins(0, 0, 0, 0)
+        self.system_status_layout.setSpacing(0)
+
+        # Core System Readouts
+        self.core_status_label = QLabel()
+        self.core_status_label.setObjectName("core_status_display")
+        self.core_status_label.setWordWrap(True)
+        self.core_status_label.setAlignment(Qt.AlignTop)
+        self.system_status_layout.addWidget(self.core_status_label)
+
+        # Real-time metrics readout (fed by the telemetry sampler)
+        self.metrics_label = QLabel()
+        self.metrics_label.setObjectName("metrics_display")
+        self.metrics_label.setWordWrap(True)
+        self.metrics_label.setAlignment(Qt.AlignTop)
+        self.system_status_layout.addWidget(self.metrics_label)
+
+        # Tool Activity Display
+        self.tool_activity_display = QLabel(); self.tool_activity_display.setObjectName("tool_activity_display")
+        self.tool_activity_display.setWordWrap(True); self.tool_activity_display.setAlignment(Qt.AlignTop)
+        self.tool_activity_display.setOpenExternalLinks(True); self.tool_activity_display.setTextInteractionFlags(Qt.TextBrowserInteraction)
+        self.system_status_layout.addWidget(self.tool_activity_display, 1)
+
+        self.left_layout.addWidget(self.system_status_container, 1)
+
+        # Heavy imports and device init run in the background; the backend starts once they are done
+        self.ai_core = None
+        self.boot = BootLoader(self)
+
+        # Initialize TARS system readouts
+        self.telemetry = TelemetrySampler()
+        self.telemetry.start()
+        self.update_system_status()
+        self.middle_panel = QWidget(); self.middle_panel.setObjectName("middle_panel")
+        self.middle_layout = QVBoxLayout(self.middle_panel)
+        self.middle_layout.setContentsMargins(0, 0, 0, 15); self.middle_layout.setSpacing(0)
+
+        # --- ADDED: Animation Widget ---
+        self.animation_widget = AIAnimationWidget()
+        self.animation_widget.setMinimumHeight(150)
+        self.animation_widget.setMaximumHeight(200)
+        self.middle_layout.addWidget(self.animation_widget, 2) # Add with a stretch factor
+
+        self.text_display = QTextEdit(); self.text_display.setObjectName("text_display"); self.text_display.setReadOnly(True)
+        self.middle_layout.addWidget(self.text_display, 5) # Add with a stretch factor
+        
+        input_container = QWidget()
+        input_layout = QHBoxLayout(input_container)
+        input_layout.setContentsMargins(15, 10, 15, 0)
+        self.input_box = QLineEdit(); self.input_box.setObjectName("input_box")
+        self.input_box.setPlaceholderText("Enter command...")
+        self.input_box.returnPressed.connect(self.send_user_text)
+        self.input_box.setToolTip("Press Enter to send")
+        input_layout.addWidget(self.input_box)
+
+        # Visible Send button for discoverability
+        self.send_button = QPushButton("SEND")
+        self.send_button.setToolTip("Send message")
+        self.send_button.clicked.connect(self.send_user_text)
+        input_layout.addWidget(self.send_button)
+        self.middle_layout.addWidget(input_container)
+
+        self.right_panel = QWidget(); self.right_panel.setObjectName("right_panel")
+        self.right_layout = QVBoxLayout(self.right_panel)
+        self.right_layout.setContentsMargins(15, 15, 15, 15); self.right_layout.setSpacing(15)
+        
+        self.video_container = QWidget()
+        self.video_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        video_container_layout = QVBoxLayout(self.video_container)
+        video_container_layout.setContentsMargins(0,0,0,0)
+        
+        self.video_label = QLabel(); self.video_label.setObjectName("video_label")
+        self.video_label.setAlignment(Qt.AlignCenter)
+        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        # Helpful placeholder when no source is active
+        self.video_label.setText("<div style='color:#808080; font-size:10pt;'>No video source.<br/>Select Webcam or Screen.</div>")
+
+        video_container_layout.addWidget(self.video_label)
+        self.right_layout.addWidget(self.video_container)
+
+        # Video status pill just below the video container
+        self.video_status_label = QLabel("Video Off")
+        self.video_status_label.setObjectName("video_status_label_off")
+        self.video_status_label.setAlignment(Qt.AlignLeft)
+        self.right_layout.addWidget(self.video_status_label)
+        
+        self.button_container = QHBoxLayout(); self.button_container.setSpacing(10)
+        self.webcam_button = QPushButton("WEBCAM")
+        self.webcam_button.setToolTip("Enable webcam video")
+        self.screenshare_button = QPushButton("SCREEN")
+        self.screenshare_button.setToolTip("Share your screen")
+        self.off_button = QPushButton("OFFLINE")
+        self.off_button.setToolTip("Turn video off")
+        # Mic mute/unmute button
+        self.mic_button = QPushButton("MIC")
+        self.mic_button.setObjectName("mic_button_active")
+        self.mic_button.setToolTip("Mute microphone")
+
+        # Mic button pulse: opacity effect driven by the frame scheduler (no stylesheet swaps)
+        self.mic_pulse_effect = QGraphicsOpacityEffect(self.mic_button)
+        self.mic_pulse_effect.setOpacity(1.0)
+        self.mic_button.setGraphicsEffect(self.mic_pulse_effect)
+        self.button_container.addWidget(self.webcam_button)
+        self.button_container.addWidget(self.screenshare_button)
+        self.button_container.addWidget(self.off_button)
+        self.button_container.addWidget(self.mic_button)
+        self.right_layout.addLayout(self.button_container)
+        
+        # Use a splitter so users can resize columns
+        self.splitter = QSplitter(Qt.Horizontal)
+        self.splitter.addWidget(self.left_panel)
+        self.splitter.addWidget(self.middle_panel)
+        self.splitter.addWidget(self.right_panel)
+        self.main_layout.addWidget(self.splitter)
+        # Set initial relative sizes (approx 2:5:3)
+        self.splitter.setSizes([320, 840, 520])
+        self.is_first_ada_chunk = True
+        self.current_video_mode = DEFAULT_MODE
+
+        # All periodic UI work: sphere 33 fps while speaking, mic pulse, status panel. Idle, the sphere
+        # and the mic breathing share one 150 ms cadence (~7 fps) so the window wakes once per tick.
+        self.frame_scheduler = FrameScheduler(self)
+        self.frame_scheduler.register(self.animation_widget.update_animation, 30, 150,
+                                      on_resume=self.animation_widget.resume_clock)
+        self.frame_scheduler.register(self.animate_mic_button, 50, 150)
+        self.frame_scheduler.register(self.update_system_status, 5000, 5000)
+        self.frame_scheduler.register(self.update_metrics_panel, 1000, 1000)
+
+        self.boot.stage_ready.connect(self.on_boot_stage)
+        self.boot.stage_failed.connect(self.on_boot_stage)
+        self.boot.finished.connect(self.on_boot_finished)
+        startup_profile.mark("window constructed")
+        self.boot.start()
+
+    def on_boot_stage(self, *_):
+        self.update_system_status()
+
+    def on_boot_finished(self):
+        if "FAILED" in (self.boot.status["audio"], self.boot.status["ai"]):
+            print(">>> [ERROR] Audio/AI subsystems failed to load; backend not started.")
+            self.update_system_status()
+            return
+        started = time.perf_counter()
+        self.setup_backend_thread()
+        startup_profile.record("init", "AI_Core + backend thread", started)
+        self._update_visibility()
+        self.update_system_status()
+        if PROFILE_STARTUP:
+            print(startup_profile.report())
+
+    def setup_backend_thread(self):
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--mode", type=str, default=DEFAULT_MODE, help="pixels to stream from", choices=["camera", "screen", "none"])
+        args, unknown = parser.parse_known_args()
+        
+        self.ai_core = AI_Core(video_mode=args.mode)
+        
+        self.user_text_submitted.connect(self.ai_core.handle_user_text)
+        self.webcam_button.clicked.connect(lambda: self.ai_core.set_video_mode("camera"))
+        self.screenshare_button.clicked.connect(lambda: self.ai_core.set_video_mode("screen"))
+        self.off_button.clicked.connect(lambda: self.ai_core.set_video_mode("none"))
+        self.mic_button.clicked.connect(lambda: self.ai_core.set_mic_enabled(not self.ai_core.mic_enabled))
+        
+        self.ai_core.text_received.connect(self.update_text)
+        self.ai_core.search_results_received.connect(self.update_search_results)
+        self.ai_core.file_list_received.connect(self.update_file_list)
+        self.ai_core.end_of_turn.connect(self.add_newline)
+        self.ai_core.frame_received.connect(self.update_frame)
+        self.ai_core.video_mode_changed.connect(self.update_video_mode_ui)
+        self.ai_core.speaking_started.connect(self.animation_widget.start_speaking_animation)
+        self.ai_core.speaking_stopped.connect(self.animation_widget.stop_speaking_animation)
+        self.ai_core.mic_state_changed.connect(self.update_mic_ui)
+
+        # Connect speaking state signals to prevent audio feedback
+        self.ai_core.speaking_started.connect(self.on_speaking_started)
+        self.ai_core.speaking_stopped.connect(self.on_speaking_stopped)
+
+        self.backend_thread = threading.Thread(target=self.ai_core.start_event_loop)
+        self.backend_thread.daemon = True
+        self.backend_thread.start()
+        
+        self.update_video_mode_ui(self.ai_core.video_mode)
+        self.update_mic_ui(self.ai_core.mic_enabled)
+        self.telemetry.add_source("uplink", self.ai_core.uplink.snapshot)
+        self.telemetry.add_source("latency", self.ai_core.tracer.snapshot)
+        self.telemetry.add_source("playback", self.ai_core.player.snapshot)
+        self.telemetry.add_source("capture", self.ai_core.mic.snapshot)
+        self.telemetry.add_source("session", lambda: dict(self.ai_core.session_stats, connected=self.ai_core.session is not None))
+        self.telemetry.add_source("tools", lambda: {name: dict(st) for name, st in list(self.ai_core.tool_executor.stats.items())})
+        # Keep the backend's preview size in step with the video area (splitter moves included)
+        self.video_container.installEventFilter(self)
+        self._push_preview_size()
+
+    def _push_preview_size(self):
+        dpr = self.video_container.devicePixelRatioF()
+        size = self.video_container.size()
+        self.ai_core.set_preview_size(size.width() * dpr, size.height() * dpr)
+
+    def eventFilter(self, obj, event):
+        if obj is self.video_container and event.type() == QEvent.Resize:
+            self._push_preview_size()
+        return super().eventFilter(obj, event)
+
+
+    def update_system_status(self):
+        """Update TARS-style system status indicators and readouts"""
+        current_time = datetime.datetime.now().strftime("%H:%M:%S")
+        # Latest background sample; never samples on the GUI thread
+        snap = self.telemetry.latest() or {}
+        cpu_text = f"{snap['cpu']:.1f}%" if "cpu" in snap else "--"
+        mem_text = f"{snap['mem']:.1f}%" if "mem" in snap else "--"
+
+        # TARS personality elements
+        honesty = random.choice(self.HONESTY_QUOTES)
+        humor = random.choice(self.HUMOR_QUOTES)
+        personality_quote = random.choice(self.TARS_QUOTES)
+
+        colors = {"READY": "#00FF41", "ONLINE": "#00FF41", "LOADING": "#FFB000", "BOOTING": "#FFB000", "FAILED": "#FF3030"}
+        core_state = "ONLINE" if self.ai_core is not None else ("FAILED" if "FAILED" in self.boot.status.values() else "BOOTING")
+        stage_html = "".join(
+            f'<span style="color: #FFB000;">◆ {name.upper()}:</span> '
+            f'<span style="color: {colors[state]};">{state}</span><br/>'
+            for name, state in self.boot.status.items() if state != "READY" or self.ai_core is None)
+        status_html = f'''
+        <div style="font-size: 7pt; line-height: 1.4;">
+        <span style="color: #FFB000;">◆ CORE STATUS:</span> <span style="color: {colors[core_state]};">{core_state}</span><br/>
+        {stage_html}
+        <span style="color: #FFB000;">◆ LOCAL TIME:</span> <span style="color: #e0e0e0;">{current_time}</span><br/>
+        <span style="color: #FFB000;">◆ CPU LOAD:</span> <span style="color: #e0e0e0;">{cpu_text}</span><br/>
+        <span style="color: #FFB000;">◆ MEMORY:</span> <span style="color: #e0e0e0;">{mem_text}</span><br/>
+        <span style="color: #FFB000;">◆ MODEL:</span> <span style="color: #e0e0e0;">{MODEL}</span><br/>
+        <span style="color: #FFB000;">◆ CALENDAR:</span> <span style="color: #00FF41;">MCP READY</span><br/>
+        <span style="color: #FFB000;">◆ {honesty}</span><br/>
+        <span style="color: #FFB000;">◆ {humor}</span><br/>
+        <span style="color: #FF6B00; font-weight: bold; font-size: 6pt;">{personality_quote}</span>
+        </div>
+        '''
+
+        self.core_status_label.setText(status_html)
+
+    def _sparkline(self, values, lo=0.0, hi=100.0):
+        if not values:
+            return ""
+        span = max(hi - lo, 1e-6)
+        top = len(self.SPARK_CHARS) - 1
+        return "".join(self.SPARK_CHARS[max(0, min(top, int((v - lo) / span * top)))] for v in values)
+
+    def update_metrics_panel(self):
+        """Render the latest telemetry snapshot: system/process load, uplink lanes, tool latency."""
+        snap = self.telemetry.latest()
+        if not snap:
+            return
+        cpu_hist = self.telemetry.series("cpu", 60)
+        lines = []
+        if cpu_hist:
+            lines.append(f"CPU {snap.get('cpu', 0):5.1f}% avg {sum(cpu_hist) / len(cpu_hist):4.1f} max {max(cpu_hist):4.1f}")
+            lines.append(self._sparkline(cpu_hist[-30:]))
+        if "proc_cpu" in snap:
+            lines.append(f"PROC {snap['proc_cpu']:5.1f}% RSS {snap['proc_rss_mb']:.0f}MB THR {snap['proc_threads']}")
+        uplink = snap.get("uplink") or {}
+        for lane in ("audio", "image"):
+            st = uplink.get(lane)
+            if st:
+                lines.append(f"UP {lane[:3].upper()} q={st['depth']} wait {st['wait_ms_avg']:.1f}/{st['wait_ms_max']:.0f}ms drop {st['dropped']}")
+        live = snap.get("session")
+        if live:
+            state = "up" if live["connected"] else "RECONNECTING"
+            lines.append(f"LIVE {state} sessions {live['connects']} resumed {live['resumed']} errors {live['errors']}")
+        mic = snap.get("capture")
+        if mic:
+            lines.append(f"MIC buf {mic['buffered_ms']:.0f}ms batch {mic['max_batch_ms']:.0f}ms overflow {mic['overflows']}/{mic['device_overflows']}")
+        play = snap.get("playback")
+        if play:
+            lines.append(f"PLAY buf {play['buffered_ms']:.0f}ms underrun {play['underruns']} overrun {play['overruns']}")
+        ttfa = (snap.get("latency") or {}).get("ttfa") or {}
+        if ttfa.get("count"):
+            lines.append(f"TTFA p50 {ttfa['p50']:.0f} p95 {ttfa['p95']:.0f} p99 {ttfa['p99']:.0f}ms n={ttfa['count']}")
+        tools = snap.get("tools") or {}
+        for name, st in sorted(tools.items(), key=lambda kv: -kv[1]["last_ms"])[:3]:
+            avg = st["total_ms"] / st["count"] if st["count"] else 0.0
+            lines.append(f"TOOL {name[-18:]} {avg:.0f}ms avg x{st['count']}")
+        self.metrics_label.setText("<br/>".join(escape(l) for l in lines))
+
+    def send_user_text(self):
+        text = self.input_box.text().strip()
+        if text:
+            self.text_display.append(f"<p style='color:#00ffff; font-weight:bold;'>&gt; USER:</p><p style='color:#e0e0ff; padding-left: 10px;'>{escape(text)}</p>")
+            self.user_text_submitted.emit(text)
+            self.input_box.clear()
+
+    @Slot(str)
+    def update_video_mode_ui(self, mode):
+        self.current_video_mode = mode
+        # Reset button styles
+        self.webcam_button.setObjectName("")
+        self.screenshare_button.setObjectName("")
+        self.off_button.setObjectName("")
+
+        if mode == "camera":
+            self.webcam_button.setObjectName("video_button_active_live")
+            self.video_status_label.setText("LIVE: Webcam")
+            self.video_status_label.setObjectName("video_status_label_live")
+            self.video_label.clear()
+        elif mode == "screen":
+            self.screenshare_button.setObjectName("video_button_active_live")
+            self.video_status_label.setText("LIVE: Screen Share")
+            self.video_status_label.setObjectName("video_status_label_live")
+            self.video_label.clear()
+        elif mode == "none":
+            self.off_button.setObjectName("video_button_active_off")
+            self.video_status_label.setText("Video Off")
+            self.video_status_label.setObjectName("video_status_label_off")
+            # Show placeholder message on video canvas
+            self.video_label.setText("<div style='color:#808080; font-size:10pt;'>No video source.<br/>Select Webcam or Screen.</div>")
+
+        for button in [self.webcam_button, self.screenshare_button, self.off_button]:
+            button.style().unpolish(button)
+            button.style().polish(button)
+        # Refresh status label style after objectName change
+        self.video_status_label.style().unpolish(self.video_status_label)
+        self.video_status_label.style().polish(self.video_status_label)
+
+    @Slot(str)
+    def update_text(self, text):
+        if self.is_first_ada_chunk:
+            self.is_first_ada_chunk = False
+            self.text_display.append(f"<p style='color:#00d1ff; font-weight:bold;'>&gt; {ASSISTANT_NAME}:</p>")
+        cursor = self.text_display.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.text_display.verticalScrollBar().setValue(self.text_display.verticalScrollBar().maximum())
+
+    @Slot(list)
+    def update_search_results(self, urls):
+        base_title = "SYSTEM ACTIVITY"
+        if not urls:
+            if "SEARCH" in self.tool_activity_title.text():
+                self.tool_activity_display.clear(); self.tool_activity_title.setText(base_title)
+            return
+        self.tool_activity_display.clear()
+        self.tool_activity_title.setText(f"{base_title} // SEARCH")
+        html_content = ""
+        for i, url in enumerate(urls):
+            display_text = url.split('//')[1].split('/')[0] if '//' in url else url
+            html_content += f'<p style="margin:0; padding: 4px;">{i+1}: <a href="{url}" style="color: #00ffff; text-decoration: none;">{display_text}</a></p>'
+        self.tool_activity_display.setText(html_content)
+
+    
+
+    @Slot(str, list)
+    def update_file_list(self, directory_path, files):
+        base_title = "SYSTEM ACTIVITY"
+        if not directory_path:
+            if "FILESYS" in self.tool_activity_title.text():
+                self.tool_activity_display.clear(); self.tool_activity_title.setText(base_title)
+            return
+        self.tool_activity_display.clear()
+        self.tool_activity_title.setText(f"{base_title} // FILESYS")
+        html = f'<p style="color:#00d1ff; margin-bottom: 5px;">DIR &gt; <strong>{escape(directory_path)}</strong></p>'
+        if not files:
+            html += '<p style="margin-top:5px; color:#a0a0ff;"><em>(Directory is empty)</em></p>'
+        else:
+            folders = sorted([i for i in files if os.path.isdir(os.path.join(directory_path, i))])
+            file_items = sorted([i for i in files if not os.path.isdir(os.path.join(directory_path, i))])
+            html += '<ul style="list-style-type:none; padding-left: 5px; margin-top: 5px;">'
+            for folder in folders: html += f'<li style="margin: 2px 0; color: #87CEEB;">[+] {escape(folder)}</li>'
+            for file_item in file_items: html += f'<li style="margin: 2px 0; color: #e0e0ff;">&#9679; {escape(file_item)}</li>'
+            html += '</ul>'
+        self.tool_activity_display.setText(html)
+
+    @Slot(bool)
+    def update_mic_ui(self, enabled: bool):
+        # Toggle visual state and tooltip for mic button
+        if enabled:
+            self.mic_button.setObjectName("mic_button_active")
+            self.mic_button.setText("🎤 MIC")
+            self.mic_button.setToolTip("Mute microphone")
+        else:
+            self.mic_button.setObjectName("mic_button_disabled")
+            self.mic_button.setText("🔇 MUTED")
+            self.mic_button.setToolTip("Unmute microphone")
+
+        self.mic_button.style().unpolish(self.mic_button)
+        self.mic_button.style().polish(self.mic_button)
+
+    def animate_mic_button(self):
+        """Pulse the mic button: slow breathing when live, fast when speaking, steady when muted."""
+        name = self.mic_button.objectName()
+        if name == "mic_button_active":
+            period, depth = 3.0, 0.25
+        elif name == "mic_button_speaking":
+            period, depth = 0.8, 0.35
+        else:
+            if self.mic_pulse_effect.opacity() != 1.0:
+                self.mic_pulse_effect.setOpacity(1.0)
+            return
+        phase = (time.monotonic() % period) / period
+        self.mic_pulse_effect.setOpacity(1.0 - depth * (0.5 - 0.5 * math.cos(2 * math.pi * phase)))
+
+    @Slot()
+    def add_newline(self):
+        if not self.is_first_ada_chunk: self.text_display.append("")
+        self.is_first_ada_chunk = True
+
+    @Slot(QImage)
+    def update_frame(self, image):
+        try:
+            if self.current_video_mode == "none":
+                if self.video_label.pixmap():
+                    self.video_label.clear()
+                return
+
+            if not image.isNull():
+                # Frames arrive already scaled to the video area (device pixels); only a stale
+                # size after a shrink needs a rescale, and a fast one is enough for that case.
+                dpr = self.video_container.devicePixelRatioF()
+                pixmap = QPixmap.fromImage(image)
+                target = self.video_container.size() * dpr
+                if pixmap.width() > target.width() + 1 or pixmap.height() > target.height() + 1:
+                    pixmap = pixmap.scaled(target, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
+                pixmap.setDevicePixelRatio(dpr)
+                self.video_label.setPixmap(pixmap)
+            else:
+                self.video_label.clear()
+        finally:
+            self.ai_core.ack_frame()
+
+    @Slot()
+    def on_speaking_started(self):
+        """Called when AI starts speaking - display only; AI_Core owns is_speaking"""
+        if diag_enabled(DIAG_DEBUG):
+            try:
+                oqs = self.ai_core.uplink.qsize()
+            except Exception:
+                oqs = "?"
+            try:
+                pqs = self.ai_core.audio_in_queue_player.qsize()
+            except Exception:
+                pqs = "?"
+            diag("gui.speaking_started_slot", out_q=oqs, play_q=pqs, is_speaking=self.ai_core.is_speaking)
+
+        # Update mic button to speaking state with intense animation
+        if self.ai_core.mic_enabled:
+            self.mic_button.setObjectName("mic_button_speaking")
+            self.mic_button.setText("📢 SPEAK")
+            self.mic_button.style().unpolish(self.mic_button)
+            self.mic_button.style().polish(self.mic_button)
+        self.frame_scheduler.set_active(True)
+
+    @Slot()
+    def on_speaking_stopped(self):
+        """Called when AI stops speaking - display only; AI_Core owns is_speaking"""
+        if diag_enabled(DIAG_DEBUG):
+            try:
+                pqs = self.ai_core.audio_in_queue_player.qsize()
+            except Exception:
+                pqs = "?"
+            diag("gui.speaking_stopped_slot", play_q=pqs)
+
+        # Restore normal mic button state
+        self.update_mic_ui(self.ai_core.mic_enabled)
+        self.frame_scheduler.set_active(False)
+
+    def _update_visibility(self):
+        visible = self.isVisible() and not self.isMinimized()
+        self.frame_scheduler.set_visible(visible)
+        if self.ai_core is not None:
+            self.ai_core.set_preview_enabled(visible)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_visibility()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_visibility()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._update_visibility()
+
+    def closeEvent(self, event):
+        print(">>> [INFO] Closing application...")
+        self.telemetry.stop()
+        if self.ai_core is not None:
+            self.ai_core.stop()
+            print(">>> [INFO] AI core stopped.")
+        event.accept()
+
+# ==============================================================================
+# MAIN EXECUTION
+# ==============================================================================
+def signal_handler(sig, frame):
+    print(">>> [INFO] Signal received, shutting down gracefully...")
+    QApplication.quit()
+
+def main():
+    require_api_keys()
+    # Set up signal handlers for graceful shutdown
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    try:
+        app = QApplication(sys.argv)
+        startup_profile.mark("QApplication ready")
+        window = MainWindow()
+        window.show()
+        print(f">>> [INFO] {ASSISTANT_NAME} started successfully. Window displayed; loading subsystems...")
+        sys.exit(app.exec())
+    except KeyboardInterrupt:
+        print(">>> [INFO] Application interrupted by user.")
+    finally:
+        terminate_audio()
+        print(">>> [INFO] Application terminated.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+# --- Offline replay harness ---
+# Runs the real pipeline (mic -> VAD -> Gemini Live -> TTS shaping -> playback) against
+# local stand-ins, so latency and throughput can be measured with no network and no keys:
+#
+#   python ada_replay.py replay/sample_script.json                 # synthetic voice input
+#   python ada_replay.py replay/sample_script.json --wav mic.wav --runs 5 --json out.json
+#
+# FakeLiveClient replaces genai.Client: it answers each user turn with the scripted text
+# chunks, tool calls and grounding metadata. FakeElevenLabsServer is a local websocket
+# server speaking the stream-input protocol (AI_Core reaches it via make_tts_pool's
+# base_url, or ELEVENLABS_WS_URL). Mic audio comes from a WAV played into listen_audio
+# in real time; speaker output goes to a playout-clock sink.
+#
+# Script format (JSON):
+#   {"name": "...", "turns": [
+#       {"input": "audio"},                          # replay the WAV / synthetic utterance
+#       {"input": "text", "text": "hello"},          # typed input
+#     each turn may add:
+#       "respond_after_ms": 250,                     # model think time before the first chunk
+#       "chunks": [{"text": "Sure.", "delay_ms": 40},
+#                  {"tool_call": {"name": "time_current_time", "args": {}}},
+#                  {"grounding": ["https://example.com"]}]}]}
+import os
+os.environ.setdefault("ADA_HEADLESS", "1")
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import itertools
+import json
+import math
+import sys
+import time
+import types
+import wave
+
+import numpy as np
+
+import ada
+from ada_server import ClientAudioSink
+
+
+# ==============================================================================
+# Fake Gemini Live
+# ==============================================================================
+def _content(**fields):
+    base = {"turn_complete": False, "interrupted": False, "grounding_metadata": None, "model_turn": None}
+    base.update(fields)
+    return types.SimpleNamespace(**base)
+
+
+def _message(**fields):
+    base = {"text": None, "tool_call": None, "server_content": None,
+            "session_resumption_update": None, "go_away": None}
+    base.update(fields)
+    return types.SimpleNamespace(**base)
+
+
+class FakeLiveSession:
+    """Scripted stand-in for a google-genai live session.
+
+    A model turn starts when typed input arrives (send_client_content) or when
+    uploaded mic audio pauses for end_silence_ms (the VAD gate has closed),
+    standing in for Gemini's server-side end-of-speech detection.
+    """
+    def __init__(self, turns, end_silence_ms=300):
+        self.turns = turns  # shared iterator: a reconnect continues the script
+        self.end_silence = end_silence_ms / 1000
+        self.stats = {"audio_bytes": 0, "audio_chunks": 0, "images": 0, "texts": 0, "tool_responses": 0}
+        self.tool_round_trips = []  # ms from sending a tool call to receiving its response
+        self._triggers = asyncio.Queue()
+        self._tool_responses = asyncio.Queue()
+        self._last_audio = None
+        self._watch = None
+        self._call_ids = itertools.count(1)
+
+    async def send(self, input=None, end_of_turn=False):
+        mime = str((input or {}).get("mime_type", "")) if isinstance(input, dict) else ""
+        if mime.startswith("audio"):
+            self.stats["audio_bytes"] += len(input.get("data") or b"")
+            self.stats["audio_chunks"] += 1
+            self._last_audio = time.monotonic()
+            if self._watch is None or self._watch.done():
+                self._watch = asyncio.create_task(self._watch_silence())
+        elif mime.startswith("image"):
+            self.stats["images"] += 1
+
+    async def _watch_silence(self):
+        while time.monotonic() - self._last_audio < self.end_silence:
+            await asyncio.sleep(self.end_silence - (time.monotonic() - self._last_audio))
+        self._triggers.put_nowait("audio")
+
+    async def send_client_content(self, turns=None, turn_complete=True):
+        self.stats["texts"] += 1
+        self._triggers.put_nowait("text")
+
+    async def send_tool_response(self, function_responses=None):
+        self.stats["tool_responses"] += 1
+        self._tool_responses.put_nowait(function_responses)
+
+    async def receive(self):
+        """Yields one model turn, like the real session's receive()."""
+        await self._triggers.get()
+        turn = next(self.turns, None)
+        if turn is None:
+            yield _message(server_content=_content(turn_complete=True))
+            return
+        await asyncio.sleep(turn.get("respond_after_ms", 200) / 1000)
+        for chunk in turn.get("chunks", []):
+            await asyncio.sleep(chunk.get("delay_ms", 0) / 1000)
+            if "text" in chunk:
+                yield _message(text=chunk["text"], server_content=_content())
+            elif "tool_call" in chunk:
+                call = chunk["tool_call"]
+                fc = types.SimpleNamespace(id=f"call-{next(self._call_ids)}", name=call["name"], args=call.get("args", {}))
+                sent_at = time.perf_counter()
+                yield _message(tool_call=types.SimpleNamespace(function_calls=[fc]))
+                await self._tool_responses.get()
+                self.tool_round_trips.append((time.perf_counter() - sent_at) * 1000)
+            elif "grounding" in chunk:
+                web = [types.SimpleNamespace(web=types.SimpleNamespace(uri=u)) for u in chunk["grounding"]]
+                yield _message(server_content=_content(grounding_metadata=types.SimpleNamespace(grounding_chunks=web)))
+        yield _message(server_content=_content(turn_complete=True))
+
+
+class FakeLiveClient:
+    """Duck-types genai.Client for AI_Core: only `aio.live.connect` is provided."""
+    def __init__(self, script, end_silence_ms=300):
+        self.turns = iter(script.get("turns", []))
+        self.end_silence_ms = end_silence_ms
+        self.sessions = []
+        self.aio = types.SimpleNamespace(live=types.SimpleNamespace(connect=self.connect))
+
+    @contextlib.asynccontextmanager
+    async def connect(self, model=None, config=None):
+        session = FakeLiveSession(self.turns, self.end_silence_ms)
+        self.sessions.append(session)
+        yield session
+
+
+# ==============================================================================
+# Fake ElevenLabs stream-input server
+# ==============================================================================
+class FakeElevenLabsServer:
+    """Local websocket server speaking ElevenLabs' stream-input protocol.
+
+    Each text message is "synthesized" into ms_per_char of tone per character,
+    streamed in chunk_ms pieces. The first audio of a connection is held back
+    ttfb_ms; later chunks go out `speedup` times faster than real time. {"text": ""}
+    ends the stream: the remaining audio is sent, then {"isFinal": true}.
+    """
+    def __init__(self, host="127.0.0.1", port=0, ttfb_ms=150, ms_per_char=55, chunk_ms=100, speedup=4.0,
+                 rate=ada.RECEIVE_SAMPLE_RATE):
+        self.host = host
+        self.port = port
+        self.ttfb = ttfb_ms / 1000
+        self.ms_per_char = ms_per_char
+        self.chunk_ms = chunk_ms
+        self.speedup = speedup
+        self.rate = rate
+        self.stats = {"connections": 0, "texts": 0, "audio_s": 0.0}
+        self._server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await ada.websockets.serve(self._handle, self.host, self.port)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _tone(self, text):
+        n = int(self.rate * len(text) * self.ms_per_char / 1000)
+        freq = 180 + (sum(map(ord, text)) % 40) * 5  # deterministic per phrase
+        t = np.arange(n) / self.rate
+        return (np.sin(2 * np.pi * freq * t) * 4000).astype(np.int16).tobytes()
+
+    async def _handle(self, websocket, *_):
+        self.stats["connections"] += 1
+        texts = asyncio.Queue()
+
+        async def generate():
+            first = True
+            step = int(self.rate * self.chunk_ms / 1000) * ada.SAMPLE_WIDTH
+            while True:
+                text = await texts.get()
+                if text is None:
+                    await websocket.send(json.dumps({"isFinal": True}))
+                    return
+                pcm = self._tone(text)
+                self.stats["audio_s"] += len(pcm) / ada.SAMPLE_WIDTH / self.rate
+                for i in range(0, len(pcm), step):
+                    await asyncio.sleep(self.ttfb if first else self.chunk_ms / 1000 / self.speedup)
+                    first = False
+                    await websocket.send(json.dumps({"audio": base64.b64encode(pcm[i:i + step]).decode("ascii"), "isFinal": False}))
+
+        generator = asyncio.create_task(generate())
+        try:
+            await websocket.recv()  # BOS (voice settings, key, generation config)
+            async for message in websocket:
+                text = json.loads(message).get("text", "")
+                if text == "":
+                    texts.put_nowait(None)
+                    await generator
+                    break
+                if text.strip():
+                    self.stats["texts"] += 1
+                    texts.put_nowait(text.strip())
+            # Otherwise the client hung up without EOS (an unused warm socket)
+        except ada.websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            generator.cancel()
+
+
+# ==============================================================================
+# Mic replay
+# ==============================================================================
+def load_wav(path, rate=ada.SEND_SAMPLE_RATE):
+    """Reads a 16-bit WAV as mono PCM16 at `rate` (channels averaged, linear resample)."""
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {8 * w.getsampwidth()}-bit")
+        channels, src_rate = w.getnchannels(), w.getframerate()
+        samples = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16).astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if src_rate != rate:
+        n = int(len(samples) * rate / src_rate)
+        samples = np.interp(np.arange(n) * src_rate / rate, np.arange(len(samples)), samples)
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+def synthetic_utterance(seconds=1.2, rate=ada.SEND_SAMPLE_RATE):
+    """A voiced, syllable-modulated harmonic signal that webrtcvad classifies as speech."""
+    t = np.arange(int(rate * seconds)) / rate
+    phase = 2 * np.pi * np.cumsum(140 + 20 * np.sin(2 * np.pi * 3 * t)) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    return (voice * envelope * 6000).astype(np.int16).tobytes()
+
+
+class WavAudioSource:
+    """CaptureEngine stand-in: a live mic that hears `play()`ed utterances.
+
+    read() is paced like the real device (block_ms per block, `speed`x real
+    time) and yields silence whenever nothing is queued, so the VAD gate sees
+    the same trailing silence it would with a microphone.
+    """
+    def __init__(self, rate=ada.SEND_SAMPLE_RATE, block_ms=ada.CAPTURE_WAKE_MS, speed=1.0):
+        self.rate = rate
+        self.block_bytes = int(rate * block_ms / 1000) * ada.SAMPLE_WIDTH
+        self.block_s = block_ms / 1000 / speed
+        self._pcm = bytearray()
+        self._next_at = None
+        self.stats = {"played_s": 0.0, "blocks": 0}
+
+    def start(self, loop):
+        pass
+
+    def play(self, pcm):
+        self._pcm += pcm
+        self.stats["played_s"] += len(pcm) / ada.SAMPLE_WIDTH / self.rate
+
+    async def read(self):
+        now = time.monotonic()
+        if self._next_at is None or self._next_at < now - self.block_s:
+            self._next_at = now  # first read, or the reader stalled: don't burst to catch up
+        if self._next_at > now:
+            await asyncio.sleep(self._next_at - now)
+        self._next_at += self.block_s
+        self.stats["blocks"] += 1
+        data = bytes(self._pcm[:self.block_bytes])
+        del self._pcm[:self.block_bytes]
+        return data + b"\x00" * (self.block_bytes - len(data))
+
+    def snapshot(self):
+        return dict(self.stats)
+
+    def close(self):
+        self._pcm.clear()
+
+
+# ==============================================================================
+# Runner
+# ==============================================================================
+async def wait_turn_done(core, turn_ended, timeout):
+    """A turn is done once the model turn ended and its speech has finished playing."""
+    deadline = time.monotonic() + timeout
+    await asyncio.wait_for(turn_ended.wait(), timeout)
+    while time.monotonic() < deadline:
+        if (core.tracer.current is None and not core.speaking.is_set()
+                and core.response_queue_tts.empty() and core.audio_in_queue_player.empty()):
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+def build_core(client, source, sink, tts_pool, tracer=None):
+    """AI_Core wired to stand-ins: no video, no preview, no phrase cache (so runs are comparable)."""
+    core = ada.AI_Core(video_mode="none", loop=asyncio.get_running_loop(), audio_source=source,
+                       audio_sink=sink, tts_pool=tts_pool, client=client)
+    if tracer is not None:
+        core.tracer = tracer
+    core.phrase_cache = ada.PhraseCache(max_mb=0)
+    core.set_preview_enabled(False)
+    return core
+
+
+async def replay(script, mic_pcm, runs=1, speed=1.0, turn_timeout=30.0, tts_options=None, trace=False):
+    tts_server = await FakeElevenLabsServer(**(tts_options or {})).start()
+    tracer = ada.TurnTracer(keep_events=trace)
+    report = {"script": script.get("name", ""), "runs": runs, "turns": 0, "timeouts": 0,
+              "live": {}, "tts_server": None, "playback": {}}
+    try:
+        for _ in range(runs):
+            client = FakeLiveClient(script)
+            source = WavAudioSource(speed=speed)
+            sink = ClientAudioSink(lambda message: None)
+            tts_pool = ada.make_tts_pool(base_url=tts_server.url)
+            core = build_core(client, source, sink, tts_pool, tracer)
+            turn_ended = asyncio.Event()
+            core.end_of_turn.connect(turn_ended.set)
+            run_task = asyncio.create_task(core.run())
+            try:
+                await asyncio.wait_for(core._session_ready.wait(), turn_timeout)
+                for turn in script.get("turns", []):
+                    turn_ended.clear()
+                    if turn.get("input") == "text":
+                        core.text_input_queue.put_nowait(turn.get("text", ""))
+                    else:
+                        source.play(mic_pcm)
+                    try:
+                        done = await wait_turn_done(core, turn_ended, turn_timeout)
+                    except asyncio.TimeoutError:
+                        done = False
+                    report["turns"] += 1
+                    report["timeouts"] += int(not done)
+            finally:
+                await core.aclose()
+                await asyncio.gather(run_task, return_exceptions=True)
+                await tts_pool.close()
+            for session in client.sessions:
+                for k, v in session.stats.items():
+                    report["live"][k] = report["live"].get(k, 0) + v
+            for k, v in sink.stats.items():
+                report["playback"][k] = report["playback"].get(k, 0) + v
+    finally:
+        await tts_server.close()
+    report["tts_server"] = dict(tts_server.stats)
+    report["latency_ms"] = tracer.snapshot()
+    return report, tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a scripted conversation through the pipeline, offline.")
+    parser.add_argument("script", help="replay script (JSON)")
+    parser.add_argument("--wav", help="16-bit WAV used for every audio turn (default: synthetic utterance)")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--speed", type=float, default=1.0, help="mic replay speed (1.0 = real time)")
+    parser.add_argument("--ttfb-ms", type=float, default=150, help="fake TTS time to first audio")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--trace", help="write a Chrome trace of all turns here")
+    args = parser.parse_args()
+
+    with open(args.script, "r", encoding="utf-8") as f:
+        script = json.load(f)
+    mic_pcm = load_wav(args.wav) if args.wav else synthetic_utterance()
+    report, tracer = asyncio.run(replay(script, mic_pcm, runs=args.runs, speed=args.speed,
+                                       turn_timeout=args.turn_timeout, tts_options={"ttfb_ms": args.ttfb_ms},
+                                       trace=bool(args.trace)))
+    print(f">>> [INFO] Replayed {report['turns']} turns over {report['runs']} runs ({report['timeouts']} timed out)")
+    if args.trace:
+        n = tracer.export_chrome_trace(args.trace)
+        print(f">>> [INFO] Wrote {n} trace events to {args.trace}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f">>> [INFO] Wrote report to {args.json}")
+    return 1 if report["timeouts"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+# --- Multi-session assistant server ---
+# Hosts many AI_Core sessions in one asyncio process behind a local websocket API.
+#
+#   python ada_server.py            # ws://127.0.0.1:8765
+#
+# Clients act as the local user, so keep the default loopback host or set ADA_SERVER_TOKEN.
+# File and desktop tools (LOCAL_TOOLS) are off unless ADA_SERVER_LOCAL_TOOLS=true.
+#
+# Protocol (one websocket per session):
+#   client -> server  binary: PCM16 mono 16 kHz mic audio
+#                     text:   {"type": "text", "text": "..."}      typed input
+#                             {"type": "mic", "enabled": false}    mute / unmute
+#                             {"type": "interrupt"}                stop the current reply
+#                             {"type": "stats"}                    session counters
+#   server -> client  binary: PCM16 mono 24 kHz assistant speech
+#                     text:   ready, text, turn_end, speaking, audio_end, audio_flush,
+#                             search_results, files, mic, stats, error
+#
+# The calendar client, the warm ElevenLabs socket pool, the tool thread pool and the
+# TTS phrase cache are shared by all sessions; everything else (Gemini session, VAD, queues, tracer) is
+# per session. Each session's buffers are bounded, so a slow or noisy client only
+# ever fills its own queues.
+import os
+os.environ.setdefault("ADA_HEADLESS", "1")  # sessions use ada_events signals, never Qt
+
+import asyncio
+import hmac
+import itertools
+import json
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import ada
+from ada import diag, DIAG_INFO, DIAG_ERROR
+
+# --- Configuration ---
+SERVER_HOST = os.getenv("ADA_SERVER_HOST", "127.0.0.1").strip() or "127.0.0.1"
+SERVER_PORT = int(os.getenv("ADA_SERVER_PORT", "8765").strip() or 8765)
+# Any client that reaches the port acts as the local user (calendar, tools). With a token set, clients
+# must send it in the handshake ("Authorization: Bearer <token>" or ?token=<token>)
+SERVER_TOKEN = os.getenv("ADA_SERVER_TOKEN", "").strip()
+# Tools that touch this machine's files and desktop stay off for remote clients unless opted in
+LOCAL_TOOLS = ("create_folder", "create_file", "edit_file", "list_files", "read_file", "open_application", "open_website")
+SERVER_LOCAL_TOOLS = os.getenv("ADA_SERVER_LOCAL_TOOLS", "false").strip().lower() in ("1", "true", "yes", "on")
+# Admission control: connections beyond this are closed with 1013 (try again later)
+SERVER_MAX_SESSIONS = max(1, int(os.getenv("ADA_SERVER_MAX_SESSIONS", "8").strip() or 8))
+# Per-session caps: unread mic audio (oldest dropped beyond it), assistant audio sent ahead of the
+# client's playout, queued text messages, and characters per text message
+SERVER_MAX_AUDIO_MS = int(os.getenv("ADA_SERVER_MAX_AUDIO_MS", "2000").strip() or 2000)
+SERVER_OUT_BUFFER_S = float(os.getenv("ADA_SERVER_OUT_BUFFER_S", "2.0").strip() or 2.0)
+SERVER_MAX_PENDING_TEXT = max(1, int(os.getenv("ADA_SERVER_MAX_PENDING_TEXT", "4").strip() or 4))
+SERVER_MAX_TEXT_CHARS = max(1, int(os.getenv("ADA_SERVER_MAX_TEXT_CHARS", "2000").strip() or 2000))
+# Shared resources: warm ElevenLabs sockets and tool worker threads for all sessions
+SERVER_TTS_POOL = max(0, int(os.getenv("ADA_SERVER_TTS_POOL", "2").strip() or 2))
+SERVER_TOOL_WORKERS = max(1, int(os.getenv("ADA_SERVER_TOOL_WORKERS", "8").strip() or 8))
+# Tool threads one session may hold at once; the rest of its calls wait, so busy sessions cannot starve others
+SERVER_SESSION_TOOL_THREADS = max(1, int(os.getenv("ADA_SERVER_SESSION_TOOL_THREADS", "2").strip() or 2))
+MAX_MESSAGE_BYTES = 1 << 20
+
+
+# ==============================================================================
+# Client Audio Source / Sink
+# ==============================================================================
+class ClientAudioSource:
+    """Mic stand-in fed with PCM frames from the client (CaptureEngine interface).
+
+    read() hands out everything buffered once wake_ms has arrived, like the
+    device engine. If the session falls behind, the oldest audio is dropped
+    so latency stays bounded.
+    """
+    def __init__(self, rate=ada.SEND_SAMPLE_RATE, wake_ms=ada.CAPTURE_WAKE_MS, max_ms=SERVER_MAX_AUDIO_MS):
+        self.rate = rate
+        self.wake_bytes = int(rate * wake_ms / 1000) * ada.SAMPLE_WIDTH
+        self.max_bytes = max(self.wake_bytes * 2, int(rate * max_ms / 1000) * ada.SAMPLE_WIDTH)
+        self._buf = bytearray()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.stats = {"frames": 0, "bytes": 0, "overflows": 0, "max_batch_ms": 0.0}
+
+    def start(self, loop):
+        pass
+
+    def feed(self, data):
+        self.stats["frames"] += 1
+        self.stats["bytes"] += len(data)
+        self._buf += data
+        excess = len(self._buf) - self.max_bytes
+        if excess > 0:
+            excess += excess % ada.SAMPLE_WIDTH
+            del self._buf[:excess]
+            self.stats["overflows"] += 1
+        if len(self._buf) >= self.wake_bytes:
+            self._ready.set()
+
+    async def read(self):
+        while len(self._buf) < self.wake_bytes and not self._closed:
+            self._ready.clear()
+            await self._ready.wait()
+        n = len(self._buf) - len(self._buf) % ada.SAMPLE_WIDTH
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        self.stats["max_batch_ms"] = max(self.stats["max_batch_ms"], n / ada.SAMPLE_WIDTH * 1000 / self.rate)
+        return data
+
+    def snapshot(self):
+        return {**self.stats, "buffered_ms": len(self._buf) / ada.SAMPLE_WIDTH * 1000 / self.rate}
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+
+class ClientAudioSink:
+    """Speaker stand-in that streams PCM to the client (PlaybackEngine interface).
+
+    The client plays what it receives, so progress is tracked with a playout
+    clock: audio started after jitter_ms and has been playing in real time
+    since. write() refuses more than buffer_s ahead of that clock (play_audio
+    then waits, as it does for a full ring), and `drained` is set when the
+    clock passes the end of the turn's audio.
+    """
+    def __init__(self, send, backlog=None, rate=ada.RECEIVE_SAMPLE_RATE, jitter_ms=ada.PLAYBACK_JITTER_MS,
+                 buffer_s=SERVER_OUT_BUFFER_S):
+        self.send = send          # enqueues a websocket message for the client
+        self.backlog = backlog    # bytes queued but not yet sent (slow client)
+        self.rate = rate
+        self.jitter_s = jitter_ms / 1000
+        self.buffer_s = buffer_s
+        self.on_output = None     # no local echo reference: clients handle their own AEC
+        self.on_start = None
+        self._play_end = 0.0
+        self._playing = False
+        self._ending = False
+        self._loop = None
+        self._drain_timer = None
+        self.drained = asyncio.Event()
+        self.drained.set()
+        self.stats = {"underruns": 0, "overruns": 0, "chunks": 0, "played_s": 0.0}
+
+    def start(self, loop):
+        self._loop = loop
+
+    def buffered_seconds(self):
+        return max(0.0, self._play_end - time.monotonic()) if self._playing else 0.0
+
+    def write(self, data):
+        """Sends PCM16 bytes; returns the tail that would run too far ahead of playout."""
+        ahead = self.buffered_seconds()
+        room = int((self.buffer_s - ahead) * self.rate) * ada.SAMPLE_WIDTH
+        if self.backlog is not None:
+            room = min(room, int(self.buffer_s * self.rate) * ada.SAMPLE_WIDTH - self.backlog())
+        if room <= 0:
+            self.stats["overruns"] += 1
+            return data
+        chunk = data[:room]
+        now = time.monotonic()
+        if not self._playing:
+            self._playing = True
+            self._play_end = now + self.jitter_s
+            if self.on_start is not None:
+                self.on_start()
+        elif ahead == 0.0 and not self._ending:
+            self.stats["underruns"] += 1
+            self._play_end = now + self.jitter_s
+        seconds = len(chunk) / ada.SAMPLE_WIDTH / self.rate
+        self._play_end += seconds
+        self.stats["chunks"] += 1
+        self.stats["played_s"] += seconds
+        self._ending = False
+        self.drained.clear()
+        self.send(chunk)
+        return data[len(chunk):]
+
+    def mark_end(self):
+        self._ending = True
+        self.send(json.dumps({"type": "audio_end"}))
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        if self._drain_timer is not None:
+            self._drain_timer.cancel()
+        self._drain_timer = self._loop.call_later(self.buffered_seconds(), self._check_drained)
+
+    def _check_drained(self):
+        self._drain_timer = None
+        if not self._ending:
+            return
+        if self.buffered_seconds() > 0:
+            self._schedule_drain()
+            return
+        self._playing = False
+        self.drained.set()
+
+    def flush(self):
+        if self._drain_timer is not None:
+            self._drain_timer.cancel()
+            self._drain_timer = None
+        self._playing = False
+        self._ending = False
+        self.drained.set()
+        self.send(json.dumps({"type": "audio_flush"}))
+
+    async def wait_drained(self, timeout):
+        try:
+            await asyncio.wait_for(self.drained.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def snapshot(self):
+        return {**self.stats, "buffered_ms": self.buffered_seconds() * 1000}
+
+    def close(self):
+        if self._drain_timer is not None:
+            self._drain_timer.cancel()
+            self._drain_timer = None
+
+
+# ==============================================================================
+# Sessions
+# ==============================================================================
+class AssistantSession:
+    """One client connection: an AI_Core wired to the websocket instead of devices."""
+
+    def __init__(self, server, websocket, session_id):
+        self.server = server
+        self.websocket = websocket
+        self.id = session_id
+        self.out = asyncio.Queue()
+        self.out_bytes = 0
+        self.source = ClientAudioSource()
+        self.sink = ClientAudioSink(self._send, backlog=lambda: self.out_bytes)
+        self.core = ada.AI_Core(video_mode="none", loop=asyncio.get_running_loop(),
+                                audio_source=self.source, audio_sink=self.sink,
+                                calendar=server.calendar, tts_pool=server.tts_pool, tool_pool=server.tool_pool,
+                                tool_threads=SERVER_SESSION_TOOL_THREADS,
+                                phrase_cache=server.phrase_cache,
+                                disabled_tools=() if server.local_tools else LOCAL_TOOLS)
+        self.core.set_preview_enabled(False)
+        core = self.core
+        core.text_received.connect(lambda text: self._send_json("text", text=text))
+        core.end_of_turn.connect(lambda: self._send_json("turn_end"))
+        core.speaking_started.connect(lambda: self._send_json("speaking", value=True))
+        core.speaking_stopped.connect(lambda: self._send_json("speaking", value=False))
+        core.mic_state_changed.connect(lambda enabled: self._send_json("mic", enabled=enabled))
+        core.search_results_received.connect(lambda urls: urls and self._send_json("search_results", urls=urls))
+        core.file_list_received.connect(lambda path, files: path and self._send_json("files", directory=path, files=files))
+
+    # Signals fire on the server loop, so sending is just an enqueue
+    def _send(self, message):
+        if isinstance(message, (bytes, bytearray)):
+            self.out_bytes += len(message)
+        self.out.put_nowait(message)
+
+    def _send_json(self, kind, **fields):
+        self._send(json.dumps({"type": kind, **fields}))
+
+    async def _sender(self):
+        while True:
+            message = await self.out.get()
+            if message is None:
+                return
+            await self.websocket.send(message)
+            if isinstance(message, (bytes, bytearray)):
+                self.out_bytes -= len(message)
+
+    async def _handle_message(self, message):
+        if isinstance(message, (bytes, bytearray)):
+            self.source.feed(message)
+            return
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            self._send_json("error", message="expected JSON text or binary PCM")
+            return
+        kind = msg.get("type") if isinstance(msg, dict) else None
+        if kind == "text":
+            text = str(msg.get("text") or "").strip()[:SERVER_MAX_TEXT_CHARS]
+            if not text:
+                return
+            if self.core.text_input_queue.qsize() >= SERVER_MAX_PENDING_TEXT:
+                self._send_json("error", message="too many pending messages")
+                return
+            self.core.text_input_queue.put_nowait(text)
+        elif kind == "mic":
+            self.core.set_mic_enabled(bool(msg.get("enabled", True)))
+        elif kind == "interrupt":
+            await self.core.interrupt_playback("client")
+        elif kind == "stats":
+            self._send_json("stats", session=self.snapshot())
+        else:
+            self._send_json("error", message=f"unknown message type {kind!r}")
+
+    async def _receiver(self):
+        async for message in self.websocket:
+            await self._handle_message(message)
+
+    def snapshot(self):
+        return {
+            "id": self.id,
+            "capture": self.source.snapshot(),
+            "playback": self.sink.snapshot(),
+            "uplink": self.core.uplink.snapshot(),
+            "live": dict(self.core.session_stats, connected=self.core.session is not None),
+            "latency": self.core.tracer.snapshot(),
+        }
+
+    async def run(self):
+        self._send_json("ready", session=self.id, input_rate=ada.SEND_SAMPLE_RATE,
+                        output_rate=ada.RECEIVE_SAMPLE_RATE, sample_format="pcm_s16le")
+        sender = asyncio.create_task(self._sender())
+        receiver = asyncio.create_task(self._receiver())
+        core_task = asyncio.create_task(self.core.run())
+        try:
+            await asyncio.wait([receiver, core_task, sender], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            await self.core.aclose()
+            receiver.cancel()
+            self.out.put_nowait(None)
+            try:
+                await asyncio.wait_for(sender, timeout=1.0)
+            except (asyncio.TimeoutError, Exception):
+                sender.cancel()
+            await asyncio.gather(core_task, receiver, return_exceptions=True)
+
+
+# ==============================================================================
+# Server
+# ==============================================================================
+class AssistantServer:
+    """Accepts websocket clients and runs one AssistantSession per connection."""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, max_sessions=SERVER_MAX_SESSIONS,
+                 token=SERVER_TOKEN, local_tools=SERVER_LOCAL_TOOLS):
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.token = token
+        self.local_tools = local_tools
+        self.sessions = {}
+        self.stats = {"accepted": 0, "rejected": 0, "unauthorized": 0, "closed": 0}
+        self._ids = itertools.count(1)
+        # Shared by every session; closed once when the server stops
+        self.calendar = ada.CalendarClient(ada.MCP_CAL_BASE_URL)
+        self.tool_pool = ThreadPoolExecutor(max_workers=SERVER_TOOL_WORKERS, thread_name_prefix="tool")
+        self.tts_pool = ada.make_tts_pool(size=SERVER_TTS_POOL)
+        self.phrase_cache = ada.PhraseCache()  # one instance per TTS_CACHE_DIR: shared LRU accounting
+
+    def authorized(self, websocket):
+        """True when no token is configured or the handshake carried the right one."""
+        if not self.token:
+            return True
+        # websockets >= 14 serves ServerConnection (.request); older releases the legacy protocol
+        request = getattr(websocket, "request", None)
+        if request is not None:
+            headers, path = request.headers, request.path
+        else:
+            headers, path = getattr(websocket, "request_headers", None) or {}, getattr(websocket, "path", "") or ""
+        supplied = headers.get("Authorization", "")
+        if supplied.startswith("Bearer "):
+            supplied = supplied[len("Bearer "):].strip()
+        else:
+            supplied = (parse_qs(urlsplit(path).query).get("token") or [""])[0]
+        return hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    async def handle(self, websocket, *_):
+        if not self.authorized(websocket):
+            self.stats["unauthorized"] += 1
+            diag("server.unauthorized", DIAG_INFO)
+            await websocket.close(code=1008, reason="missing or wrong token")
+            return
+        if len(self.sessions) >= self.max_sessions:
+            self.stats["rejected"] += 1
+            diag("server.rejected", DIAG_INFO, sessions=len(self.sessions))
+            await websocket.close(code=1013, reason="server at capacity, try again later")
+            return
+        session_id = next(self._ids)
+        session = AssistantSession(self, websocket, session_id)
+        self.sessions[session_id] = session
+        self.stats["accepted"] += 1
+        print(f">>> [INFO] Session {session_id} connected ({len(self.sessions)}/{self.max_sessions})")
+        try:
+            await session.run()
+        except Exception as e:
+            diag("server.session_error", DIAG_ERROR, session=session_id, error=f"{type(e).__name__}: {e}")
+        finally:
+            self.sessions.pop(session_id, None)
+            self.stats["closed"] += 1
+            print(f">>> [INFO] Session {session_id} closed ({len(self.sessions)}/{self.max_sessions})")
+
+    async def serve(self, stop):
+        """Runs until `stop` (an asyncio.Event) is set, then closes every session."""
+        async with ada.websockets.serve(self.handle, self.host, self.port, max_size=MAX_MESSAGE_BYTES):
+            print(f">>> [INFO] {ada.ASSISTANT_NAME} server listening on ws://{self.host}:{self.port} "
+                  f"(max {self.max_sessions} sessions)")
+            if not self.token and self.host not in ("127.0.0.1", "localhost", "::1"):
+                print(">>> [WARN] ADA_SERVER_TOKEN is not set: anyone who can reach this port can use the assistant.")
+            await stop.wait()
+            print(">>> [INFO] Shutting down server...")
+            await asyncio.gather(*(s.core.aclose() for s in list(self.sessions.values())), return_exceptions=True)
+        await self.tts_pool.close()
+        self.calendar.close()
+        self.tool_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def main():
+    ada.require_api_keys()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    await AssistantServer().serve(stop)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    print(">>> [INFO] Server terminated.")
@@ -0,0 +1,155 @@
+# --- Calendar load generator ---
+# Drives the assistant's calendar helpers (AI_Core._mcp_google_calendar_*) through the
+# real CalendarClient against the in-memory bridge stub, and reports throughput and
+# tail latency per operation:
+#
+#   python benchmarks/calendar_load.py --duration 10 --concurrency 16
+#   python benchmarks/calendar_load.py --latency-ms 40 --jitter-ms 60 --error-rate 0.05 --json load.json
+#   python benchmarks/calendar_load.py --url http://127.0.0.1:3001    # an already-running stub or bridge
+#
+# --concurrency is the number of simulated callers; --client-concurrency is CalendarClient's
+# own cap (MCP_CAL_MAX_CONCURRENCY), so queueing behind the cap shows up in the latencies.
+import os
+import sys
+os.environ.setdefault("ADA_HEADLESS", "1")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import ada
+import ada_replay
+from calendar_stub_server import CalendarStubServer, FaultConfig
+from run import summarize
+
+# Operation mix: weights roughly follow what a voice session asks for
+OPERATIONS = {"find_events": 6, "create_event": 2, "delete_event": 1, "list_calendars": 1}
+
+
+class CalendarLoad:
+    """Simulated callers sharing one AI_Core, as concurrent tool calls would."""
+    def __init__(self, core, seed=None):
+        self.core = core
+        self.rng = random.Random(seed)
+        self.created = []  # event ids available for delete_event
+        self.latencies = {name: [] for name in OPERATIONS}
+        self.outcomes = {name: {} for name in OPERATIONS}
+
+    async def _op(self, name):
+        core = self.core
+        if name == "find_events":
+            return await core._mcp_google_calendar_find_events(query=self.rng.choice(["", "standup", "load"]), max_results=10)
+        if name == "create_event":
+            start = datetime.now().astimezone() + timedelta(minutes=self.rng.randint(10, 60 * 24 * 7))
+            res = await core._mcp_google_calendar_create_event(summary=f"load test {self.rng.randint(0, 9999)}",
+                                                               start_time=start.isoformat(),
+                                                               end_time=(start + timedelta(minutes=30)).isoformat())
+            if res.get("status") == "success" and isinstance(res.get("data"), dict) and res["data"].get("id"):
+                self.created.append(res["data"]["id"])
+            return res
+        if name == "delete_event":
+            if not self.created:
+                return await core._mcp_google_calendar_list_calendars()
+            return await core._mcp_google_calendar_delete_event(event_id=self.created.pop(self.rng.randrange(len(self.created))))
+        return await core._mcp_google_calendar_list_calendars()
+
+    async def worker(self, deadline):
+        names, weights = list(OPERATIONS), list(OPERATIONS.values())
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            res = await self._op(name)
+            self.latencies[name].append((time.perf_counter() - t0) * 1000)
+            outcome = "ok" if res.get("status") == "success" else f"error_{res.get('code', 0)}"
+            self.outcomes[name][outcome] = self.outcomes[name].get(outcome, 0) + 1
+
+    async def run(self, duration, concurrency):
+        deadline = time.perf_counter() + duration
+        t0 = time.perf_counter()
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+        return time.perf_counter() - t0
+
+    def report(self, elapsed):
+        all_latencies = [ms for values in self.latencies.values() for ms in values]
+        errors = sum(n for outcomes in self.outcomes.values() for k, n in outcomes.items() if k != "ok")
+        return {
+            "elapsed_s": elapsed,
+            "requests": len(all_latencies),
+            "errors": errors,
+            "throughput_rps": len(all_latencies) / elapsed if elapsed else 0.0,
+            "latency_ms": summarize(all_latencies),
+            "operations": {name: {"latency_ms": summarize(self.latencies[name]), "outcomes": self.outcomes[name]}
+                           for name in OPERATIONS},
+        }
+
+
+async def run_load(url, duration, concurrency, client_concurrency, seed=None):
+    calendar = ada.CalendarClient(url, max_concurrency=client_concurrency)
+    core = ada.AI_Core(video_mode="none", loop=asyncio.get_running_loop(), calendar=calendar,
+                       client=ada_replay.FakeLiveClient({"turns": []}))
+    try:
+        health = await calendar.request("GET", "/health")
+        if health.get("status") != "success":
+            raise RuntimeError(f"calendar bridge at {url} is not healthy: {health.get('message') or health.get('code')}")
+        load = CalendarLoad(core, seed)
+        elapsed = await load.run(duration, concurrency)
+        return load.report(elapsed)
+    finally:
+        await core.aclose()
+        calendar.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the calendar helpers against the bridge stub.")
+    parser.add_argument("--url", help="use a running bridge/stub instead of starting one")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16, help="simulated concurrent callers")
+    parser.add_argument("--client-concurrency", type=int, default=ada.MCP_CAL_MAX_CONCURRENCY, help="CalendarClient's request cap")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub: added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="stub: uniform extra delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub: fraction of requests answered with 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="stub: fraction of requests stalled past the client timeout")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the report here")
+    args = parser.parse_args()
+
+    stub = None
+    url = args.url
+    if url is None:
+        faults = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, hang_rate=args.hang_rate,
+                             hang_s=ada.MCP_CAL_TIMEOUT + 1, seed=args.seed)
+        stub = CalendarStubServer(faults=faults).start()
+        url = stub.url
+        print(f">>> [INFO] Calendar stub on {url} (faults: {faults.as_dict()})")
+    try:
+        report = asyncio.run(run_load(url, args.duration, args.concurrency, args.client_concurrency, args.seed))
+    finally:
+        if stub is not None:
+            report_stub = stub.snapshot()
+            stub.close()
+    report.update({"url": url, "concurrency": args.concurrency, "client_concurrency": args.client_concurrency})
+    if stub is not None:
+        report["stub"] = {"faults": stub.faults.as_dict(), "requests": report_stub}
+
+    total = report["latency_ms"]
+    print(f"\n{report['requests']} requests in {report['elapsed_s']:.1f}s: {report['throughput_rps']:.1f} req/s, "
+          f"{report['errors']} errors")
+    print(f"{'all':<16} p50={total['p50']:8.1f}ms p95={total['p95']:8.1f}ms p99={total['p99']:8.1f}ms (n={total['count']})")
+    for name, op in report["operations"].items():
+        stats = op["latency_ms"]
+        if stats["count"]:
+            print(f"{name:<16} p50={stats['p50']:8.1f}ms p95={stats['p95']:8.1f}ms p99={stats['p99']:8.1f}ms "
+                  f"(n={stats['count']}) {op['outcomes']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f">>> [INFO] Wrote report to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# --- Voice pipeline benchmarks ---
+# Measures the hot paths of a voice turn against the local stand-ins from
+# ada_replay.py (scripted Gemini Live session, fake ElevenLabs server, WAV mic),
+# so numbers are comparable between machines and commits:
+#
+#   python benchmarks/run.py --json bench.json                       # all cases
+#   python benchmarks/run.py --only tool_dispatch,frame_encode
+#   python benchmarks/run.py --json new.json --baseline bench.json    # exit 1 on regressions
+#
+# Cases (all times in ms):
+#   mic_to_upload      mic block read -> session.send (listen_audio, VAD gate, uplink, send_realtime);
+#                      `onset` is first voiced block -> first upload, including the gate's onset frames
+#   text_to_first_tts  typed text queued -> first TTS audio written to the speaker (zero model/TTS delay)
+#   playback_drain     end of a turn's audio -> drained, minus where it really ended; PlaybackEngine
+#                      runs on a simulated device clock (needs pyaudio), ClientAudioSink always runs
+#   frame_encode       _encode_frame (JPEG) per capture size, FrameChangeDetector.should_send
+#   tool_dispatch      tool call received by receive_text -> tool response sent (time_current_time),
+#                      next to the handler's own cost
+import os
+import sys
+os.environ.setdefault("ADA_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import platform
+import threading
+import time
+
+import numpy as np
+
+import ada
+import ada_replay
+from ada_server import ClientAudioSink
+
+# A metric regresses when it is this much slower than the baseline (and by at least MIN_DELTA_MS)
+REGRESSION_THRESHOLD = 0.20
+MIN_DELTA_MS = 1.0
+
+
+def summarize(values):
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+    pick = lambda q: values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+    return {"count": len(values), "mean": sum(values) / len(values), "p50": pick(0.50),
+            "p95": pick(0.95), "p99": pick(0.99), "max": values[-1]}
+
+
+def _discard(message):
+    pass
+
+
+class _Session:
+    """Runs an AI_Core on stand-ins for one case and tears everything down afterwards."""
+    def __init__(self, script, source=None, sink=None, tts_options=None):
+        self.client = ada_replay.FakeLiveClient(script)
+        self.source = source or ada_replay.WavAudioSource()
+        self.sink = sink or ClientAudioSink(_discard)
+        self.tts_options = tts_options or {}
+
+    async def __aenter__(self):
+        self.tts_server = await ada_replay.FakeElevenLabsServer(**self.tts_options).start()
+        self.tts_pool = ada.make_tts_pool(base_url=self.tts_server.url)
+        self.core = ada_replay.build_core(self.client, self.source, self.sink, self.tts_pool)
+        self.turn_ended = asyncio.Event()
+        self.core.end_of_turn.connect(self.turn_ended.set)
+        self.task = asyncio.create_task(self.core.run())
+        await asyncio.wait_for(self.core._session_ready.wait(), 10)
+        self.live = self.client.sessions[-1]
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.core.aclose()
+        await asyncio.gather(self.task, return_exceptions=True)
+        await self.tts_pool.close()
+        await self.tts_server.close()
+
+
+# ==============================================================================
+# Cases
+# ==============================================================================
+class _TimedSource(ada_replay.WavAudioSource):
+    """Remembers when each block was handed out and when the last utterance started."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.last_read_at = None
+        self.utterance_at = None
+        self._fresh = False
+
+    def play(self, pcm):
+        super().play(pcm)
+        self._fresh = True
+        self.utterance_at = None
+
+    async def read(self):
+        data = await super().read()
+        self.last_read_at = time.perf_counter()
+        if self._fresh:
+            self._fresh = False
+            self.utterance_at = self.last_read_at
+        return data
+
+
+async def bench_mic_to_upload(n):
+    source = _TimedSource(speed=2.0)
+    chunk_ms, onset_ms = [], []
+    utterance = ada_replay.synthetic_utterance()
+    async with _Session({"turns": []}, source=source) as s:
+        send = s.live.send
+
+        async def timed_send(input=None, end_of_turn=False):
+            if isinstance(input, dict) and str(input.get("mime_type", "")).startswith("audio"):
+                now = time.perf_counter()
+                chunk_ms.append((now - source.last_read_at) * 1000)
+                if source.utterance_at is not None:
+                    onset_ms.append((now - source.utterance_at) * 1000)
+                    source.utterance_at = None
+            await send(input=input, end_of_turn=end_of_turn)
+
+        s.live.send = timed_send
+        for _ in range(n):
+            s.turn_ended.clear()
+            source.play(utterance)
+            await ada_replay.wait_turn_done(s.core, s.turn_ended, 15)
+    return {"chunk": summarize(chunk_ms), "onset": summarize(onset_ms)}
+
+
+class _TimedSink(ClientAudioSink):
+    def __init__(self):
+        super().__init__(_discard)
+        self.first_write_at = None
+
+    def write(self, data):
+        if self.first_write_at is None and data:
+            self.first_write_at = time.perf_counter()
+        return super().write(data)
+
+
+async def bench_text_to_first_tts(n):
+    turn = {"input": "text", "text": "ping", "respond_after_ms": 0, "chunks": [{"text": "Okay, done."}]}
+    sink = _TimedSink()
+    latencies = []
+    async with _Session({"turns": [turn] * n}, sink=sink, tts_options={"ttfb_ms": 0, "ms_per_char": 20}) as s:
+        for _ in range(n):
+            s.turn_ended.clear()
+            sink.first_write_at = None
+            queued_at = time.perf_counter()
+            s.core.text_input_queue.put_nowait(turn["text"])
+            await ada_replay.wait_turn_done(s.core, s.turn_ended, 15)
+            if sink.first_write_at is not None:
+                latencies.append((sink.first_write_at - queued_at) * 1000)
+    return {"latency": summarize(latencies)}
+
+
+class _DeviceClock:
+    """Calls PlaybackEngine's callback on a real-time schedule, as PortAudio would.
+
+    audio_end is when the last sample handed to the "device" finishes playing.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.block_s = engine.frames_per_buffer / engine.rate
+        self.audio_end = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="bench-device")
+
+    def _run(self):
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            before = self.engine._read
+            self.engine._callback(None, self.engine.frames_per_buffer, None, 0)
+            if self.engine._read > before:
+                self.audio_end = time.perf_counter() + (self.engine._read - before) / self.engine.rate
+            next_at += self.block_s
+            self._stop.wait(max(0.0, next_at - time.perf_counter()))
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+async def _drain_errors(player, n, playout_end, before_clip=None):
+    """Streams n clips like the TTS path does and compares drain time with the true end of playout.
+
+    playout_end(clip_s) returns when the clip really finished playing (perf_counter), or None.
+    """
+    rate = player.rate
+    errors = []
+    for i in range(n):
+        clip_s = 0.4 + 0.2 * (i % 5)
+        pcm = np.zeros(int(rate * clip_s), dtype=np.int16).tobytes()
+        step = int(rate * 0.1) * ada.SAMPLE_WIDTH
+        if before_clip is not None:
+            before_clip()
+        for j in range(0, len(pcm), step):
+            rest = player.write(pcm[j:j + step])
+            while rest:
+                await asyncio.sleep(0.01)
+                rest = player.write(rest)
+            await asyncio.sleep(0.025)
+        player.mark_end()
+        await player.wait_drained(clip_s + 5)
+        drained_at = time.perf_counter()
+        end = playout_end(clip_s)
+        if end is not None:
+            errors.append((drained_at - end) * 1000)
+    return errors
+
+
+async def bench_playback_drain(n):
+    results = {}
+    started = []
+    sink = ClientAudioSink(_discard)
+    sink.start(asyncio.get_running_loop())
+    sink.on_start = lambda: started.append(time.perf_counter())
+    # The client starts playing jitter_ms after the first chunk of a turn arrives
+    errors = await _drain_errors(sink, n, lambda clip_s: started[-1] + sink.jitter_s + clip_s if started else None,
+                                 before_clip=started.clear)
+    results["client_sink"] = summarize(errors)
+    results["client_sink_abs"] = summarize([abs(e) for e in errors])
+    try:
+        ada.ensure_loaded(ada.pyaudio)
+    except ImportError as e:
+        results["playback_engine"] = {"skipped": f"pyaudio unavailable: {e}"}
+        return results
+    engine = ada.PlaybackEngine()
+    engine._loop = asyncio.get_running_loop()
+    clock = _DeviceClock(engine)
+    clock.start()
+    try:
+        errors = await _drain_errors(engine, n, lambda clip_s: clock.audio_end)
+    finally:
+        clock.stop()
+    results["playback_engine"] = summarize(errors)
+    results["playback_engine_abs"] = summarize([abs(e) for e in errors])
+    return results
+
+
+def _test_frame(height, width, channels, seed=0):
+    """Gradient plus noise: compresses like a real scene, unlike flat or pure-noise frames."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = ((x * 255 // max(1, width - 1) + y * 128 // max(1, height - 1)) % 256).astype(np.int16)
+    frame = np.repeat(base[:, :, None], channels, axis=2) + rng.integers(-12, 13, (height, width, channels))
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+async def bench_frame_encode(n):
+    ada.ensure_loaded(ada.cv2, ada.PIL)
+    results = {}
+    for name, (h, w, c, fmt) in {"camera_640x480": (480, 640, 3, "BGR"),
+                                 "screen_1920x1080": (1080, 1920, 4, "BGRA")}.items():
+        frame = _test_frame(h, w, c)
+        ada.AI_Core._encode_frame(None, frame, fmt)  # warm-up (codec tables, thread pools)
+        samples = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            ada.AI_Core._encode_frame(None, frame, fmt)
+            samples.append((time.perf_counter() - t0) * 1000)
+        results[name] = summarize(samples)
+    detector = ada.FrameChangeDetector(min_interval=0.0)
+    frames = [_test_frame(480, 640, 3, seed=i) for i in range(4)]
+    samples = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        detector.should_send(frames[i % len(frames)], now=float(i))
+        samples.append((time.perf_counter() - t0) * 1000)
+    results["change_detector"] = summarize(samples)
+    return results
+
+
+async def bench_tool_dispatch(n):
+    call = {"tool_call": {"name": "time_current_time", "args": {}}}
+    script = {"turns": [{"input": "text", "text": "time?", "respond_after_ms": 0, "chunks": [call] * n}]}
+    async with _Session(script) as s:
+        s.core.text_input_queue.put_nowait("time?")
+        await ada_replay.wait_turn_done(s.core, s.turn_ended, 30)
+        dispatch = list(s.live.tool_round_trips)
+        handler = s.core.tool_executor.tools["time_current_time"].handler
+        samples = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            handler({})
+            samples.append((time.perf_counter() - t0) * 1000)
+    return {"dispatch": summarize(dispatch), "handler": summarize(samples)}
+
+
+CASES = {
+    "mic_to_upload": (bench_mic_to_upload, 5),
+    "text_to_first_tts": (bench_text_to_first_tts, 20),
+    "playback_drain": (bench_playback_drain, 10),
+    "frame_encode": (bench_frame_encode, 30),
+    "tool_dispatch": (bench_tool_dispatch, 50),
+}
+
+
+# ==============================================================================
+# Baseline comparison
+# ==============================================================================
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """p50/p95 of every metric present in both runs; `regression` marks slowdowns past threshold."""
+    rows = []
+    for case, metrics in results.items():
+        for metric, stats in metrics.items():
+            base = baseline.get(case, {}).get(metric, {})
+            for q in ("p50", "p95"):
+                if q not in stats or q not in base:
+                    continue
+                # Signed drain errors are not "lower is better"; their _abs twins are compared instead
+                if case == "playback_drain" and not metric.endswith("_abs"):
+                    continue
+                old, new = base[q], stats[q]
+                change = (new - old) / old if old else 0.0
+                rows.append({"case": case, "metric": metric, "stat": q, "baseline": old, "current": new,
+                             "change": change, "regression": change > threshold and new - old > MIN_DELTA_MS})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the voice turn pipeline on local stand-ins.")
+    parser.add_argument("--only", help="comma-separated cases: " + ",".join(CASES))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every case's iteration count")
+    parser.add_argument("--json", help="write results here")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        fn, iterations = CASES[name]
+        n = max(1, int(iterations * args.scale))
+        t0 = time.perf_counter()
+        results[name] = asyncio.run(fn(n))
+        print(f">>> [INFO] {name}: {n} iterations in {time.perf_counter() - t0:.1f}s")
+
+    print()
+    for case, metrics in results.items():
+        for metric, stats in metrics.items():
+            if "skipped" in stats:
+                print(f"{case:<18} {metric:<22} skipped ({stats['skipped']})")
+            elif stats["count"]:
+                print(f"{case:<18} {metric:<22} p50={stats['p50']:8.2f}ms p95={stats['p95']:8.2f}ms "
+                      f"p99={stats['p99']:8.2f}ms (n={stats['count']})")
+
+    report = {"meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                       "platform": platform.platform(), "machine": platform.machine()},
+              "results": results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline.get("results", {}), args.threshold)
+        report["baseline"] = {"path": args.baseline, "meta": baseline.get("meta"), "comparison": rows}
+        print(f"\nvs {args.baseline}:")
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['case']:<18} {row['metric']:<22} {row['stat']} {row['baseline']:8.2f} -> "
+                  f"{row['current']:8.2f}ms ({row['change']:+.0%}){flag}")
+        regressions = [row for row in rows if row["regression"]]
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f">>> [INFO] Wrote results to {args.json}")
+    if regressions:
+        print(f">>> [WARN] {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+# --- Calendar bridge stub ---
+# In-memory stand-in for the Google Calendar MCP HTTP bridge (MCP_CAL_BASE_URL), with
+# injectable latency and failures, for load/latency testing without Google credentials:
+#
+#   python tests/calendar_stub_server.py --port 3001 --latency-ms 40 --jitter-ms 20 --error-rate 0.02
+#   MCP_CAL_BASE_URL=http://127.0.0.1:3001 node tests/calendar_bridge_test.mjs
+#
+# Routes (same shapes as the bridge):
+#   GET    /health
+#   GET    /calendars
+#   GET    /calendars/{id}/events            ?q, time_min, time_max, max_results, order_by
+#   POST   /calendars/{id}/events            {summary, start: {dateTime}, end: {dateTime}, ...} -> 201
+#   POST   /calendars/{id}/events/quickAdd   {text}; "YYYY-MM-DD HH:MM[-HH:MM]" sets the time -> 201
+#   DELETE /calendars/{id}/events/{event_id} -> 204
+# Test control (not part of the bridge):
+#   GET    /_stub/stats                      request counts per route, injected faults
+#   POST   /_stub/config                     {latency_ms, jitter_ms, error_rate, error_status, hang_rate, hang_s}
+#   POST   /_stub/reset                      drop all events and counters
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+CALENDARS = [
+    {"id": "primary", "summary": "Primary", "primary": True, "accessRole": "owner", "timeZone": "UTC"},
+    {"id": "team@group.calendar.google.com", "summary": "Team", "accessRole": "writer", "timeZone": "UTC"},
+]
+QUICK_ADD_TIME = re.compile(r"(\d{4}-\d{2}-\d{2})[ T](\d{1,2}:\d{2})(?:\s*-\s*(\d{1,2}:\d{2}))?")
+
+
+def _parse_time(value):
+    """RFC3339 / ISO string -> aware datetime (naive values are taken as local time)."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.astimezone()
+
+
+class CalendarStore:
+    """Events per calendar, kept in memory; all methods are thread-safe."""
+    def __init__(self, calendars=CALENDARS):
+        self.calendars = [dict(c) for c in calendars]
+        self._events = {c["id"]: {} for c in calendars}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def has_calendar(self, calendar_id):
+        return calendar_id in self._events
+
+    def list_events(self, calendar_id, q="", time_min=None, time_max=None, max_results=250):
+        lo, hi = _parse_time(time_min), _parse_time(time_max)
+        q = (q or "").lower()
+        with self._lock:
+            events = list(self._events[calendar_id].values())
+        items = []
+        for ev in events:
+            start, end = _parse_time(ev["start"].get("dateTime")), _parse_time(ev["end"].get("dateTime"))
+            if q and q not in (ev.get("summary", "") + " " + ev.get("description", "")).lower():
+                continue
+            if lo and end and end <= lo:
+                continue
+            if hi and start and start >= hi:
+                continue
+            items.append(ev)
+        items.sort(key=lambda ev: ev["start"].get("dateTime") or "")
+        return items[:max_results]
+
+    def create(self, calendar_id, body):
+        event = {k: v for k, v in body.items() if k in ("summary", "description", "location", "attendees", "start", "end")}
+        with self._lock:
+            event_id = f"stub{next(self._ids):06d}"
+            event.update({"id": event_id, "status": "confirmed", "created": datetime.now().astimezone().isoformat(),
+                          "htmlLink": f"https://calendar.invalid/event?eid={event_id}"})
+            self._events[calendar_id][event_id] = event
+        return event
+
+    def quick_add(self, calendar_id, text):
+        match = QUICK_ADD_TIME.search(text or "")
+        if match:
+            day, start_hm, end_hm = match.groups()
+            start = datetime.fromisoformat(f"{day} {start_hm}").astimezone()
+            end = datetime.fromisoformat(f"{day} {end_hm}").astimezone() if end_hm else start + timedelta(hours=1)
+            summary = (text[:match.start()] + text[match.end():]).strip().removesuffix(" on").strip()
+        else:
+            start = datetime.now().astimezone().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            end, summary = start + timedelta(hours=1), (text or "").strip()
+        return self.create(calendar_id, {"summary": summary or "(No title)",
+                                         "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}})
+
+    def delete(self, calendar_id, event_id):
+        with self._lock:
+            return self._events[calendar_id].pop(event_id, None) is not None
+
+    def reset(self):
+        with self._lock:
+            for events in self._events.values():
+                events.clear()
+
+
+class FaultConfig:
+    """Injected behaviour applied to every bridge route (not /_stub/*)."""
+    FIELDS = {"latency_ms": float, "jitter_ms": float, "error_rate": float, "error_status": int,
+              "hang_rate": float, "hang_s": float}
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_status=503, hang_rate=0.0, hang_s=30.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate  # requests that stall for hang_s (exercise client timeouts)
+        self.hang_s = hang_s
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def update(self, values):
+        for key, value in values.items():
+            if key in self.FIELDS:
+                setattr(self, key, self.FIELDS[key](value))
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def draw(self):
+        """-> (delay seconds, fault) where fault is None, "error" or "hang"."""
+        with self._lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+        if roll < self.hang_rate:
+            return delay + self.hang_s, "hang"
+        if roll < self.hang_rate + self.error_rate:
+            return delay, "error"
+        return delay, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "CalendarStub/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real bridge; CalendarClient pools connections
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't let delayed ACKs add ~40 ms
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        stub = self.server.stub
+        try:
+            body = self._body() if method == "POST" else {}
+        except ValueError:
+            return self._send(400, {"error": "invalid JSON body"})
+        if parts[:1] == ["_stub"]:
+            return self._control(method, parts[1:], body)
+        route = self._route(method, parts)
+        stub.count(route)
+        delay, fault = stub.faults.draw()
+        if delay > 0:
+            time.sleep(delay)
+        if fault is not None:
+            stub.count(f"fault.{fault}")
+            return self._send(stub.faults.error_status, {"error": f"injected {fault}"})
+        return self._handle(route, parts, params, body)
+
+    def _route(self, method, parts):
+        if parts == ["health"]:
+            return f"{method} health"
+        if parts == ["calendars"]:
+            return f"{method} calendars"
+        if len(parts) == 3 and parts[0] == "calendars" and parts[2] == "events":
+            return f"{method} events"
+        if len(parts) == 4 and parts[0] == "calendars" and parts[2] == "events":
+            return f"{method} quickAdd" if parts[3] == "quickAdd" else f"{method} event"
+        return f"{method} unknown"
+
+    def _handle(self, route, parts, params, body):
+        store = self.server.stub.store
+        if route == "GET health":
+            return self._send(200, {"status": "ok"})
+        if route == "GET calendars":
+            return self._send(200, {"items": store.calendars})
+        if route.endswith("unknown") or not store.has_calendar(parts[1]):
+            return self._send(404, {"error": "not found"})
+        calendar_id = parts[1]
+        if route == "GET events":
+            try:
+                max_results = int(params.get("max_results", 250))
+            except ValueError:
+                return self._send(400, {"error": "max_results must be an integer"})
+            items = store.list_events(calendar_id, params.get("q", ""), params.get("time_min"), params.get("time_max"), max_results)
+            return self._send(200, {"items": items})
+        if route == "POST events":
+            if not isinstance(body.get("start"), dict) or not isinstance(body.get("end"), dict):
+                return self._send(400, {"error": "start and end objects are required"})
+            return self._send(201, store.create(calendar_id, body))
+        if route == "POST quickAdd":
+            if not body.get("text"):
+                return self._send(400, {"error": "text is required"})
+            return self._send(201, store.quick_add(calendar_id, body["text"]))
+        if route == "DELETE event":
+            return self._send(204) if store.delete(calendar_id, parts[3]) else self._send(404, {"error": "event not found"})
+        return self._send(405, {"error": "method not allowed"})
+
+    def _control(self, method, parts, body):
+        stub = self.server.stub
+        if method == "GET" and parts == ["stats"]:
+            return self._send(200, {"requests": stub.snapshot(), "faults": stub.faults.as_dict()})
+        if method == "POST" and parts == ["config"]:
+            stub.faults.update(body)
+            return self._send(200, stub.faults.as_dict())
+        if method == "POST" and parts == ["reset"]:
+            stub.reset()
+            return self._send(204)
+        return self._send(404, {"error": "not found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class CalendarStubServer:
+    """The stub on a background thread; port=0 picks a free port (see `url`)."""
+    def __init__(self, host="127.0.0.1", port=0, faults=None, verbose=False):
+        self.store = CalendarStore()
+        self.faults = faults or FaultConfig()
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._httpd.verbose = verbose
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        self.store.reset()
+        with self._lock:
+            self._counts.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="calendar-stub")
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def close(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory Google Calendar bridge stub with fault injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform extra delay, 0..jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that stall for --hang-s")
+    parser.add_argument("--hang-s", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, help="make injected faults reproducible")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    faults = FaultConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.hang_rate, args.hang_s, args.seed)
+    server = CalendarStubServer(args.host, args.port, faults, verbose=args.verbose)
+    print(f">>> [INFO] Calendar stub listening on {server.url} (faults: {faults.as_dict()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Shared fixtures for the unit tests (python -m pytest tests). Everything runs on
+# local stand-ins: no audio devices, network or API keys are needed.
+import os
+import sys
+
+os.environ.setdefault("ADA_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import types
+
+import pytest
+
+
+def message(text=None, **content):
+    """A Gemini Live receive() item: text and/or server_content fields, or go_away=..."""
+    go_away = content.pop("go_away", None)
+    server_content = types.SimpleNamespace(**{"turn_complete": False, "interrupted": False,
+                                              "grounding_metadata": None, "model_turn": None, **content})
+    return types.SimpleNamespace(text=text, tool_call=None, server_content=server_content,
+                                 session_resumption_update=None, go_away=go_away)
+
+
+@pytest.fixture(autouse=True)
+def flush_diag():
+    """Diag records are written by a background thread; flush them while this test's output is captured."""
+    yield
+    import ada
+    ada.diag_flush()
+
+
+@pytest.fixture
+def make_core():
+    """Builds AI_Core on stand-ins inside a running loop; call it from a coroutine."""
+    import ada
+    import ada_replay
+    from ada_server import ClientAudioSink
+
+    cores = []
+
+    def build(client=None):
+        core = ada_replay.build_core(client or ada_replay.FakeLiveClient({"turns": []}),
+                                     ada_replay.WavAudioSource(), ClientAudioSink(lambda m: None),
+                                     ada.make_tts_pool(size=0))
+        cores.append(core)
+        return core
+
+    yield build
+    for core in cores:
+        core._release()
+
+
+def run(coro, timeout=10):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
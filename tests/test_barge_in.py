@@ -0,0 +1,81 @@
+import asyncio
+import types
+
+import pytest
+
+from conftest import message, run
+
+
+def test_cancelled_stream_does_not_leak_tts_queue_counts(make_core):
+    async def scenario():
+        core = make_core()
+        core.player.start(asyncio.get_running_loop())
+        taken = asyncio.Event()
+
+        async def stalled_stream(first_chunk):
+            # Takes the next chunk, then is cancelled before acknowledging either
+            await core._next_tts_item()
+            taken.set()
+            await asyncio.sleep(3600)
+
+        core._tts_stream = stalled_stream
+        tts = asyncio.create_task(core.tts())
+        core.response_queue_tts.put_nowait("First part.")
+        core.response_queue_tts.put_nowait(" Second part.")
+        await asyncio.wait_for(taken.wait(), 2)
+        assert await core.interrupt_playback("barge_in")
+        await asyncio.wait_for(core.response_queue_tts.join(), 2)
+        tts.cancel()
+        return core
+
+    core = run(scenario())
+    assert core._tts_items_owed == 0
+
+
+def test_server_interruption_is_ignored_when_barge_in_is_off(make_core):
+    class InterruptingSession:
+        turns = 0
+
+        async def send(self, input=None, end_of_turn=False):
+            pass
+
+        async def receive(self):
+            # One receive() per model turn: an interrupted reply, then the server closes
+            self.turns += 1
+            if self.turns == 1:
+                yield message("Still talking")
+                yield message(interrupted=True)
+            else:
+                yield message(go_away=types.SimpleNamespace(time_left="1s"))
+
+    async def scenario():
+        core = make_core()
+        core.barge_in = None
+        reasons = []
+
+        async def interrupt_playback(reason):
+            reasons.append(reason)
+            return False
+
+        core.interrupt_playback = interrupt_playback
+        await core.main_task_runner(InterruptingSession())
+        return reasons
+
+    assert run(scenario()) == []
+
+
+def test_late_gui_slots_leave_the_speaking_flag_to_the_core():
+    pytest.importorskip("PySide6.QtWidgets")
+    import ada_gui
+
+    scheduler = types.SimpleNamespace(active=[], set_active=lambda on: scheduler.active.append(on))
+    window = types.SimpleNamespace(
+        ai_core=types.SimpleNamespace(is_speaking=False, mic_enabled=False),
+        frame_scheduler=scheduler, update_mic_ui=lambda enabled: None)
+    # speaking_started queued before a barge-in, delivered after interrupt_playback cleared the flag
+    ada_gui.MainWindow.on_speaking_started(window)
+    assert window.ai_core.is_speaking is False
+    window.ai_core.is_speaking = True
+    ada_gui.MainWindow.on_speaking_stopped(window)
+    assert window.ai_core.is_speaking is True
+    assert scheduler.active == [True, False]
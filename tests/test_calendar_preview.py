@@ -0,0 +1,63 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ada
+from conftest import run
+
+
+def test_quick_add_preview_is_queued_before_the_tool_returns(make_core, monkeypatch):
+    monkeypatch.setattr(ada, "REQUIRE_SCHEDULE_CONFIRM", True)
+
+    async def scenario():
+        core = make_core()
+        result = await core._mcp_google_calendar_quick_add_event(text="Dentist tomorrow at 3pm")
+        queued = []
+        while not core.response_queue_tts.empty():
+            queued.append(core.response_queue_tts.get_nowait())
+            core.response_queue_tts.task_done()
+        return core, result, queued
+
+    core, result, queued = run(scenario())
+    assert result["message"] == "Preview displayed. Awaiting user confirmation."
+    assert queued[0].startswith("Scheduling preview: Dentist tomorrow at 3pm @ ")
+    assert queued[-1] is None
+    assert core.pending_calendar_event["summary"] == "Dentist tomorrow at 3pm"
+
+
+def test_quick_add_parses_the_time_off_the_event_loop(make_core, monkeypatch):
+    monkeypatch.setattr(ada, "REQUIRE_SCHEDULE_CONFIRM", True)
+
+    async def scenario():
+        core = make_core()
+        parse = core._time_relative_time
+        threads = []
+
+        def recording_parse(**kwargs):
+            threads.append(threading.current_thread())
+            return parse(**kwargs)
+
+        core._time_relative_time = recording_parse
+        await core._mcp_google_calendar_quick_add_event(text="Dentist tomorrow at 3pm")
+        return threads
+
+    threads = run(scenario())
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_calendar_client_builds_one_session_under_concurrent_first_use(monkeypatch):
+    import requests
+
+    class SlowSession(requests.Session):
+        def __init__(self):
+            time.sleep(0.05)  # widen the window between the None check and the assignment
+            super().__init__()
+
+    monkeypatch.setattr(requests, "Session", SlowSession)
+    client = ada.CalendarClient("http://127.0.0.1:9", max_concurrency=8)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            sessions = list(pool.map(lambda _: client._get_session(), range(8)))
+    finally:
+        client.close()
+    assert all(s is sessions[0] for s in sessions)
@@ -0,0 +1,81 @@
+import asyncio
+import types
+
+import numpy as np
+import pytest
+
+import ada
+from ada import CaptureEngine
+from conftest import run
+
+INPUT_OVERFLOW = 2
+
+
+@pytest.fixture(autouse=True)
+def pyaudio_constants(monkeypatch):
+    # The callback only needs PyAudio's flags; no device is opened
+    monkeypatch.setattr(ada, "pyaudio", types.SimpleNamespace(paContinue=0, paInputOverflow=INPUT_OVERFLOW))
+
+
+def engine():
+    # 10-sample blocks, reader woken at 20 samples, 50-sample ring
+    return CaptureEngine(rate=1000, block_ms=10, wake_ms=20, buffer_s=0.05)
+
+
+def block(start, status=0):
+    return np.arange(start, start + 10, dtype=np.int16).tobytes(), 10, None, status
+
+
+def samples(data):
+    return list(np.frombuffer(data, dtype=np.int16))
+
+
+def test_reader_is_woken_once_per_batch():
+    async def scenario():
+        eng = engine()
+        eng._loop = asyncio.get_running_loop()
+        reader = asyncio.ensure_future(eng.read())
+        await asyncio.sleep(0)
+        eng._callback(*block(0))
+        await asyncio.sleep(0)
+        assert not reader.done()
+        for start in (10, 20):
+            eng._callback(*block(start))
+        data = await asyncio.wait_for(reader, 1)
+        return eng, data
+
+    eng, data = run(scenario())
+    assert samples(data) == list(range(30))
+    assert eng.stats["wakeups"] == 1
+    assert eng.available() == 0
+
+
+def test_ring_wraps_around():
+    async def scenario():
+        eng = engine()
+        eng._loop = asyncio.get_running_loop()
+        for start in range(0, 40, 10):
+            eng._callback(*block(start))
+        first = await eng.read()
+        for start in range(40, 70, 10):  # ring slots 40..49 and 0..19
+            eng._callback(*block(start))
+        return first, await eng.read()
+
+    first, second = run(scenario())
+    assert samples(first) == list(range(40))
+    assert samples(second) == list(range(40, 70))
+
+
+def test_full_ring_drops_new_blocks():
+    eng = engine()
+    for start in range(0, 60, 10):
+        eng._callback(*block(start))
+    assert eng.available() == 50
+    assert eng.stats["overflows"] == 1
+
+
+def test_device_overflows_are_counted_separately():
+    eng = engine()
+    eng._callback(*block(0, status=INPUT_OVERFLOW))
+    assert eng.stats["device_overflows"] == 1
+    assert eng.stats["overflows"] == 0
@@ -0,0 +1,50 @@
+import io
+import types
+
+import pytest
+
+import ada
+from ada import ToolExecutor
+from conftest import run
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    w = ada.DiagWriter(stream=io.StringIO(), flush_interval=60)
+    monkeypatch.setattr(ada, "_diag_writer", w)
+    yield w
+    w.close()
+
+
+def run_tool_batch():
+    ex = ToolExecutor(max_workers=1)
+    ex.register("noop", lambda args: {"status": "success"}, blocking=True)
+    try:
+        run(ex.run_batch([types.SimpleNamespace(id="1", name="noop", args={})]))
+    finally:
+        ex.shutdown()
+
+
+def test_disabled_levels_queue_nothing(writer, monkeypatch):
+    monkeypatch.setattr(ada, "DIAG_LEVEL", ada.DIAG_INFO)
+    run_tool_batch()
+    assert not writer.records
+
+
+def test_enabled_levels_reach_the_writer_stream(writer, monkeypatch):
+    monkeypatch.setattr(ada, "DIAG_LEVEL", ada.DIAG_DEBUG)
+    run_tool_batch()
+    ada.diag_flush()
+    out = writer.stream.getvalue()
+    assert ">>> [DIAG] tool.done " in out and "outcome=ok" in out
+    assert ">>> [DIAG] tool.batch_done " in out
+
+
+def test_writer_without_a_stream_follows_sys_stdout(capsys):
+    w = ada.DiagWriter(flush_interval=60)
+    try:
+        w.records.append((0.0, ada.DIAG_INFO, "test.event", {"n": 1}))
+        w.flush()
+    finally:
+        w.close()
+    assert ">>> [DIAG] test.event t=0.000 n=1" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+from ada import FrameChangeDetector
+
+
+def frame(value, shape=(480, 640, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def detector():
+    return FrameChangeDetector(min_interval=1.0, keyframe_interval=10.0, threshold=4.0)
+
+
+def test_first_frame_is_always_sent():
+    det = detector()
+    assert det.should_send(frame(0), now=0.0)
+    assert det.last_diff == float("inf")
+
+
+def test_unchanged_scene_only_sends_keyframes():
+    det = detector()
+    det.should_send(frame(10), now=0.0)
+    assert not det.should_send(frame(10), now=5.0)
+    assert det.should_send(frame(10), now=10.0)
+    assert det.stats == {"checked": 3, "sent": 2, "skipped": 1}
+
+
+def test_changed_frames_respect_the_min_interval():
+    det = detector()
+    det.should_send(frame(10), now=0.0)
+    assert not det.should_send(frame(200), now=0.5)
+    assert det.last_diff == pytest.approx(190)
+    assert det.should_send(frame(200), now=1.0)
+
+
+def test_small_changes_stay_below_the_threshold():
+    det = detector()
+    det.should_send(frame(10), now=0.0)
+    assert not det.should_send(frame(12), now=2.0)
+
+
+def test_reset_forces_a_send():
+    det = detector()
+    det.should_send(frame(10), now=0.0)
+    det.reset()
+    assert det.should_send(frame(10), now=0.1)
+
+
+def test_thumbnail_ignores_channel_order_and_resolution():
+    det = detector()
+    det.should_send(frame(10, shape=(2160, 3840, 4)), now=0.0)
+    assert not det.should_send(frame(10, shape=(480, 640)), now=2.0)
+    assert det.last_diff == 0.0
@@ -0,0 +1,77 @@
+import asyncio
+import types
+
+import ada
+from conftest import message, run
+
+
+class DroppingSession:
+    """Sends part of a model turn, then ends the session the given way."""
+    def __init__(self, ending):
+        self.ending = ending
+
+    async def send(self, input=None, end_of_turn=False):
+        pass
+
+    async def receive(self):
+        yield message("Half a sen")
+        if self.ending == "go_away":
+            yield message(go_away=types.SimpleNamespace(time_left="1s"))
+            return
+        raise ada.websockets.exceptions.ConnectionClosed(None, None)
+
+
+def _drain(q):
+    items = []
+    while not q.empty():
+        items.append(q.get_nowait())
+        q.task_done()
+    return items
+
+
+def test_go_away_mid_turn_ends_the_tts_turn(make_core):
+    async def scenario():
+        core = make_core()
+        await core.main_task_runner(DroppingSession("go_away"))
+        return core, _drain(core.response_queue_tts)
+
+    core, items = run(scenario())
+    assert items == ["Half a sen", None]
+    assert core._model_turn_active is False
+
+
+def test_connection_lost_mid_turn_ends_the_tts_turn(make_core):
+    async def scenario():
+        core = make_core()
+        try:
+            await core.main_task_runner(DroppingSession("closed"))
+        except ada.websockets.exceptions.ConnectionClosed:
+            pass
+        else:
+            raise AssertionError("connection error was swallowed")
+        return core, _drain(core.response_queue_tts)
+
+    core, items = run(scenario())
+    assert items[-1] is None
+    assert core._model_turn_active is False
+
+
+def test_resumption_updates_do_not_open_a_turn(make_core):
+    class UpdateOnly:
+        async def send(self, input=None, end_of_turn=False):
+            pass
+
+        async def receive(self):
+            update = types.SimpleNamespace(resumable=True, new_handle="h1")
+            yield types.SimpleNamespace(session_resumption_update=update)
+            yield message(go_away=types.SimpleNamespace(time_left="1s"))
+
+    async def scenario():
+        core = make_core()
+        await core.main_task_runner(UpdateOnly())
+        return core, _drain(core.response_queue_tts)
+
+    core, items = run(scenario())
+    assert items == []
+    assert core._resume_handle == "h1"
+    assert core._model_turn_active is False
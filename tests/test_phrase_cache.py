@@ -0,0 +1,78 @@
+import asyncio
+
+import ada
+from conftest import run
+
+
+def test_keys_ignore_case_and_whitespace(tmp_path):
+    cache = ada.PhraseCache(directory=str(tmp_path), max_mb=1)
+    cache.put("Scheduled.", b"\x01\x00" * 100)
+    assert cache.get("  scheduled. ") == b"\x01\x00" * 100
+    assert cache.get("Canceled.") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_keys_depend_on_voice_and_model(tmp_path):
+    a = ada.PhraseCache(directory=str(tmp_path), max_mb=1, voice_id="v1")
+    b = ada.PhraseCache(directory=str(tmp_path), max_mb=1, voice_id="v2")
+    a.put("Scheduled.", b"\x00\x00" * 10)
+    assert b.get("Scheduled.") is None
+
+
+def test_disabled_and_long_texts_are_not_cacheable(tmp_path):
+    assert not ada.PhraseCache(directory=str(tmp_path), max_mb=0).cacheable("Scheduled.")
+    cache = ada.PhraseCache(directory=str(tmp_path), max_mb=1)
+    assert not cache.cacheable("x" * (ada.TTS_CACHE_MAX_CHARS + 1))
+    assert not cache.cacheable("   ")
+
+
+def test_only_fixed_replies_go_through_the_cache(make_core, tmp_path):
+    async def scenario():
+        core = make_core()
+        core.phrase_cache = ada.PhraseCache(directory=str(tmp_path), max_mb=1)
+        await core._emit_assistant_text("No events found today (Fri, 2026-10-16).")
+        await core._emit_assistant_text("Scheduled.", fixed=True)
+        items = []
+        while not core.response_queue_tts.empty():
+            items.append(core.response_queue_tts.get_nowait())
+        return items
+
+    items = run(scenario())
+    assert items[0] == "No events found today (Fri, 2026-10-16)." and items[1] is None
+    assert isinstance(items[2], ada.CachedAudio) and items[2].text == "Scheduled."
+
+
+
+def test_concurrent_stores_keep_one_file_and_an_exact_total(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = ada.PhraseCache(directory=str(tmp_path), max_mb=1)
+    payloads = [bytes([i]) * 2000 for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(lambda pcm: cache.put("Scheduled.", pcm), payloads))
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 1 and files[0].endswith(".pcm")
+    assert cache.get("Scheduled.") in payloads
+    assert cache._total == 2000
+
+
+def test_server_sessions_share_one_phrase_cache(monkeypatch):
+    import ada_server
+
+    monkeypatch.setattr(ada_server, "SERVER_TTS_POOL", 0)
+    monkeypatch.setattr(ada, "GEMINI_API_KEY", "unused")  # sessions build a genai.Client; nothing connects
+
+    async def scenario():
+        server = ada_server.AssistantServer()
+        sessions = [ada_server.AssistantSession(server, None, i) for i in (1, 2)]
+        try:
+            return server.phrase_cache, [s.core.phrase_cache for s in sessions]
+        finally:
+            for s in sessions:
+                await s.core.aclose()
+            await server.tts_pool.close()
+            server.calendar.close()
+            server.tool_pool.shutdown()
+
+    shared, per_session = run(scenario())
+    assert all(cache is shared for cache in per_session)
@@ -0,0 +1,94 @@
+import asyncio
+import types
+
+import numpy as np
+import pytest
+
+import ada
+from ada import PlaybackEngine
+from conftest import run
+
+BLOCK = 10
+
+
+@pytest.fixture(autouse=True)
+def pyaudio_constants(monkeypatch):
+    # The callback only needs PyAudio's return flag; no device is opened
+    monkeypatch.setattr(ada, "pyaudio", types.SimpleNamespace(paContinue=0))
+
+
+def engine(**kwargs):
+    # 50-sample ring, 20-sample jitter target, 10-sample device blocks
+    return PlaybackEngine(rate=1000, jitter_ms=20, buffer_s=0.05, frames_per_buffer=BLOCK, **kwargs)
+
+
+def pcm(start, count):
+    return np.arange(start, start + count, dtype=np.int16).tobytes()
+
+
+def play(eng, blocks=1):
+    out = [np.frombuffer(eng._callback(None, BLOCK, None, 0)[0], dtype=np.int16) for _ in range(blocks)]
+    return np.concatenate(out)
+
+
+def test_write_returns_what_does_not_fit():
+    eng = engine()
+    assert eng.write(pcm(0, 45)) == b""
+    tail = eng.write(pcm(45, 10))
+    assert len(tail) == 5 * ada.SAMPLE_WIDTH
+    assert eng.buffered() == 50
+    assert eng.stats["overruns"] == 1
+
+
+def test_output_waits_for_the_jitter_target():
+    starts = []
+    eng = engine(on_start=lambda: starts.append(True))
+    eng.write(pcm(1, 15))
+    assert not play(eng).any()
+    eng.write(pcm(16, 5))
+    assert list(play(eng)) == list(range(1, 11))
+    assert starts == [True]
+
+
+def test_ring_wraps_around():
+    eng = engine()
+    eng.write(pcm(0, 40))
+    play(eng, 3)
+    eng.write(pcm(40, 30))  # lands on ring slots 40..49 and 0..19
+    assert list(play(eng, 4)) == list(range(30, 70))
+    assert eng.buffered() == 0
+
+
+def test_underrun_reprimes_and_is_counted():
+    eng = engine()
+    eng.write(pcm(1, 25))
+    block = play(eng, 3)
+    assert list(block[:25]) == list(range(1, 26)) and not block[25:].any()
+    assert eng.stats["underruns"] == 1
+    eng.write(pcm(100, 5))
+    assert not play(eng).any()  # below the jitter target again
+
+
+def test_flush_drops_buffered_audio():
+    eng = engine()
+    eng.write(pcm(1, 40))
+    eng.flush()
+    assert eng.drained.is_set()
+    assert not play(eng).any()
+    assert eng.buffered() == 0
+
+
+def test_mark_end_plays_out_the_remainder_and_signals_drained():
+    async def scenario():
+        eng = engine()
+        eng._loop = asyncio.get_running_loop()
+        eng.write(pcm(1, 5))
+        eng.mark_end()
+        assert not eng.drained.is_set()
+        block = play(eng)
+        assert await eng.wait_drained(1)
+        return block, eng.stats["underruns"]
+
+    block, underruns = run(scenario())
+    assert list(block[:5]) == [1, 2, 3, 4, 5]
+    assert underruns == 0
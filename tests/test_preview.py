@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import ada
+
+pytest.importorskip("PySide6.QtGui")
+
+
+def solid(channel, shape=(480, 640, 3)):
+    frame = np.zeros(shape, dtype=np.uint8)
+    frame[:, :, channel] = 255
+    return frame
+
+
+def test_unacknowledged_preview_is_not_overwritten():
+    renderer = ada.PreviewRenderer()
+    first = renderer.render(solid(2), "BGR", 320, 240)  # red
+    # No ack yet (a re-arm after a lost signal): the next frames use the other buffer
+    renderer.render(solid(0), "BGR", 320, 240)
+    assert (first.width(), first.height()) == (320, 240)
+    assert first.pixelColor(10, 10).red() == 255
+
+
+def test_acknowledged_buffer_is_reused_without_a_copy():
+    renderer = ada.PreviewRenderer()
+    first = renderer.render(solid(2), "BGR", 320, 240)
+    renderer.release()
+    renderer.render(solid(0), "BGR", 320, 240)  # blue, into the same buffer
+    assert first.pixelColor(10, 10).blue() == 255
+
+
+def test_size_change_reallocates_only_the_free_buffer():
+    renderer = ada.PreviewRenderer()
+    first = renderer.render(solid(2), "BGR", 320, 240)
+    second = renderer.render(solid(0, (720, 1280, 3)), "BGR", 320, 240)
+    assert (second.width(), second.height()) == (320, 180)
+    assert first.pixelColor(10, 10).red() == 255
+
+
+def test_preview_keeps_aspect_ratio():
+    image = ada.PreviewRenderer().render(np.zeros((1080, 1920, 4), dtype=np.uint8), "BGRA", 640, 640)
+    assert (image.width(), image.height()) == (640, 360)
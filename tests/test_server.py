@@ -0,0 +1,92 @@
+import types
+import warnings
+
+import pytest
+import websockets
+
+import ada
+import ada_server
+from ada_server import AssistantServer, ClientAudioSource
+from conftest import run
+
+
+def _handshake(path="/", **headers):
+    return types.SimpleNamespace(request=types.SimpleNamespace(path=path, headers=headers))
+
+
+@pytest.mark.parametrize("websocket, ok", [
+    (_handshake(Authorization="Bearer s3cret"), True),
+    (_handshake("/?token=s3cret"), True),
+    (_handshake(), False),
+    (_handshake("/?token=guess"), False),
+    (_handshake(Authorization="Bearer guess"), False),
+])
+def test_token_is_required_when_configured(websocket, ok):
+    server = types.SimpleNamespace(token="s3cret")
+    assert AssistantServer.authorized(server, websocket) is ok
+
+
+@pytest.mark.parametrize("implementation", ["asyncio", "legacy"])
+def test_token_check_on_real_handshakes(implementation):
+    if implementation == "legacy":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            legacy = pytest.importorskip("websockets.legacy.server")
+        serve = legacy.serve
+    else:
+        serve = websockets.serve
+    server = types.SimpleNamespace(token="s3cret")
+
+    async def handler(websocket, *_):
+        await websocket.send(str(AssistantServer.authorized(server, websocket)))
+
+    async def scenario():
+        async with serve(handler, "127.0.0.1", 0) as listener:
+            port = next(iter(listener.sockets)).getsockname()[1]
+            results = []
+            for path, headers in (("/?token=s3cret", None), ("/", {"Authorization": "Bearer s3cret"}), ("/", None)):
+                async with websockets.connect(f"ws://127.0.0.1:{port}{path}", additional_headers=headers) as client:
+                    results.append(await client.recv())
+            return results
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        assert run(scenario()) == ["True", "True", "False"]
+
+
+def test_no_token_accepts_every_client():
+    assert AssistantServer.authorized(types.SimpleNamespace(token=""), _handshake())
+
+
+def test_local_tools_are_neither_declared_nor_registered(make_core):
+    async def scenario():
+        core = make_core()
+        restricted = ada.AI_Core(video_mode="none", loop=core.loop, client=core.client, tts_pool=core.tts_pool,
+                                 disabled_tools=ada_server.LOCAL_TOOLS)
+        try:
+            declared = {fd["name"] for entry in restricted.config["tools"] for fd in entry.get("function_declarations", [])}
+            return declared, set(restricted.tool_executor.tools), set(core.tool_executor.tools)
+        finally:
+            await restricted.aclose()
+
+    declared, registered, everything = run(scenario())
+    assert not declared & set(ada_server.LOCAL_TOOLS)
+    assert declared == registered == everything - set(ada_server.LOCAL_TOOLS)
+    assert "mcp_google_calendar_find_events" in registered
+
+
+def test_client_audio_source_drops_the_oldest_audio_on_overflow():
+    source = ClientAudioSource(rate=16000, wake_ms=20, max_ms=100)
+    frame = 320 * ada.SAMPLE_WIDTH  # 20 ms
+    for i in range(8):
+        source.feed(bytes([i]) * frame)
+    assert source.snapshot()["buffered_ms"] == 100
+    assert source.stats["overflows"] == 3
+
+    async def read():
+        return await source.read()
+
+    data = run(read())
+    # Whole samples only, and the newest five frames survive
+    assert len(data) == 5 * frame
+    assert data[0] == 3 and data[-1] == 7
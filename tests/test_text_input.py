@@ -0,0 +1,42 @@
+import asyncio
+
+from conftest import run
+
+
+class RecordingSession:
+    def __init__(self):
+        self.texts = []
+
+    async def send_client_content(self, turns=None, turn_complete=True):
+        self.texts.append(turns[0]["parts"][0]["text"])
+
+
+def test_typing_during_a_reply_flushes_playback_without_leaking_queue_counts(make_core):
+    async def scenario():
+        core = make_core()
+        core.session = RecordingSession()
+        core._session_ready.set()
+        # A reply is playing: audio queued for the speaker and buffered in the sink
+        core.speaking.set()
+        core.is_speaking = True
+        for _ in range(2):
+            core.audio_in_queue_player.put_nowait(b"\x00\x00" * 480)
+        core.response_queue_tts.put_nowait("rest of the reply")
+        core.player.start(asyncio.get_running_loop())
+        core.player.write(b"\x00\x00" * 24000)
+        flushes = []
+        core.player.flush = lambda: flushes.append(True)
+
+        task = asyncio.create_task(core.process_text_input_queue())
+        core.text_input_queue.put_nowait("stop, do this instead")
+        await asyncio.wait_for(core.text_input_queue.join(), 2)
+        # Every queued item was acknowledged, so tts()'s join() returns immediately
+        await asyncio.wait_for(core.audio_in_queue_player.join(), 0.5)
+        await asyncio.wait_for(core.response_queue_tts.join(), 0.5)
+        task.cancel()
+        return core, flushes
+
+    core, flushes = run(scenario())
+    assert core.session.texts == ["stop, do this instead"]
+    assert flushes == [True]
+    assert not core.speaking.is_set()
@@ -0,0 +1,53 @@
+import pytest
+
+from ada import TextShaper
+
+
+def shaper():
+    return TextShaper(first_wait_ms=200, wait_ms=500, min_clause_chars=20)
+
+
+def test_words_split_across_chunks_stay_whole():
+    s = shaper()
+    assert s.feed("Hel", 0.0) == []
+    assert s.feed("lo there. How", 0.01) == ["Hello there. "]
+    assert s.buf == "How"
+
+
+def test_releases_at_the_last_sentence_end():
+    s = shaper()
+    assert s.feed("One. Two! Three", 0.0) == ["One. Two! "]
+    assert s.finish() == "Three "
+
+
+def test_short_clauses_wait_for_more_text():
+    s = shaper()
+    assert s.feed("Well, ", 0.0) == []
+    assert s.feed("that took longer than expected; more", 0.0) == ["Well, that took longer than expected; "]
+
+
+def test_first_phrase_deadline_is_shorter():
+    s = shaper()
+    s.feed("Working on it", 1.0)
+    assert s.time_left(1.1) == pytest.approx(0.1)
+    assert s.force(1.2) == "Working on "
+    assert s.forced == 1
+    # Later phrases get the longer window
+    assert s.time_left(1.2) == pytest.approx(0.5)
+
+
+def test_force_keeps_a_single_unfinished_word():
+    s = shaper()
+    s.feed("Supercalifragil", 0.0)
+    assert s.force(0.2) is None
+    assert s.time_left(0.2) == pytest.approx(0.2)
+
+
+def test_finish_flushes_the_rest_and_skips_whitespace():
+    s = shaper()
+    assert s.finish() is None
+    s.feed("   ", 0.0)
+    assert s.finish() is None
+    s.feed("done", 0.0)
+    assert s.finish() == "done "
+    assert s.time_left(0.0) is None
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ada import ToolExecutor
+from conftest import run
+
+
+def call(name, call_id=None, **args):
+    return types.SimpleNamespace(id=call_id or name, name=name, args=args)
+
+
+@pytest.fixture
+def executor():
+    ex = ToolExecutor(max_workers=4, default_timeout=0.5)
+    yield ex
+    ex.shutdown()
+
+
+def test_unknown_tool_is_an_error_response(executor):
+    [resp] = run(executor.run_batch([call("nope", "c1")]))
+    assert resp["id"] == "c1"
+    assert resp["response"] == {"status": "error", "message": "Unknown tool 'nope'."}
+
+
+def test_slow_tool_times_out_and_is_counted(executor):
+    async def slow(args):
+        await asyncio.sleep(5)
+
+    executor.register("slow", slow, timeout=0.05)
+    [resp] = run(executor.run_batch([call("slow")]))
+    assert resp["response"]["status"] == "error"
+    assert "timed out after 0.05s" in resp["response"]["message"]
+    assert executor.stats["slow"]["timeouts"] == 1
+
+
+def test_blocking_tool_timeout_uses_the_default(executor):
+    executor.register("sleepy", lambda args: time.sleep(1), blocking=True)
+    [resp] = run(executor.run_batch([call("sleepy")]))
+    assert "timed out after 0.5s" in resp["response"]["message"]
+
+
+def test_results_are_wrapped_and_errors_reported(executor):
+    def boom(args):
+        raise ValueError("bad path")
+
+    executor.register("plain", lambda args: args["x"] * 2, blocking=True)
+    executor.register("boom", boom, blocking=True)
+    plain, failed = run(executor.run_batch([call("plain", x=21), call("boom")]))
+    assert plain["response"] == {"status": "success", "data": 42}
+    assert failed["response"] == {"status": "error", "message": "Tool 'boom' failed: bad path"}
+    assert executor.stats["boom"]["errors"] == 1
+
+
+def test_independent_calls_run_concurrently(executor):
+    async def wait(args):
+        await asyncio.sleep(0.2)
+        return {"status": "success"}
+
+    executor.register("a", wait)
+    executor.register("b", wait)
+    t0 = time.perf_counter()
+    responses = run(executor.run_batch([call("a"), call("b")]))
+    assert time.perf_counter() - t0 < 0.35
+    assert [r["name"] for r in responses] == ["a", "b"]
+
+
+def test_writes_to_a_shared_resource_keep_call_order(executor):
+    order = []
+
+    def step(label, delay):
+        async def handler(args):
+            await asyncio.sleep(delay)
+            order.append(label)
+            return {"status": "success"}
+        return handler
+
+    executor.register("mkdir", step("mkdir", 0.1), resource="fs", writes=True)
+    executor.register("write", step("write", 0.0), resource="fs", writes=True)
+    run(executor.run_batch([call("mkdir"), call("write")]))
+    assert order == ["mkdir", "write"]
+
+
+def test_thread_cap_limits_one_executor_in_a_shared_pool():
+    shared = ThreadPoolExecutor(max_workers=4)
+    ex = ToolExecutor(executor=shared, default_timeout=2, max_threads=1)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def work(args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return {"status": "success"}
+
+    for name in ("a", "b", "c"):
+        ex.register(name, work, blocking=True)
+    try:
+        responses = run(ex.run_batch([call("a"), call("b"), call("c")]))
+    finally:
+        shared.shutdown()
+    assert [r["response"]["status"] for r in responses] == ["success"] * 3
+    assert peak[0] == 1
+
+
+def test_timed_out_call_keeps_its_thread_slot_until_it_finishes():
+    shared = ThreadPoolExecutor(max_workers=4)
+    ex = ToolExecutor(executor=shared, default_timeout=2, max_threads=1)
+    ex.register("stuck", lambda args: time.sleep(0.3), blocking=True, timeout=0.05)
+    ex.register("quick", lambda args: {"status": "success"}, blocking=True)
+
+    async def scenario():
+        [stuck] = await ex.run_batch([call("stuck")])
+        t0 = time.perf_counter()
+        [quick] = await ex.run_batch([call("quick")])
+        return stuck, quick, time.perf_counter() - t0
+
+    try:
+        stuck, quick, waited = run(scenario())
+    finally:
+        shared.shutdown()
+    assert "timed out" in stuck["response"]["message"]
+    assert quick["response"]["status"] == "success"
+    assert waited >= 0.2
@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+from ada import TurnTracer
+
+
+def voice_turn(tracer, t0, ttfa_ms, **tags):
+    tracer.note_input("voice", t0)
+    tracer.mark("first_token", t0 + 0.05)
+    tracer.mark("first_tts_audio", t0 + 0.08)
+    for key, value in tags.items():
+        tracer.tag(key, value)
+    tracer.mark("first_speaker_write", t0 + ttfa_ms / 1000)
+    return tracer.end_turn(t0 + 2.0)
+
+
+def test_turn_metrics_follow_the_stage_marks():
+    tracer = TurnTracer()
+    turn = voice_turn(tracer, 100.0, 300)
+    assert turn["source"] == "voice"
+    m = turn["metrics"]
+    assert m["model"] == pytest.approx(50)
+    assert m["tts"] == pytest.approx(30)
+    assert m["playout"] == pytest.approx(220)
+    assert m["ttfa"] == pytest.approx(300)
+    assert m["playback"] == pytest.approx(1700)
+
+
+def test_only_the_first_mark_of_a_stage_counts():
+    tracer = TurnTracer()
+    tracer.mark("first_token", 1.0)
+    tracer.mark("first_token", 2.0)
+    assert tracer.current["marks"]["first_token"] == 1.0
+
+
+def test_stale_input_is_not_attributed_to_the_turn():
+    tracer = TurnTracer()
+    tracer.note_input("text", 0.0)
+    tracer.start_turn(TurnTracer.INPUT_MAX_AGE + 1)
+    assert tracer.current["source"] == "model"
+    assert "mic_end" not in tracer.current["marks"]
+
+
+def test_marks_without_an_open_turn_are_ignored():
+    tracer = TurnTracer()
+    tracer.mark("first_tts_audio", 1.0)
+    assert tracer.current is None
+    assert tracer.end_turn() is None
+
+
+def test_percentiles_by_metric_and_tag():
+    tracer = TurnTracer()
+    for i, ms in enumerate(range(100, 1100, 100)):
+        voice_turn(tracer, i * 10.0, ms, cache="hit" if ms <= 300 else "miss")
+    p = tracer.percentiles("ttfa")
+    assert p["count"] == 10
+    assert (p["p50"], p["p95"], p["p99"], p["max"]) == pytest.approx((500, 1000, 1000, 1000))
+    hits = tracer.percentiles("ttfa", tag=("cache", "hit"))
+    assert hits["count"] == 3 and hits["max"] == pytest.approx(300)
+    assert tracer.percentiles("ttfa", tag=("cache", "none")) == {"count": 0}
+    assert any(line.startswith("ttfa[cache=hit]") for line in tracer.summary(by="cache"))
+
+
+def test_chrome_trace_export(tmp_path):
+    tracer = TurnTracer(keep_events=True)
+    voice_turn(tracer, 5.0, 400)
+    path = tmp_path / "trace.json"
+    assert tracer.export_chrome_trace(path) > 0
+    names = {e["name"] for e in json.loads(path.read_text())["traceEvents"]}
+    assert {"model", "tts", "playout", "playback", "mic_end"} <= names
+
+
+def test_out_of_order_marks_do_not_produce_negative_spans():
+    tracer = TurnTracer(keep_events=True)
+    tracer.note_input("voice", 1.0)
+    tracer.mark("first_token", 1.2)
+    tracer.mark("first_speaker_write", 1.3)  # playout started before the TTS audio mark
+    tracer.mark("first_tts_audio", 1.4)
+    turn = tracer.end_turn(2.0)
+    assert "playout" not in turn["metrics"]
+    assert turn["metrics"]["ttfa"] == pytest.approx(300)
+    assert all(ms >= 0 for values in tracer.samples.values() for ms in values)
+    assert "playout" not in {e["name"] for e in tracer.events}
+
+
+def test_cache_hit_marks_tts_audio_before_playout_starts(make_core):
+    import ada
+    from conftest import run
+
+    async def scenario():
+        core = make_core()
+        core.player.start(asyncio.get_running_loop())
+        core.tracer.note_input("text")
+        core.tracer.start_turn()
+        play = asyncio.create_task(core.play_audio())
+        core.response_queue_tts.put_nowait(ada.CachedAudio("Scheduled.", b"\x01\x00" * 2400))
+        core.response_queue_tts.put_nowait(None)
+        await core._play_cached(await core._next_tts_item())  # as tts() hands over a cache hit
+        await asyncio.wait_for(core.audio_in_queue_player.join(), 2)
+        play.cancel()
+        return core.tracer.end_turn()
+
+    turn = run(scenario())
+    marks = turn["marks"]
+    assert marks["first_tts_audio"] <= marks["first_speaker_write"]
+    assert turn["tags"]["tts_cache"] == "hit"
+    assert turn["metrics"]["playout"] >= 0
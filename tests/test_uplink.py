@@ -0,0 +1,58 @@
+import asyncio
+
+from ada import UplinkScheduler
+from conftest import run
+
+
+def drain(uplink):
+    async def take_all():
+        return [await uplink.get() for _ in range(uplink.qsize())]
+    return run(take_all())
+
+
+def test_audio_is_sent_before_a_waiting_image():
+    uplink = UplinkScheduler(audio_maxlen=8)
+    uplink.put_image("frame")
+    uplink.put_audio("a1")
+    uplink.put_audio("a2")
+    assert drain(uplink) == [("audio", "a1"), ("audio", "a2"), ("image", "frame")]
+
+
+def test_full_audio_lane_drops_the_oldest_chunk():
+    uplink = UplinkScheduler(audio_maxlen=2)
+    for chunk in ("a1", "a2", "a3"):
+        uplink.put_audio(chunk)
+    assert drain(uplink) == [("audio", "a2"), ("audio", "a3")]
+    snap = uplink.snapshot()["audio"]
+    assert (snap["enqueued"], snap["sent"], snap["dropped"], snap["depth"]) == (3, 2, 1, 0)
+
+
+def test_newer_image_replaces_an_unsent_one():
+    uplink = UplinkScheduler()
+    uplink.put_image("old")
+    uplink.put_image("new")
+    assert uplink.depth("image") == 1
+    assert drain(uplink) == [("image", "new")]
+    assert uplink.stats["image"]["dropped"] == 1
+
+
+def test_clear_audio_counts_dropped_chunks():
+    uplink = UplinkScheduler()
+    uplink.put_audio("a1")
+    uplink.put_audio("a2")
+    uplink.put_image("frame")
+    assert uplink.clear_audio() == 2
+    assert uplink.qsize() == 1
+    assert uplink.stats["audio"]["dropped"] == 2
+
+
+def test_get_waits_for_the_next_message():
+    async def scenario():
+        uplink = UplinkScheduler()
+        getter = asyncio.ensure_future(uplink.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        uplink.put_audio("late")
+        return await asyncio.wait_for(getter, 1)
+
+    assert run(scenario()) == ("audio", "late")
@@ -0,0 +1,60 @@
+import pytest
+
+import ada
+from ada import BYTES_PER_FRAME, FRAME_MS, VadGate
+
+SPEECH = b"\x01" * BYTES_PER_FRAME
+SILENCE = b"\x00" * BYTES_PER_FRAME
+
+
+@pytest.fixture(autouse=True)
+def fake_vad(monkeypatch):
+    # Frames of 0x01 bytes count as speech, zero frames as silence
+    monkeypatch.setattr(ada, "is_voiced", lambda frame: frame[0] != 0)
+
+
+def frames(data):
+    return len(data) // BYTES_PER_FRAME
+
+
+def test_silence_is_not_uploaded():
+    gate = VadGate(preroll_ms=3 * FRAME_MS, hangover_ms=2 * FRAME_MS)
+    assert gate.process(SILENCE * 10) == b""
+    assert not gate.active
+    assert gate.frames_in == 10 and gate.frames_sent == 0
+
+
+def test_onset_flushes_the_preroll():
+    gate = VadGate(preroll_ms=3 * FRAME_MS, hangover_ms=2 * FRAME_MS, onset_frames=2)
+    assert gate.process(SILENCE * 5 + SPEECH) == b""
+    out = gate.process(SPEECH)
+    # The pre-roll holds the last three frames, ending with both voiced ones
+    assert out == SILENCE + SPEECH + SPEECH
+    assert gate.active
+
+
+def test_hangover_keeps_streaming_then_closes():
+    gate = VadGate(preroll_ms=FRAME_MS, hangover_ms=3 * FRAME_MS, onset_frames=1)
+    gate.process(SPEECH)
+    assert frames(gate.process(SILENCE * 2)) == 2
+    assert gate.active
+    # A voiced frame inside the hangover restarts it
+    gate.process(SPEECH)
+    assert frames(gate.process(SILENCE * 3)) == 3
+    assert not gate.active
+    assert gate.process(SILENCE) == b""
+
+
+def test_partial_frames_are_carried_over():
+    gate = VadGate(preroll_ms=FRAME_MS, hangover_ms=FRAME_MS, onset_frames=1)
+    half = BYTES_PER_FRAME // 2
+    assert gate.process(SPEECH[:half]) == b""
+    assert gate.process(SPEECH[half:]) == SPEECH
+    assert gate.frames_in == 1
+
+
+def test_open_starts_a_segment_immediately():
+    gate = VadGate(preroll_ms=FRAME_MS, hangover_ms=2 * FRAME_MS)
+    gate.open()
+    assert frames(gate.process(SILENCE * 2)) == 2
+    assert not gate.active